@@ -10,15 +10,18 @@ sys.path.insert(0, str(project_root))
 
 from src.core.ingest_docling import parse_document
 from src.core.extract_llm import extract_pipeline
+from src.core.extract_scheduler import extract_corpus, DEFAULT_RPM, DEFAULT_TPM, DEFAULT_WORKERS
 from src.core.validate import validate_extracted_facts, save_validation_results
 from src.core.normalize_ontology import OntologyNormalizer
+from src.core.telemetry import RUN_ID, load_ledger, print_summary, summarize_ledger
 # from src.core.graph_store import upsert_to_graph  # Implement when ready
 
 
-def assess_quality(facts: List[Dict], methods: List[str] = ["heuristic"]) -> Dict:
-    """Run quality assessment on validated facts."""
+def assess_quality(facts: List[Dict], methods: List[str] = ["heuristic"],
+                   precision_threshold: Optional[float] = None) -> Dict:
+    """Run quality assessment on validated facts (adaptive stratified sample when ``precision_threshold`` is set)."""
     from scripts.auto_validate_quality import assess_dataset_quality
-    return assess_dataset_quality(facts, methods=methods)
+    return assess_dataset_quality(facts, methods=methods, precision_threshold=precision_threshold)
 
 
 def load_papers_from_file(file_path: Path) -> List[str]:
@@ -34,22 +37,54 @@ def load_papers_from_file(file_path: Path) -> List[str]:
     return sources
 
 
+def make_paper_id(source: str) -> str:
+    """URLs get a short md5 id, local files use their stem."""
+    if source.startswith('http'):
+        import hashlib
+        return hashlib.md5(source.encode()).hexdigest()[:12]
+    return Path(source).stem
+
+
+def parsed_path_for(output_base: Path, paper_id: str) -> Path:
+    return output_base / "interim" / f"{paper_id}_parsed.json"
+
+
+def extracted_path_for(output_base: Path, paper_id: str) -> Path:
+    return output_base / "processed" / "extracted" / f"{paper_id}_extracted.json"
+
+
+def parse_stage(source: str, output_base: Path, paper_id: str, metadata: Optional[Dict] = None) -> Path:
+    """Parse one source with Docling and write {paper_id}_parsed.json."""
+    parsed_path = parsed_path_for(output_base, paper_id)
+    parsed_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        parsed_doc = parse_document(source, source_id=paper_id)
+        if metadata:
+            parsed_doc["metadata"].update(metadata)
+        parsed_path.write_text(json.dumps(parsed_doc, indent=2), encoding="utf-8")
+        print(f"   ✅ Parsed → {parsed_path}")
+    except Exception as e:
+        print(f"   ❌ Parse failed: {e}")
+        raise
+    return parsed_path
+
+
 def process_single_paper(
     source: str,
     output_base: Path,
     quality_threshold: float = 0.70,
     paper_id: Optional[str] = None,
     metadata: Optional[Dict] = None,
-    min_quality_score: Optional[int] = None # 0..100, filter facts by quality score before normalization
+    min_quality_score: Optional[int] = None, # 0..100, filter facts by quality score before normalization
+    triples: Optional[List] = None,  # already extracted (e.g. by the corpus scheduler): skip parse + extract
+    quality_methods: Optional[List[str]] = None,  # default: heuristic
+    adaptive_quality: bool = False  # gate on a stratified sample, grown until its interval clears the threshold
 ) -> dict:
     """Process one paper through the full pipeline with quality gates."""
     # Generate paper_id
     if paper_id is None:
-        if source.startswith('http'):
-            import hashlib
-            paper_id = hashlib.md5(source.encode()).hexdigest()[:12]
-        else:
-            paper_id = Path(source).stem
+        paper_id = make_paper_id(source)
 
     metadata = metadata or {}
 
@@ -62,32 +97,26 @@ def process_single_paper(
     print(f"🔗 Source: {source}")
     print(f"{'='*60}\n")
 
-    # 1) Parse
-    print("1️⃣ Parsing document...")
-    parsed_path = output_base / "interim" / f"{paper_id}_parsed.json"
-    parsed_path.parent.mkdir(parents=True, exist_ok=True)
+    parsed_path = parsed_path_for(output_base, paper_id)
+    extracted_path = extracted_path_for(output_base, paper_id)
 
-    try:
-        parsed_doc = parse_document(source, source_id=paper_id)
-        if metadata:
-            parsed_doc["metadata"].update(metadata)
-        parsed_path.write_text(json.dumps(parsed_doc, indent=2), encoding="utf-8")
-        print(f"   ✅ Parsed → {parsed_path}")
-    except Exception as e:
-        print(f"   ❌ Parse failed: {e}")
-        raise
+    if triples is None:
+        # 1) Parse
+        print("1️⃣ Parsing document...")
+        parse_stage(source, output_base, paper_id, metadata)
 
-    # 2) Extract
-    print("\n2️⃣ Extracting facts...")
-    extracted_path = output_base / "processed" / "extracted" / f"{paper_id}_extracted.json"
-    extracted_path.parent.mkdir(parents=True, exist_ok=True)
+        # 2) Extract
+        print("\n2️⃣ Extracting facts...")
+        extracted_path.parent.mkdir(parents=True, exist_ok=True)
 
-    try:
-        triples = extract_pipeline(parsed_path, extracted_path)
-        print(f"   ✅ Extracted {len(triples)} facts → {extracted_path}")
-    except Exception as e:
-        print(f"   ❌ Extraction failed: {e}")
-        raise
+        try:
+            triples = extract_pipeline(parsed_path, extracted_path)
+            print(f"   ✅ Extracted {len(triples)} facts → {extracted_path}")
+        except Exception as e:
+            print(f"   ❌ Extraction failed: {e}")
+            raise
+    else:
+        print(f"1️⃣ 2️⃣ Parsed + extracted by corpus scheduler: {len(triples)} facts → {extracted_path}")
 
     # 3) Validate
     print("\n3️⃣ Validating facts...")
@@ -109,15 +138,27 @@ def process_single_paper(
     quality_report_path = output_base / "eval" / f"{paper_id}_quality_report.json"
     quality_report_path.parent.mkdir(parents=True, exist_ok=True)
     
+    quality_methods = quality_methods or ["heuristic"]
+    if adaptive_quality and min_quality_score is not None:
+        # The score filter needs a result for every fact
+        print("   ℹ️  --min-quality-score set: assessing every fact instead of an adaptive sample")
+        adaptive_quality = False
+    
     try:
-        quality_report = assess_quality(valid_facts, methods=["heuristic"])
+        quality_report = assess_quality(valid_facts, methods=quality_methods,
+                                        precision_threshold=quality_threshold if adaptive_quality else None)
         quality_report_path.write_text(json.dumps(quality_report, indent=2), encoding="utf-8")
         
         precision = quality_report.get("estimated_precision", 0)  # 0..1
         avg_quality = quality_report.get("average_quality_score", 0)  # 0..100
+        decision = quality_report.get("sampling", {}).get("decision")  # pass / fail / undecided (adaptive only)
         
         print(f"   📊 Quality Score: {avg_quality:.1f}/100")
         print(f"   📊 Estimated Precision: {precision:.1%}")
+        interval = quality_report.get("precision_interval")
+        if interval:
+            print(f"   📊 {interval['confidence']:.0%} interval: [{interval['low']:.1%}, {interval['high']:.1%}] "
+                  f"from {quality_report['assessed_facts']}/{quality_report['total_facts']} facts")
 
         # Optional: filter facts by min_quality_score and recompute precision
         validated_path_to_use = output_base / "processed" / "validated" / f"{paper_id}_validated.json"
@@ -130,7 +171,7 @@ def process_single_paper(
             print(f"   📉 Filtered facts: kept {len(filtered_facts)}/{len(valid_facts)}")
 
             # Recompute quality on filtered set
-            filtered_quality_report = assess_quality(filtered_facts, methods=["heuristic"])
+            filtered_quality_report = assess_quality(filtered_facts, methods=quality_methods)
             filtered_precision = filtered_quality_report.get("estimated_precision", 0)
             filtered_avg_quality = filtered_quality_report.get("average_quality_score", 0)
 
@@ -170,8 +211,10 @@ def process_single_paper(
                 valid_facts = filtered_facts  # downstream metrics
                 print(f"   ✅ Quality gate passed after filtering ({precision:.1%} ≥ {quality_threshold:.1%})")
 
-        # No filtering: enforce gate on full set
-        if not filtered_mode and precision < quality_threshold:
+        # No filtering: enforce gate on full set (or on the interval of an adaptive sample)
+        if decision == "undecided":
+            print(f"   ⚠️  Interval still straddles {quality_threshold:.1%} after the sampling budget; gating on the point estimate")
+        if not filtered_mode and (decision == "fail" or (decision != "pass" and precision < quality_threshold)):
             print(f"\n   ❌ QUALITY GATE FAILED")
             print(f"   📉 Precision {precision:.1%} < threshold {quality_threshold:.1%}")
             print(f"   💡 Review quality report: {quality_report_path}")
@@ -238,36 +281,76 @@ def process_single_paper(
 def process_multiple_papers(
     sources: List[str],
     output_base: Path,
-    quality_threshold: float = 0.70
+    quality_threshold: float = 0.70,
+    model: str = "gpt-4o",
+    max_workers: int = DEFAULT_WORKERS,
+    rpm: int = DEFAULT_RPM,
+    tpm: int = DEFAULT_TPM,
+    quality_methods: Optional[List[str]] = None,
+    adaptive_quality: bool = False
 ) -> None:
-    """Process multiple papers and generate summary report."""
-    results: List[Dict] = []
+    """Process multiple papers and generate summary report.
 
+    All papers are parsed first; their sections are then extracted together by the
+    corpus scheduler under one shared RPM/TPM budget before each paper goes through
+    validation, quality and normalization.
+    """
+    results: List[Dict] = []
+    failed_ids = set()
+
+    def record_failure(source: str, pid: str, e: Exception) -> None:
+        print(f"❌ Failed to process {source}: {e}")
+        import traceback
+        traceback.print_exc()
+        failed_ids.add(pid)
+        results.append({
+            "paper_id": pid,
+            "source": source,
+            "error": str(e),
+            "status": "FAILED"
+        })
+
+    # Phase 1: parse every paper
+    paper_ids = {source: make_paper_id(source) for source in sources}
     for i, source in enumerate(sources, 1):
         print(f"\n\n{'='*60}")
-        print(f"🔄 Paper {i}/{len(sources)}")
+        print(f"📄 Parsing paper {i}/{len(sources)}: {paper_ids[source]}")
         print(f"{'='*60}")
-
         try:
-            result = process_single_paper(source, output_base, quality_threshold)
-            results.append(result)
+            parse_stage(source, output_base, paper_ids[source])
         except Exception as e:
-            print(f"❌ Failed to process {source}: {e}")
-            import traceback
-            traceback.print_exc()
+            record_failure(source, paper_ids[source], e)
 
-            if source.startswith('http'):
-                import hashlib
-                pid = hashlib.md5(source.encode()).hexdigest()[:12]
-            else:
-                pid = Path(source).stem
+    # Phase 2: extract all queued sections through the global scheduler
+    parsed = [s for s in sources if paper_ids[s] not in failed_ids]
+    for source in parsed:
+        extracted_path_for(output_base, paper_ids[source]).parent.mkdir(parents=True, exist_ok=True)
+    print(f"\n\n{'='*60}")
+    print(f"🔬 Extracting {len(parsed)} papers with the corpus scheduler")
+    print(f"{'='*60}")
+    extracted, scheduler_stats = extract_corpus(
+        [(parsed_path_for(output_base, paper_ids[s]), extracted_path_for(output_base, paper_ids[s])) for s in parsed],
+        model=model,
+        max_workers=max_workers,
+        rpm=rpm,
+        tpm=tpm,
+    )
 
-            results.append({
-                "paper_id": pid,
-                "source": source,
-                "error": str(e),
-                "status": "FAILED"
-            })
+    # Phase 3: validate → quality → normalize per paper
+    for i, source in enumerate(parsed, 1):
+        print(f"\n\n{'='*60}")
+        print(f"🔄 Paper {i}/{len(parsed)}")
+        print(f"{'='*60}")
+
+        pid = paper_ids[source]
+        try:
+            if pid not in extracted:
+                raise RuntimeError(scheduler_stats.failed_papers.get(pid, "extraction produced no output"))
+            result = process_single_paper(source, output_base, quality_threshold, paper_id=pid, triples=extracted[pid],
+                                          quality_methods=quality_methods, adaptive_quality=adaptive_quality)
+            results.append(result)
+        except Exception as e:
+            record_failure(source, pid, e)
 
     # Summary
     print(f"\n\n{'='*60}")
@@ -309,8 +392,27 @@ def process_multiple_papers(
 
     summary_path = output_base / "reports" / "batch_summary.json"
     summary_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"\n🗓  Scheduler: {scheduler_stats.sections_dispatched} sections dispatched, "
+          f"{scheduler_stats.sections_reused} reused, ~{scheduler_stats.tokens_per_minute:,.0f} tokens/min")
+
+    # LLM cost/latency rollup for this run only
+    telemetry = summarize_ledger(load_ledger(run_id=RUN_ID))
+    print_summary(telemetry)
+    for r in results:
+        r["llm_telemetry"] = telemetry["by_paper"].get(r["paper_id"])
+
+    # batch_summary.json stays a list of per-paper results; run-level stats go next to it
     summary_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
-    print(f"\n💾 Summary report: {summary_path}")
+    run_summary_path = summary_path.with_name("batch_run_summary.json")
+    run_summary = {
+        "run_id": RUN_ID,
+        "papers": [r["paper_id"] for r in results],
+        "scheduler": scheduler_stats.to_dict(),
+        "llm_telemetry": telemetry["overall"],
+        "llm_telemetry_by_stage": telemetry["by_stage"],
+    }
+    run_summary_path.write_text(json.dumps(run_summary, indent=2), encoding="utf-8")
+    print(f"\n💾 Summary report: {summary_path} (run stats: {run_summary_path})")
 
 
 def main():
@@ -323,6 +425,15 @@ def main():
     parser.add_argument("--output-base", type=Path, default=Path("data"), help="Base output directory (default: data)")
     parser.add_argument("--quality-threshold", type=float, default=0.95, help="Minimum precision to pass quality gate")
     parser.add_argument("--min-quality-score", type=int, default=None, help="Filter facts by min quality score (0–100) before normalization")
+    parser.add_argument("--quality-methods", nargs="+", default=["heuristic"],
+                        choices=["heuristic", "nli", "entailment", "llm_judge", "knowledge_base"],
+                        help="Quality assessment methods for the gate (default: heuristic)")
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="Gate on a stratified sample grown until its precision interval clears or fails --quality-threshold")
+    parser.add_argument("--model", default="gpt-4o", help="OpenAI model for extraction (batch mode)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent extraction calls across all papers (batch mode)")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_RPM, help="Shared requests-per-minute budget (default: $OPENAI_RPM_LIMIT or 500)")
+    parser.add_argument("--tpm", type=int, default=DEFAULT_TPM, help="Shared tokens-per-minute budget (default: $OPENAI_TPM_LIMIT or 30000)")
     args = parser.parse_args()
 
     # Collect sources
@@ -363,7 +474,9 @@ def main():
                 sources[0],
                 output_base,
                 args.quality_threshold,
-                min_quality_score=args.min_quality_score
+                min_quality_score=args.min_quality_score,
+                quality_methods=args.quality_methods,
+                adaptive_quality=args.adaptive_quality
             )
         except Exception as e:
             print(f"\n❌ Processing failed: {e}")
@@ -372,7 +485,13 @@ def main():
         process_multiple_papers(
             sources,
             output_base,
-            args.quality_threshold
+            args.quality_threshold,
+            model=args.model,
+            max_workers=args.workers,
+            rpm=args.rpm,
+            tpm=args.tpm,
+            quality_methods=args.quality_methods,
+            adaptive_quality=args.adaptive_quality
         )
 
 if __name__ == "__main__":
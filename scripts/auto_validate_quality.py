@@ -3,11 +3,17 @@ Automated quality assessment for extracted facts using multiple methods.
 Usage: python -m scripts.auto_validate_quality --input data/processed/validated/<paper>_validated.json
 """
 import argparse
+import asyncio
 import json
 import os
 import sys
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
@@ -19,6 +25,18 @@ try:
 except ImportError:
     pass
 
+from src.core.app_config import get_setting
+from src.core.cache_store import CacheStore, make_key
+from src.core.embedding_store import EmbeddingStore
+from src.core.entailment import EntailmentScorer
+from src.core.fact_stream import load_facts
+from src.core.quality_sampling import sample_precision
+from src.core.telemetry import record_llm_call, record_response, write_records
+from src.core.token_count import estimate_messages_tokens
+from src.core.vocabulary import get_vocabulary
+
+VOCAB = get_vocabulary()
+
 # Optional OpenAI for LLM-based validation
 try:
     import openai
@@ -59,14 +77,8 @@ def heuristic_quality_check(fact: dict) -> dict[str, any]:
         issues.append("Condition not explicitly mentioned in span")
     
     # Check 3: Relation consistency
-    relation_keywords = {
-        'TREATS': ['treat', 'treatment', 'effective', 'efficacy', 'therapy'],
-        'IMPROVES': ['improve', 'better', 'enhance', 'increase', 'reduce'],
-        'ASSOCIATED_WITH_SE': ['side effect', 'adverse', 'tolera', 'experience'],
-        'EQUIVALENT_TO': ['similar', 'equivalent', 'not better', 'no difference', 'comparable'],
-        'SUPERIOR_TO': ['better than', 'superior', 'more effective', 'outperform'],
-    }
-    
+    relation_keywords = VOCAB.relation_keywords
+
     if relation in relation_keywords:
         keywords = relation_keywords[relation]
         if not any(kw in span for kw in keywords):
@@ -98,66 +110,101 @@ def heuristic_quality_check(fact: dict) -> dict[str, any]:
 # -----------------------------
 # Method 2: NLI (Natural Language Inference)
 # -----------------------------
+NLI_MODEL = 'all-MiniLM-L6-v2'
+NLI_BATCH_SIZE = 128
+NLI_THRESHOLD = 0.5  # similarity above this = likely supported
+
+@lru_cache(maxsize=2)
+def load_sentence_model(model_name: str = NLI_MODEL):
+    """SentenceTransformer loaded once per process (None if sentence-transformers is missing)."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    return SentenceTransformer(model_name)
+
+def fact_claim(fact: dict) -> str:
+    """Claim sentence built from a fact: "<drug> <relation> <condition>"."""
+    drug = fact.get('drug_name', '')
+    condition = fact.get('condition_name', '')
+    relation = str(fact.get('relation', '')).replace('_', ' ').lower()
+    return f"{drug} {relation} {condition}"
+
+def nli_quality_batch(facts: list[dict], model_name: str = NLI_MODEL, batch_size: int = NLI_BATCH_SIZE,
+                      use_store: bool = None) -> list[dict]:
+    """
+    Span/claim similarity for many facts at once.
+    Each distinct claim and span is encoded once (facts often share a span), in
+    batches of ``batch_size``, and kept in the embedding store for later runs;
+    cosine similarities are one row-wise product of the normalized claim and span
+    matrices. ``use_store`` overrides ``embedding_store.enabled``.
+    """
+    if not facts:
+        return []
+    claims = [fact_claim(fact) for fact in facts]
+    spans = [str(fact.get('span', '')) for fact in facts]
+    texts = list(dict.fromkeys(claims + spans))
+    row = {text: i for i, text in enumerate(texts)}
+    
+    # Texts already in the embedding store skip the model (which is then not even loaded).
+    # With a store, ``vectors`` is its memory map and ``row`` points at store rows, so
+    # claim and span vectors are gathered from the map once each
+    store = EmbeddingStore.from_config(model_name, enabled=use_store)
+    rows = store.lookup(texts) if store is not None else None
+    if rows is None:
+        model = load_sentence_model(model_name)
+        if model is None:
+            return [{
+                'quality_score': None,
+                'likely_correct': None,
+                'error': 'sentence-transformers not installed'
+            } for _ in facts]
+        def encode(batch: list[str]) -> np.ndarray:
+            return model.encode(batch, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        if store is not None:
+            rows = store.encode_rows(texts, encode)
+        else:
+            vectors = np.asarray(encode(texts), dtype=np.float32)
+    if rows is not None:
+        vectors = store.matrix
+        row = {text: rows[i] for text, i in row.items()}
+    
+    claim_vecs = vectors[[row[c] for c in claims]]
+    span_vecs = vectors[[row[s] for s in spans]]
+    similarities = np.einsum('ij,ij->i', claim_vecs, span_vecs)
+    
+    return [{
+        'quality_score': int(similarity * 100),
+        'likely_correct': similarity > NLI_THRESHOLD,
+        'similarity': similarity,
+        'method': 'sentence_similarity'
+    } for similarity in map(float, similarities)]
+
 def nli_quality_check(fact: dict) -> dict[str, any]:
     """
     Use textual entailment: Does the span support the claim?
-    Requires sentence-transformers or similar library.
+    Requires sentence-transformers; batch many facts with nli_quality_batch.
     """
-    try:
-        from sentence_transformers import SentenceTransformer, util
-        
-        # Load model (cache it globally in production)
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        
-        # Construct claim from fact
-        drug = fact.get('drug_name', '')
-        condition = fact.get('condition_name', '')
-        relation = fact.get('relation', '').replace('_', ' ').lower()
-        claim = f"{drug} {relation} {condition}"
-        
-        # Get span
-        span = fact.get('span', '')
-        
-        # Compute similarity
-        embeddings = model.encode([claim, span])
-        similarity = float(util.cos_sim(embeddings[0], embeddings[1])[0][0])
-        
-        # Threshold: >0.5 = likely supported
-        return {
-            'quality_score': int(similarity * 100),
-            'likely_correct': similarity > 0.5,
-            'similarity': similarity,
-            'method': 'sentence_similarity'
-        }
-        
-    except ImportError:
-        return {
-            'quality_score': None,
-            'likely_correct': None,
-            'error': 'sentence-transformers not installed'
-        }
+    return nli_quality_batch([fact])[0]
 
 # -----------------------------
 # Method 3: LLM-as-Judge
 # -----------------------------
-def llm_judge_quality_check(fact: dict, model: str = "gpt-4o") -> dict[str, any]:
-    """
-    Use another LLM call to verify the extraction.
-    Most accurate but costs API calls.
-    """
-    if not OPENAI_AVAILABLE or not client:
-        return {
-            'quality_score': None,
-            'likely_correct': None,
-            'error': 'OpenAI not available or API key not set'
-        }
-    
+JUDGE_MODEL = "gpt-4o"
+JUDGE_BATCH_SIZE = int(get_setting("quality.judge.batch_size", 8))          # facts per prompt
+JUDGE_CONCURRENCY = int(get_setting("quality.judge.concurrency", 8))        # prompts in flight
+JUDGE_RPM = int(get_setting("quality.judge.rpm") or os.getenv("OPENAI_RPM_LIMIT", "500"))
+JUDGE_TPM = int(get_setting("quality.judge.tpm") or os.getenv("OPENAI_TPM_LIMIT", "30000"))
+JUDGE_COMPLETION_TOKENS_PER_FACT = 120  # reserved against TPM per verdict
+
+def judge_prompt(fact: dict) -> str:
+    """Single-fact judge prompt."""
     drug = fact.get('drug_name', '')
     condition = fact.get('condition_name', '')
     relation = fact.get('relation', '')
     span = fact.get('span', '')
     
-    prompt = f"""You are a fact-checker for medical literature extraction.
+    return f"""You are a fact-checker for medical literature extraction.
 
 EXTRACTED FACT:
 - Drug/Treatment: {drug}
@@ -179,30 +226,299 @@ Respond in JSON format:
 
 Be strict: The fact must be directly supported by the text."""
 
+def judge_batch_prompt(facts: list[dict]) -> str:
+    """Multi-fact judge prompt: one indexed verdict per fact."""
+    items = "\n\n".join(
+        f"[{i}]\n"
+        f"- Drug/Treatment: {fact.get('drug_name', '')}\n"
+        f"- Relation: {fact.get('relation', '')}\n"
+        f"- Condition: {fact.get('condition_name', '')}\n"
+        f"SUPPORTING TEXT: \"{fact.get('span', '')}\""
+        for i, fact in enumerate(facts)
+    )
+    
+    return f"""You are a fact-checker for medical literature extraction.
+
+Each numbered item is an EXTRACTED FACT with its SUPPORTING TEXT.
+
+{items}
+
+TASK: For each item, does its supporting text accurately support its extracted fact? Judge every item on its own text only.
+
+Respond in JSON format, with exactly one verdict per item:
+{{
+  "verdicts": [
+    {{
+      "index": item number,
+      "is_correct": true or false,
+      "confidence": 0.0 to 1.0,
+      "reasoning": "brief explanation",
+      "issues": ["list", "of", "problems"] or []
+    }}
+  ]
+}}
+
+Be strict: The fact must be directly supported by the text."""
+
+# Verdicts are cached per (prompt version, model, judged fields); editing either judge
+# prompt changes the version, so old verdicts are never served for a new prompt.
+JUDGED_FIELDS = ('drug_name', 'relation', 'condition_name', 'span')
+JUDGE_PROMPT_VERSION = make_key(judge_prompt({}), judge_batch_prompt([{}, {}]))[:12]
+
+def judge_cache(use_cache: bool = None) -> CacheStore:
+    """Verdict cache per ``quality.judge.cache`` in configs/app.yaml (``use_cache`` overrides); None when off."""
+    cache_cfg = get_setting("quality.judge.cache", {})
+    if not (cache_cfg.get("enabled", True) if use_cache is None else use_cache):
+        return None
+    ttl_days = cache_cfg.get("ttl_days")
+    return CacheStore(cache_cfg.get("path", "data/cache/quality.sqlite"), namespace="judge",
+                      ttl=ttl_days * 86400 if ttl_days else None)
+
+def judge_cache_key(fact: dict, model: str = JUDGE_MODEL) -> str:
+    return make_key(JUDGE_PROMPT_VERSION, model, *(str(fact.get(field, '')) for field in JUDGED_FIELDS))
+
+def _record_judge_hits(facts: list[dict], model: str) -> None:
+    """Ledger records for verdicts served from the cache (no tokens, one per fact)."""
+    write_records([record_llm_call("judge", model, fact.get('source_id'), section=fact.get('section'),
+                                   cache_hit=True, outcome="cached", facts=1, write=False) for fact in facts])
+
+def _judge_verdict(result: dict) -> dict:
+    return {
+        'quality_score': int(result.get('confidence', 0) * 100),
+        'likely_correct': result.get('is_correct', False),
+        'reasoning': result.get('reasoning', ''),
+        'issues': result.get('issues', []),
+        'method': 'llm_judge'
+    }
+
+def _judge_error(error: str) -> dict:
+    return {
+        'quality_score': None,
+        'likely_correct': None,
+        'error': error
+    }
+
+def llm_judge_quality_check(fact: dict, model: str = JUDGE_MODEL, use_cache: bool = None) -> dict[str, any]:
+    """
+    Use another LLM call to verify the extraction.
+    Most accurate but costs API calls; judge many facts with llm_judge_batch.
+    """
+    store = judge_cache(use_cache)
+    try:
+        return _judge_one(fact, model, store)
+    finally:
+        if store is not None:
+            store.close()
+
+def _judge_one(fact: dict, model: str, store: CacheStore = None) -> dict:
+    key = judge_cache_key(fact, model)
+    cached = store.get(key) if store is not None else None
+    if cached is not None:
+        _record_judge_hits([fact], model)
+        return cached
+    if not OPENAI_AVAILABLE or not client:
+        return _judge_error('OpenAI not available or API key not set')
+    
+    response = None
+    started = time.perf_counter()
+    call_fields = {"source_id": fact.get('source_id'), "section": fact.get('section')}
     try:
         response = client.chat.completions.create(
             model=model,
-            messages=[{"role": "user", "content": prompt}],
+            messages=[{"role": "user", "content": judge_prompt(fact)}],
             temperature=0.1,
             response_format={"type": "json_object"}
         )
         
         result = json.loads(response.choices[0].message.content)
-        
-        return {
-            'quality_score': int(result.get('confidence', 0) * 100),
-            'likely_correct': result.get('is_correct', False),
-            'reasoning': result.get('reasoning', ''),
-            'issues': result.get('issues', []),
-            'method': 'llm_judge'
-        }
+        record_response("judge", model, response, started, outcome="ok", **call_fields)
+        verdict = _judge_verdict(result)
+        if store is not None:
+            store.set(key, verdict)
+        return verdict
         
     except Exception as e:
-        return {
-            'quality_score': None,
-            'likely_correct': None,
-            'error': str(e)
-        }
+        outcome = "parse_error" if isinstance(e, json.JSONDecodeError) else "error"
+        record_response("judge", model, response, started, outcome=outcome, **call_fields)
+        return _judge_error(str(e))
+
+@dataclass
+class JudgeStats:
+    facts: int = 0
+    prompts: int = 0
+    batch_prompts: int = 0
+    fallback_facts: int = 0  # judged by a single-fact prompt after a bad batch verdict
+    parse_failures: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    cache_evictions: int = 0
+    seconds: float = 0.0
+    rate_limit_worker_wait_seconds: float = 0.0  # summed over concurrent prompts
+
+    @property
+    def facts_per_minute(self) -> float:
+        return self.facts * 60 / self.seconds if self.seconds else 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cache_hits / self.facts if self.facts else None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['cache_hit_rate'] = round(self.cache_hit_rate, 3) if self.cache_hit_rate is not None else None
+        data['seconds'] = round(self.seconds, 2)
+        data['rate_limit_worker_wait_seconds'] = round(self.rate_limit_worker_wait_seconds, 2)
+        data['facts_per_minute'] = round(self.facts_per_minute, 1)
+        return data
+
+class _AsyncJudge:
+    """Concurrent judge calls sharing one async client, semaphore and rate limiter."""
+    
+    def __init__(self, aclient, model: str, concurrency: int, limiter, stats: JudgeStats):
+        self.aclient = aclient
+        self.model = model
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.limiter = limiter
+        self.stats = stats
+    
+    async def _complete(self, prompt: str, n_facts: int, call_fields: dict) -> dict:
+        """One judge call; returns the parsed JSON (raises on API or parse errors)."""
+        messages = [{"role": "user", "content": prompt}]
+        async with self.semaphore:
+            await self.limiter.acquire_async(
+                estimate_messages_tokens(messages) + JUDGE_COMPLETION_TOKENS_PER_FACT * n_facts)
+            response = None
+            started = time.perf_counter()
+            self.stats.prompts += 1
+            try:
+                response = await self.aclient.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.1,
+                    response_format={"type": "json_object"}
+                )
+                result = json.loads(response.choices[0].message.content)
+            except Exception as e:
+                outcome = "parse_error" if isinstance(e, json.JSONDecodeError) else "error"
+                record_response("judge", self.model, response, started, outcome=outcome, facts=n_facts, **call_fields)
+                raise
+            record_response("judge", self.model, response, started, outcome="ok", facts=n_facts, **call_fields)
+            return result
+    
+    async def single(self, fact: dict) -> dict:
+        call_fields = {"source_id": fact.get('source_id'), "section": fact.get('section')}
+        try:
+            return _judge_verdict(await self._complete(judge_prompt(fact), 1, call_fields))
+        except Exception as e:
+            self.stats.errors += 1
+            return _judge_error(str(e))
+    
+    async def batch(self, facts: list[dict]) -> list[dict]:
+        """Judge ``facts`` in one prompt; facts without a usable verdict are re-judged alone."""
+        if len(facts) == 1:
+            return [await self.single(facts[0])]
+        self.stats.batch_prompts += 1
+        call_fields = {"source_id": facts[0].get('source_id'), "section": facts[0].get('section'), "batch_size": len(facts)}
+        verdicts: dict[int, dict] = {}
+        try:
+            result = await self._complete(judge_batch_prompt(facts), len(facts), call_fields)
+            for verdict in result.get('verdicts') or []:
+                index = verdict.get('index') if isinstance(verdict, dict) else None
+                if (isinstance(index, int) and 0 <= index < len(facts) and isinstance(verdict.get('is_correct'), bool)
+                        and isinstance(verdict.get('confidence', 0), (int, float))):
+                    verdicts.setdefault(index, verdict)
+        except Exception:
+            pass
+        if len(verdicts) < len(facts):
+            self.stats.parse_failures += 1
+        
+        missing = [i for i in range(len(facts)) if i not in verdicts]
+        self.stats.fallback_facts += len(missing)
+        retried = await asyncio.gather(*(self.single(facts[i]) for i in missing))
+        results = {i: _judge_verdict(verdicts[i]) for i in verdicts}
+        results.update(zip(missing, retried))
+        return [results[i] for i in range(len(facts))]
+
+async def _judge_all(facts: list[dict], model: str, batch_size: int, concurrency: int,
+                     rpm: int, tpm: int, stats: JudgeStats) -> list[dict]:
+    # extract_scheduler pulls in the extraction client, so import only once an API key is known to be set
+    from src.core.extract_scheduler import RateLimiter
+    
+    limiter = RateLimiter(rpm=rpm, tpm=tpm)
+    async with openai.AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY')) as aclient:
+        judge = _AsyncJudge(aclient, model, concurrency, limiter, stats)
+        batches = [facts[i:i + batch_size] for i in range(0, len(facts), batch_size)]
+        judged = await asyncio.gather(*(judge.batch(batch) for batch in batches))
+    stats.rate_limit_worker_wait_seconds = limiter.total_wait
+    return [result for batch in judged for result in batch]
+
+def llm_judge_batch(
+    facts: list[dict],
+    model: str = JUDGE_MODEL,
+    batch_size: int = JUDGE_BATCH_SIZE,
+    concurrency: int = JUDGE_CONCURRENCY,
+    rpm: int = JUDGE_RPM,
+    tpm: int = JUDGE_TPM,
+    stats: JudgeStats = None,
+    use_cache: bool = None,
+) -> list[dict]:
+    """
+    Judge many facts concurrently: ``batch_size`` facts per prompt with indexed
+    verdicts, up to ``concurrency`` prompts in flight under an RPM/TPM limiter.
+    Facts whose batch verdict is missing or malformed are re-judged one per prompt.
+    Cached verdicts (see judge_cache) are reused and facts with the same judged
+    fields are judged once. Results are in input order, same shape as
+    llm_judge_quality_check.
+    """
+    stats = stats if stats is not None else JudgeStats()
+    if not facts:
+        return []
+    started = time.perf_counter()
+    store = judge_cache(use_cache)
+    try:
+        keys = [judge_cache_key(fact, model) for fact in facts]
+        verdicts = store.get_many(keys) if store is not None else {}
+        hits = [fact for key, fact in zip(keys, facts) if key in verdicts]
+        stats.cache_hits += len(hits)
+        _record_judge_hits(hits, model)
+        
+        pending = {key: fact for key, fact in zip(keys, facts) if key not in verdicts}
+        if pending and OPENAI_AVAILABLE and client:
+            judged = asyncio.run(_judge_all(list(pending.values()), model, max(1, batch_size), concurrency, rpm, tpm, stats))
+            fresh = dict(zip(pending, judged))
+            verdicts.update(fresh)
+            if store is not None:
+                store.set_many({key: verdict for key, verdict in fresh.items() if verdict.get('error') is None})
+                stats.cache_evictions += store.evict(get_setting("quality.judge.cache.max_entries"))
+    finally:
+        if store is not None:
+            store.close()
+    
+    stats.facts += len(facts)
+    stats.seconds += time.perf_counter() - started
+    unavailable = _judge_error('OpenAI not available or API key not set')
+    return [verdicts.get(key, unavailable) for key in keys]
+
+def judge_agreement(facts: list[dict], batched: list[dict], sample_size: int,
+                    model: str = JUDGE_MODEL, concurrency: int = JUDGE_CONCURRENCY, seed: int = 0) -> dict:
+    """
+    Re-judge a sample of facts one per prompt and compare with their batched verdicts.
+    """
+    import random
+    
+    indices = sorted(random.Random(seed).sample(range(len(facts)), min(sample_size, len(facts))))
+    single = llm_judge_batch([facts[i] for i in indices], model=model, batch_size=1, concurrency=concurrency,
+                             use_cache=False)
+    pairs = [(batched[i], s) for i, s in zip(indices, single)
+             if batched[i].get('likely_correct') is not None and s.get('likely_correct') is not None]
+    agree = sum(1 for b, s in pairs if b['likely_correct'] == s['likely_correct'])
+    return {
+        'sampled': len(indices),
+        'compared': len(pairs),
+        'agreement_rate': agree / len(pairs) if pairs else None,
+        'mean_score_difference': (sum(abs(b['quality_score'] - s['quality_score']) for b, s in pairs) / len(pairs)
+                                  if pairs else None),
+    }
 
 # -----------------------------
 # Method 4: Cross-Reference with Knowledge Base
@@ -241,15 +557,68 @@ def knowledge_base_check(fact: dict) -> dict[str, any]:
         'method': 'knowledge_base'
     }
 
+# -----------------------------
+# Method 5: Entailment (NLI cross-encoder)
+# -----------------------------
+ENTAILMENT_THRESHOLD = 0.5  # P(entailment vs contradiction) at or above this = supported
+
+@lru_cache(maxsize=2)
+def load_entailment_scorer(model_name: str = None):
+    """Quantized cross-encoder loaded once per process (None if onnxruntime/tokenizers are missing)."""
+    try:
+        return EntailmentScorer.from_config(model_name)
+    except ImportError:
+        return None
+
+def entailment_quality_batch(facts: list[dict], model_name: str = None) -> list[dict]:
+    """
+    Does the span entail the claim? Scores each distinct (span, claim) pair once
+    with the int8 ONNX cross-encoder; quality_score is P(entailment) against
+    P(contradiction), so negated or reversed claims score low.
+    """
+    if not facts:
+        return []
+    scorer = load_entailment_scorer(model_name)
+    if scorer is None:
+        return [{
+            'quality_score': None,
+            'likely_correct': None,
+            'error': 'onnxruntime/tokenizers not installed (the one-time export also needs optimum)'
+        } for _ in facts]
+    
+    pairs = [(str(fact.get('span', '')), fact_claim(fact)) for fact in facts]
+    distinct = list(dict.fromkeys(pairs))
+    row = {pair: i for i, pair in enumerate(distinct)}
+    entailment, probs = scorer.entailment_vs_contradiction([p for p, _ in distinct], [h for _, h in distinct])
+    
+    results = []
+    for pair in pairs:
+        i = row[pair]
+        label_probs = {label: round(float(p), 4) for label, p in zip(scorer.labels, probs[i])}
+        results.append({
+            'quality_score': int(entailment[i] * 100),
+            'likely_correct': bool(entailment[i] >= ENTAILMENT_THRESHOLD),
+            'entailment_probability': float(entailment[i]),
+            'label_probabilities': label_probs,
+            'method': 'entailment'
+        })
+    return results
+
+def entailment_quality_check(fact: dict) -> dict[str, any]:
+    """Cross-encoder entailment for one fact; batch many with entailment_quality_batch."""
+    return entailment_quality_batch([fact])[0]
+
 # -----------------------------
 # Combined Quality Assessment
 # -----------------------------
-def assess_fact_quality(fact: dict, methods: list[str] = None) -> dict:
+def assess_fact_quality(fact: dict, methods: list[str] = None, precomputed: dict[str, dict] = None) -> dict:
     """
     Run multiple quality checks and combine results.
+    ``precomputed`` holds method results already computed in batch (e.g. {'nli': {...}, 'llm_judge': {...}}).
     """
     if methods is None:
         methods = ['heuristic', 'nli', 'knowledge_base']  # Default: fast methods
+    precomputed = precomputed or {}
     
     results = {}
     
@@ -257,10 +626,13 @@ def assess_fact_quality(fact: dict, methods: list[str] = None) -> dict:
         results['heuristic'] = heuristic_quality_check(fact)
     
     if 'nli' in methods:
-        results['nli'] = nli_quality_check(fact)
+        results['nli'] = precomputed['nli'] if 'nli' in precomputed else nli_quality_check(fact)
+    
+    if 'entailment' in methods:
+        results['entailment'] = precomputed['entailment'] if 'entailment' in precomputed else entailment_quality_check(fact)
     
     if 'llm_judge' in methods:
-        results['llm_judge'] = llm_judge_quality_check(fact)
+        results['llm_judge'] = precomputed['llm_judge'] if 'llm_judge' in precomputed else llm_judge_quality_check(fact)
     
     if 'knowledge_base' in methods:
         results['knowledge_base'] = knowledge_base_check(fact)
@@ -281,34 +653,128 @@ def assess_fact_quality(fact: dict, methods: list[str] = None) -> dict:
     }
 
 # -----------------------------
-# Batch Assessment
+# Cascade Assessment
 # -----------------------------
-def assess_dataset_quality(
+CASCADE_TIERS = get_setting("quality.cascade.tiers", [])
+CASCADE_COST_PER_FACT = get_setting("quality.cascade.cost_per_fact", {})
+
+def score_method(method: str, facts: list[dict], judge_stats: JudgeStats = None, use_judge_cache: bool = None) -> list[dict]:
+    """Results of one method for ``facts`` (batched where the method supports it)."""
+    if method == 'heuristic':
+        return [heuristic_quality_check(fact) for fact in facts]
+    if method == 'nli':
+        return nli_quality_batch(facts)
+    if method == 'entailment':
+        return entailment_quality_batch(facts)
+    if method == 'llm_judge':
+        return llm_judge_batch(facts, stats=judge_stats, use_cache=use_judge_cache)
+    if method == 'knowledge_base':
+        return [knowledge_base_check(fact) for fact in facts]
+    raise ValueError(f"Unknown quality method: {method}")
+
+def assess_cascade(
     facts: list[dict],
-    methods: list[str] = None,
-    sample_size: int = None
-) -> dict:
+    tiers: list[dict] = None,
+    judge_stats: JudgeStats = None,
+    use_judge_cache: bool = None
+) -> tuple[list[dict], dict]:
     """
-    Assess quality of entire dataset.
+    Early-exit assessment: each tier scores only the facts earlier tiers were unsure
+    about. A fact exits at a tier when its score is >= ``accept`` (likely correct) or
+    <= ``reject`` (likely wrong); the last tier decides everything that reaches it.
+    A method that cannot score a fact (missing dependency, API error) passes it on,
+    and a fact no later tier could score keeps its last available result.
+    Returns per-fact results (same shape as assess_fact_quality plus 'exit_tier')
+    and a report of exits per tier and estimated cost against running every tier on
+    every fact.
     """
-    import random
-    
-    if sample_size and sample_size < len(facts):
-        print(f"📊 Sampling {sample_size} facts for quality assessment...")
-        facts = random.sample(facts, sample_size)
+    tiers = tiers or CASCADE_TIERS
+    if not tiers:
+        raise ValueError("quality.cascade.tiers is empty")
+    judge_stats = judge_stats if judge_stats is not None else JudgeStats()
+    method_results = [{} for _ in facts]
+    verdicts: list = [None] * len(facts)  # (quality_score, likely_correct, tier method)
+    pending = list(range(len(facts)))
+    tier_report = []
     
-    print(f"🔍 Assessing quality of {len(facts)} facts...")
-    print(f"   Methods: {', '.join(methods or ['heuristic', 'nli', 'knowledge_base'])}")
+    for depth, tier in enumerate(tiers):
+        method = tier['method']
+        last = depth == len(tiers) - 1
+        accept, reject = tier.get('accept'), tier.get('reject')
+        stats = {'method': method, 'reached': len(pending), 'accepted': 0, 'rejected': 0, 'passed_on': 0,
+                 'unscored': 0, 'cache_hits': 0, 'seconds': 0.0}
+        tier_report.append(stats)
+        if not pending:
+            continue
+        
+        started = time.perf_counter()
+        hits_before = judge_stats.cache_hits
+        scored = score_method(method, [facts[i] for i in pending], judge_stats, use_judge_cache)
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        stats['cache_hits'] = judge_stats.cache_hits - hits_before
+        still_pending = []
+        for i, result in zip(pending, scored):
+            method_results[i][method] = result
+            score = result.get('quality_score')
+            if score is None:
+                stats['unscored'] += 1
+                still_pending.append(i)
+                continue
+            if accept is not None and score >= accept:
+                verdicts[i] = (score, True, method)
+                stats['accepted'] += 1
+            elif reject is not None and score <= reject:
+                verdicts[i] = (score, False, method)
+                stats['rejected'] += 1
+            else:
+                # Provisional: replaced if a later tier scores the fact
+                verdicts[i] = (score, result.get('likely_correct'), method)
+                if last:
+                    stats['accepted' if result.get('likely_correct') else 'rejected'] += 1
+                else:
+                    stats['passed_on'] += 1
+                    still_pending.append(i)
+        pending = still_pending
+        print(f"   🪜 {method}: {stats['reached']} in → {stats['accepted']} accepted, {stats['rejected']} rejected, "
+              f"{stats['passed_on']} passed on" + (f", {stats['unscored']} unscored" if stats['unscored'] else ""))
     
     results = []
-    for i, fact in enumerate(facts):
-        if (i + 1) % 10 == 0:
-            print(f"   Progress: {i+1}/{len(facts)}")
-        
-        result = assess_fact_quality(fact, methods)
-        results.append(result)
+    for fact, verdict, per_method in zip(facts, verdicts, method_results):
+        score, likely_correct, exit_tier = verdict or (None, None, None)
+        results.append({
+            'fact': fact,
+            'quality_score': score,
+            'likely_correct': likely_correct,
+            'exit_tier': exit_tier,
+            'method_results': per_method
+        })
     
-    # Calculate statistics
+    exits = {tier['method']: 0 for tier in tiers}
+    for result in results:
+        if result['exit_tier'] is not None:
+            exits[result['exit_tier']] += 1
+    unscored = sum(1 for result in results if result['exit_tier'] is None)
+    # Facts a tier could not score (no API key, missing dependency) or served from the
+    # judge cache made no billable call
+    cost = sum((t['reached'] - t['unscored'] - t['cache_hits']) * CASCADE_COST_PER_FACT.get(t['method'], 0.0)
+               for t in tier_report)
+    cost_all = len(facts) * sum(CASCADE_COST_PER_FACT.get(tier['method'], 0.0) for tier in tiers)
+    report = {
+        'tiers': tier_report,
+        'exits': {**exits, **({'unscored': unscored} if unscored else {})},
+        'method_calls': sum(t['reached'] for t in tier_report),
+        'method_calls_all': len(facts) * len(tiers),
+        'estimated_cost_usd': round(cost, 4),
+        'estimated_cost_all_methods_usd': round(cost_all, 4),
+        'estimated_cost_saved_usd': round(cost_all - cost, 4),
+    }
+    return results, report
+
+# -----------------------------
+# Batch Assessment
+# -----------------------------
+def summarize_quality(results: list[dict]) -> dict:
+    """Dataset report (average score, estimated precision) from per-fact results."""
     valid_scores = [r['quality_score'] for r in results if r['quality_score'] is not None]
     avg_quality = sum(valid_scores) / len(valid_scores) if valid_scores else 0
     
@@ -316,12 +782,153 @@ def assess_dataset_quality(
     estimated_precision = len(likely_correct) / len(results) if results else 0
     
     return {
-        'total_facts': len(facts),
+        'total_facts': len(results),
         'average_quality_score': avg_quality,
         'estimated_precision': estimated_precision,
         'results': results
     }
 
+def print_judge_stats(judge_stats: JudgeStats) -> None:
+    print(f"   ⚖️  LLM judge: {judge_stats.facts} facts in {judge_stats.seconds:.1f}s "
+          f"({judge_stats.facts_per_minute:,.0f} facts/min, {judge_stats.prompts} prompts, "
+          f"{judge_stats.fallback_facts} single-fact fallbacks, "
+          f"{judge_stats.cache_hits} cached = {judge_stats.cache_hit_rate:.0%} hit rate)")
+
+def merge_cascade_reports(reports: list[dict]) -> dict:
+    """Sum the cascade reports of several rounds (sampled assessment scores facts in rounds)."""
+    merged = {**reports[0], 'tiers': [dict(tier) for tier in reports[0]['tiers']], 'exits': dict(reports[0]['exits'])}
+    for report in reports[1:]:
+        for tier, other in zip(merged['tiers'], report['tiers']):
+            for key in ('reached', 'accepted', 'rejected', 'passed_on', 'unscored', 'cache_hits', 'seconds'):
+                tier[key] += other[key]
+        for key, count in report['exits'].items():
+            merged['exits'][key] = merged['exits'].get(key, 0) + count
+        for key in ('method_calls', 'method_calls_all', 'estimated_cost_usd',
+                    'estimated_cost_all_methods_usd', 'estimated_cost_saved_usd'):
+            merged[key] += report[key]
+    for tier in merged['tiers']:
+        tier['seconds'] = round(tier['seconds'], 3)
+    for key in ('estimated_cost_usd', 'estimated_cost_all_methods_usd', 'estimated_cost_saved_usd'):
+        merged[key] = round(merged[key], 4)
+    return merged
+
+def assess_methods(facts: list[dict], methods: list[str] = None, judge_stats: JudgeStats = None,
+                   use_judge_cache: bool = None) -> list[dict]:
+    """
+    Per-fact results of ``methods``; batched methods (nli, entailment, llm_judge)
+    run once over all facts up front.
+    """
+    nli_results = None
+    if 'nli' in (methods or ['nli']):
+        started = time.perf_counter()
+        nli_results = nli_quality_batch(facts)
+        if facts and nli_results[0].get('error') is None:
+            elapsed = time.perf_counter() - started
+            print(f"   🧠 NLI: {len(facts)} facts in {elapsed:.1f}s ({len(facts) / max(elapsed, 1e-9):,.0f} facts/s)")
+    
+    entailment_results = None
+    if 'entailment' in (methods or []):
+        started = time.perf_counter()
+        entailment_results = entailment_quality_batch(facts)
+        if facts and entailment_results[0].get('error') is None:
+            elapsed = time.perf_counter() - started
+            print(f"   🔬 Entailment: {len(facts)} facts in {elapsed:.1f}s ({len(facts) / max(elapsed, 1e-9):,.0f} facts/s)")
+    
+    judge_results = None
+    if 'llm_judge' in (methods or []):
+        judge_results = llm_judge_batch(facts, stats=judge_stats, use_cache=use_judge_cache)
+    
+    results = []
+    for i, fact in enumerate(facts):
+        if (i + 1) % 10 == 0:
+            print(f"   Progress: {i+1}/{len(facts)}")
+        
+        precomputed = {}
+        if nli_results:
+            precomputed['nli'] = nli_results[i]
+        if entailment_results:
+            precomputed['entailment'] = entailment_results[i]
+        if judge_results:
+            precomputed['llm_judge'] = judge_results[i]
+        result = assess_fact_quality(fact, methods, precomputed)
+        results.append(result)
+    return results
+
+def assess_dataset_quality(
+    facts: list[dict],
+    methods: list[str] = None,
+    sample_size: int = None,
+    judge_agreement_sample: int = 0,
+    use_judge_cache: bool = None,
+    cascade: bool = False,
+    precision_threshold: float = None
+) -> dict:
+    """
+    Assess quality of entire dataset.
+    With ``sample_size`` only a stratified sample (relation x section x confidence
+    bucket, at least one fact per stratum) is scored and precision is reported
+    with a confidence interval. With ``precision_threshold`` sampling continues in
+    rounds until that interval lies above or below the threshold
+    (src/core/quality_sampling.py; sizes and interval in ``quality.sampling``).
+    With ``cascade`` the tiers in ``quality.cascade`` replace ``methods`` (see
+    assess_cascade). ``judge_agreement_sample`` judged facts are also judged one
+    per prompt to measure batched/single-fact agreement; ``use_judge_cache`` overrides
+    ``quality.judge.cache.enabled``.
+    """
+    print(f"🔍 Assessing quality of {len(facts)} facts...")
+    judge_stats = JudgeStats()
+    cascade_reports = []
+    if cascade:
+        print(f"   Cascade: {' → '.join(tier['method'] for tier in CASCADE_TIERS)}")
+        def score(batch: list[dict]) -> list[dict]:
+            results, cascade_report = assess_cascade(batch, judge_stats=judge_stats, use_judge_cache=use_judge_cache)
+            cascade_reports.append(cascade_report)
+            return results
+    else:
+        print(f"   Methods: {', '.join(methods or ['heuristic', 'nli', 'knowledge_base'])}")
+        def score(batch: list[dict]) -> list[dict]:
+            return assess_methods(batch, methods, judge_stats, use_judge_cache)
+    
+    if precision_threshold is not None or (sample_size and sample_size < len(facts)):
+        estimate, by_index = sample_precision(facts, score, sample_size=sample_size, threshold=precision_threshold)
+        results = [by_index[i] for i in sorted(by_index)]
+        report = summarize_quality(results)
+        report.update({
+            'total_facts': len(facts),
+            'assessed_facts': len(results),
+            'estimated_precision': estimate.precision,
+            'precision_interval': {
+                'low': estimate.low,
+                'high': estimate.high,
+                'confidence': estimate.confidence,
+                'method': estimate.interval,
+            },
+            'sampling': estimate.to_dict(),
+        })
+    else:
+        results = score(facts)
+        report = summarize_quality(results)
+    
+    if cascade_reports:
+        cascade_report = merge_cascade_reports(cascade_reports)
+        print(f"   💰 Estimated cost ${cascade_report['estimated_cost_usd']:.4f} vs "
+              f"${cascade_report['estimated_cost_all_methods_usd']:.4f} running every tier on every fact "
+              f"({cascade_report['method_calls']}/{cascade_report['method_calls_all']} method calls)")
+        report['cascade'] = cascade_report
+    
+    if judge_stats.prompts or judge_stats.cache_hits:
+        print_judge_stats(judge_stats)
+        judge_report = judge_stats.to_dict()
+        judged = [(r['fact'], r['method_results']['llm_judge']) for r in results if 'llm_judge' in r['method_results']]
+        if judge_agreement_sample and judged:
+            agreement = judge_agreement([f for f, _ in judged], [v for _, v in judged], judge_agreement_sample)
+            judge_report['agreement'] = agreement
+            if agreement['agreement_rate'] is not None:
+                print(f"   🤝 Batched vs single-fact agreement: {agreement['agreement_rate']:.1%} "
+                      f"({agreement['compared']} facts)")
+        report['llm_judge_stats'] = judge_report
+    return report
+
 # -----------------------------
 # CLI
 # -----------------------------
@@ -330,12 +937,21 @@ def main():
     parser.add_argument("--input", required=True, help="Path to validated facts JSON")
     parser.add_argument("--output", help="Path for quality report output (default: data/eval/{stem}_quality_report.json)")
     parser.add_argument("--methods", nargs="+",
-                        choices=['heuristic', 'nli', 'llm_judge', 'knowledge_base'],
+                        choices=['heuristic', 'nli', 'entailment', 'llm_judge', 'knowledge_base'],
                         default=['heuristic'],
                         help="Quality assessment methods to use")
-    parser.add_argument("--sample-size", type=int, help="Only assess a random sample (faster)")
+    parser.add_argument("--sample-size", type=int,
+                        help="Only assess a stratified sample and report precision with a confidence interval (faster)")
     parser.add_argument("--use-llm", action="store_true", help="Include LLM-based validation (costs API calls)")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Early-exit cascade over quality.cascade.tiers in configs/app.yaml (replaces --methods)")
+    parser.add_argument("--no-judge-cache", action="store_true",
+                        help="Re-judge every fact instead of reusing cached LLM-judge verdicts")
+    parser.add_argument("--judge-agreement", type=int, default=0, metavar="N",
+                        help="Also judge N sampled facts one per prompt and report batched/single agreement (extra API calls)")
     parser.add_argument("--min-precision", type=float, default=None, help="Fail (exit 1) if estimated precision is below this (e.g., 0.95)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="With --min-precision: sample in rounds until the precision interval clears or fails it")
     args = parser.parse_args()
 
     if args.use_llm and 'llm_judge' not in args.methods:
@@ -348,14 +964,18 @@ def main():
         args.output = out_dir / f"{in_path.stem}_quality_report.json"
 
     print(f"📂 Loading facts from: {args.input}")
-    data = json.loads(Path(args.input).read_text(encoding="utf-8"))
-    facts = data["validated_facts"] if isinstance(data, dict) and "validated_facts" in data else (data if isinstance(data, list) else [])
+    try:
+        facts = load_facts(args.input)
+    except ValueError:
+        facts = []
     if not facts:
-        print("❌ Invalid input format: expected list or {validated_facts: [...]}")
+        print("❌ Invalid input format: expected JSONL, a list or {validated_facts: [...]}")
         sys.exit(1)
 
     from scripts.auto_validate_quality import assess_dataset_quality  # reuse functions in same file
-    report = assess_dataset_quality(facts, args.methods, args.sample_size)
+    report = assess_dataset_quality(facts, args.methods, args.sample_size, args.judge_agreement,
+                                    use_judge_cache=False if args.no_judge_cache else None, cascade=args.cascade,
+                                    precision_threshold=args.min_precision if args.adaptive else None)
 
     out_path = Path(args.output)
     out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
@@ -363,14 +983,21 @@ def main():
     print("\n" + "="*60)
     print("📊 AUTOMATED QUALITY ASSESSMENT REPORT")
     print("="*60)
-    print(f"Total facts assessed: {report['total_facts']}")
+    print(f"Total facts assessed: {report.get('assessed_facts', report['total_facts'])}/{report['total_facts']}")
     print(f"Average quality score: {report['average_quality_score']:.1f}/100")
     print(f"Estimated precision: {report['estimated_precision']:.1%}")
+    interval = report.get('precision_interval')
+    if interval:
+        print(f"{interval['confidence']:.0%} interval ({interval['method']}): [{interval['low']:.1%}, {interval['high']:.1%}]")
     print("="*60)
     print(f"💾 Saved: {out_path}")
-    if args.min_precision is not None and report["estimated_precision"] < args.min_precision:
-        print(f"❌ Estimated precision below threshold ({report['estimated_precision']:.1%} < {args.min_precision:.1%})")
-        sys.exit(1)
+    if args.min_precision is not None:
+        decision = report.get('sampling', {}).get('decision')
+        if decision == "fail" or (decision != "pass" and report["estimated_precision"] < args.min_precision):
+            print(f"❌ Estimated precision below threshold ({report['estimated_precision']:.1%} < {args.min_precision:.1%})")
+            sys.exit(1)
+        if decision == "undecided":
+            print(f"⚠️  Interval still straddles {args.min_precision:.1%}; gated on the point estimate")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark quality-assessment throughput: heuristic, embedding-similarity NLI and the
+int8 ONNX entailment cross-encoder, in facts/s and facts/s per core. Synthetic facts
+are sampled from the extracted papers (spans suffixed so every fact is distinct and
+no deduplication or embedding store flatters the numbers). The entailment scorer is
+timed at each --threads setting.
+--negation also scores each claim against its negation ("X does not treat Y") on
+the same spans and reports how far each method separates the two.
+Usage: python -m scripts.bench_quality [--sizes 1000 10000] [--threads 1 4] [--negation]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from scripts.auto_validate_quality import (
+    fact_claim,
+    heuristic_quality_check,
+    load_entailment_scorer,
+    load_sentence_model,
+    nli_quality_batch,
+)
+from src.core.entailment import EntailmentScorer
+
+DEFAULT_SIZES = [1_000, 10_000]
+DEFAULT_METHODS = ["heuristic", "nli", "entailment"]
+EXTRACTED_DIR = Path("data/processed/extracted")
+
+
+def load_seed_facts() -> List[Dict[str, Any]]:
+    facts = []
+    for path in sorted(EXTRACTED_DIR.glob("*_extracted.json")):
+        facts += json.loads(path.read_text(encoding="utf-8")).get("extracted_facts", [])
+    facts = [f for f in facts if f.get("span")]
+    if not facts:
+        facts = [{"drug_name": "sertraline", "condition_name": "major depressive disorder", "relation": "TREATS",
+                  "span": "Sertraline improved remission rates in major depressive disorder.", "confidence": 0.9}]
+    return facts
+
+
+def synthetic_facts(seed: List[Dict[str, Any]], n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [{**base, "span": f"{base['span']} (cohort {i})"} for i, base in enumerate(rng.choices(seed, k=n))]
+
+
+def negated_claim(fact: Dict[str, Any]) -> str:
+    relation = str(fact.get("relation", "")).replace("_", " ").lower()
+    return f"{fact.get('drug_name', '')} does not {relation.removesuffix('s')} {fact.get('condition_name', '')}"
+
+
+def report(label: str, n: int, elapsed: float, cores: int = 1) -> None:
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"   {label:<24}{elapsed:8.2f}s  {rate:10,.0f} facts/s  {rate / cores:10,.0f} facts/s/core")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quality-assessment throughput")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Fact counts to benchmark")
+    parser.add_argument("--methods", nargs="+", choices=DEFAULT_METHODS, default=DEFAULT_METHODS)
+    parser.add_argument("--threads", nargs="+", type=int, default=sorted({1, os.cpu_count() or 1}),
+                        help="onnxruntime intra-op thread counts for the entailment scorer")
+    parser.add_argument("--negation", action="store_true", help="Also measure claim vs negated-claim separation")
+    parser.add_argument("--seed", type=int, default=13, help="Random seed for synthetic facts")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    seed_facts = load_seed_facts()
+    print(f"🧪 {len(seed_facts)} seed facts, {os.cpu_count()} cores")
+
+    methods = list(args.methods)
+    if "nli" in methods and load_sentence_model() is None:
+        print("⚠️  sentence-transformers not installed; skipping nli")
+        methods.remove("nli")
+    scorer = load_entailment_scorer() if "entailment" in methods else None
+    if "entailment" in methods and scorer is None:
+        print("⚠️  onnxruntime/tokenizers not installed; skipping entailment")
+        methods.remove("entailment")
+    scorers = {t: EntailmentScorer(scorer.model_dir, threads=t, batch_tokens=scorer.batch_tokens)
+               for t in args.threads} if scorer is not None else {}
+
+    for n in args.sizes:
+        facts = synthetic_facts(seed_facts, n, rng)
+        spans = [f["span"] for f in facts]
+        claims = [fact_claim(f) for f in facts]
+        print(f"\n📊 {n:,} facts:")
+
+        if "heuristic" in methods:
+            start = time.perf_counter()
+            for fact in facts:
+                heuristic_quality_check(fact)
+            report("heuristic", n, time.perf_counter() - start)
+
+        if "nli" in methods:
+            start = time.perf_counter()
+            nli_quality_batch(facts, use_store=False)
+            report("nli (similarity)", n, time.perf_counter() - start, os.cpu_count() or 1)
+
+        for threads, threaded in scorers.items():
+            start = time.perf_counter()
+            threaded.entailment_vs_contradiction(spans, claims)
+            report(f"entailment int8 ×{threads}", n, time.perf_counter() - start, threads)
+
+        if args.negation:
+            negated = [negated_claim(f) for f in facts]
+            print("   Claim vs negated claim (mean score, higher = more supported):")
+            if "nli" in methods:
+                plain = [r["similarity"] for r in nli_quality_batch(facts, use_store=False)]
+                flipped = [r["similarity"] for r in nli_quality_batch(
+                    [{"span": f["span"], "drug_name": c, "relation": "", "condition_name": ""}
+                     for f, c in zip(facts, negated)], use_store=False)]
+                print(f"      nli:        {sum(plain) / n:.3f} vs {sum(flipped) / n:.3f}")
+            if scorer is not None:
+                plain_p, _ = scorer.entailment_vs_contradiction(spans, claims)
+                flipped_p, _ = scorer.entailment_vs_contradiction(spans, negated)
+                print(f"      entailment: {plain_p.mean():.3f} vs {flipped_p.mean():.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark FactValidator lexicon checks: per-term substring scans vs compiled automata.
+Synthetic facts are sampled from the extracted papers (names perturbed so most are
+distinct), both implementations run on every fact and their results must agree.
+--full-validator also times validate_extracted_facts end to end with the per-fact
+(rules) and columnar (batch) engines and checks they report identical issues.
+Usage: python -m scripts.bench_validation [--sizes 10000 100000 1000000] [--full-validator]
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.core import validate
+from src.core import validate_batch  # noqa: F401  (imports pandas up front, outside the timings)
+from src.core.validate import (
+    CONDITION_EXCLUSION_WORDS,
+    DRUG_NAME_PATTERNS,
+    OUTCOME_INDICATORS,
+    VALIDATION_ENGINES,
+    VALID_CONDITIONS,
+    validate_extracted_facts,
+)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+EXTRACTED_DIR = Path("data/processed/extracted")
+NOISE = ["", "", " treatment", " in adults", "-resistant", " (severe)", " phase", " xr"]
+
+
+def load_seed_facts() -> List[Dict[str, Any]]:
+    facts = []
+    for path in sorted(EXTRACTED_DIR.glob("*_extracted.json")):
+        facts += json.loads(path.read_text(encoding="utf-8")).get("extracted_facts", [])
+    if not facts:
+        facts = [{"drug_name": "sertraline", "condition_name": "major depressive disorder"}]
+    return facts
+
+
+def synthetic_facts(seed: List[Dict[str, Any]], n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    out = []
+    for i in range(n):
+        base = rng.choice(seed)
+        out.append({
+            **base,
+            "drug_name": f"{base.get('drug_name', '')}{rng.choice(NOISE)}{'' if i % 3 else f' {i}'}",
+            "condition_name": f"{base.get('condition_name', '')}{rng.choice(NOISE)}{'' if i % 4 else f' {i}'}",
+        })
+    return out
+
+
+# -----------------------------
+# Reference (per-term scans, as FactValidator did before)
+# -----------------------------
+def scan_checks(drug: str, condition: str) -> Tuple[bool, bool, Optional[str], Optional[str]]:
+    known = any(pattern in drug for pattern in DRUG_NAME_PATTERNS)
+    outcome = any(indicator in condition for indicator in OUTCOME_INDICATORS)
+    exclusion = next((w for w in CONDITION_EXCLUSION_WORDS if w in condition), None)
+    partial = [c for c in validate.VOCAB.conditions if c in condition or condition in c]
+    return known, outcome, exclusion, partial[0] if partial else None
+
+
+def compiled_checks(drug: str, condition: str) -> Tuple[bool, bool, Optional[str], Optional[str]]:
+    # __wrapped__ bypasses the per-name memo so this times the automata alone
+    return (
+        validate.is_known_drug.__wrapped__(drug),
+        validate._OUTCOME_MATCHER.contains_any(condition),
+        validate.condition_exclusion_word.__wrapped__(condition),
+        validate.condition_partial_match.__wrapped__(condition),
+    )
+
+
+def memo_checks(drug: str, condition: str) -> Tuple[bool, bool, Optional[str], Optional[str]]:
+    return (
+        validate.is_known_drug(drug),
+        validate._OUTCOME_MATCHER.contains_any(condition),
+        validate.condition_exclusion_word(condition),
+        validate.condition_partial_match(condition),
+    )
+
+
+def issues_digest(report) -> str:
+    digest = hashlib.sha256()
+    for issue in report.issues:
+        digest.update(repr(tuple(issue.model_dump().values())).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def run(check, pairs: List[Tuple[str, str]]) -> Tuple[float, list]:
+    start = time.perf_counter()
+    results = [check(d, c) for d, c in pairs]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark validation lexicon matching")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Fact counts to benchmark")
+    parser.add_argument("--seed", type=int, default=13, help="Random seed for synthetic facts")
+    parser.add_argument("--full-validator", action="store_true", help="Also time validate_extracted_facts end to end")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    seed_facts = load_seed_facts()
+    print(f"🧪 {len(seed_facts)} seed facts, lexicons: {len(DRUG_NAME_PATTERNS)} drugs, "
+          f"{len(VALID_CONDITIONS)} conditions, {len(CONDITION_EXCLUSION_WORDS)} exclusion words")
+
+    for n in args.sizes:
+        facts = synthetic_facts(seed_facts, n, rng)
+        pairs = [(str(f["drug_name"]).lower().strip(), str(f["condition_name"]).lower().strip()) for f in facts]
+        validate.is_known_drug.cache_clear()
+        validate.condition_exclusion_word.cache_clear()
+        validate.condition_partial_match.cache_clear()
+
+        scan_s, expected = run(scan_checks, pairs)
+        compiled_s, compiled = run(compiled_checks, pairs)
+        memo_s, memo = run(memo_checks, pairs)
+        if compiled != expected or memo != expected:
+            mismatches = sum(1 for a, b in zip(expected, compiled) if a != b)
+            print(f"❌ {n:,} facts: compiled matcher disagrees with scans on {mismatches} facts")
+            sys.exit(1)
+
+        print(f"\n📊 {n:,} facts ({len(set(pairs)):,} distinct name pairs):")
+        print(f"   Per-term scans:     {scan_s:7.2f}s ({n / scan_s:,.0f} facts/s)")
+        print(f"   Automata:           {compiled_s:7.2f}s ({n / compiled_s:,.0f} facts/s, {scan_s / compiled_s:.1f}x)")
+        print(f"   Automata + memo:    {memo_s:7.2f}s ({n / memo_s:,.0f} facts/s, {scan_s / memo_s:.1f}x)")
+        print(f"   ✅ Identical results")
+
+        if args.full_validator:
+            del expected, compiled, memo
+            digests, timings = {}, {}
+            for engine in VALIDATION_ENGINES:
+                start = time.perf_counter()
+                _, report = validate_extracted_facts({"extracted_facts": facts}, engine=engine)
+                timings[engine] = time.perf_counter() - start
+                # Hash instead of keeping both reports: 1M facts carry ~2M issues
+                digests[engine] = (len(report.issues), issues_digest(report))
+                del report
+            rules_s = timings["rules"]
+            for engine, elapsed in timings.items():
+                print(f"   Validator ({engine}):{' ' * (7 - len(engine))}{elapsed:7.2f}s "
+                      f"({n / elapsed:,.0f} facts/s, {rules_s / elapsed:.1f}x, {digests[engine][0]:,} issues)")
+            if digests["batch"] != digests["rules"]:
+                print(f"❌ Batch engine issues differ from FactValidator")
+                sys.exit(1)
+            print(f"   ✅ Identical issues")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Compare the cheap→strong extraction cascade against running every section on the strong model.
+Responses go through the SQLite response cache, so reruns replay them and the comparison is repeatable.
+Usage: python -m scripts.compare_cascade [--papers Lancet Psychiatry WJCC] [--output data/eval/cascade_comparison.json]
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+if not os.getenv("OPENAI_API_KEY"):
+    print("❌ Please set OPENAI_API_KEY environment variable (.env supported)")
+    sys.exit(1)
+
+from src.core.app_config import get_setting
+from src.core.cache_store import CacheStore
+from src.core.dedupe import fact_key
+from src.core.extract_llm import (
+    CascadePolicy,
+    ExtractionResult,
+    extract_from_section,
+    extract_with_cascade,
+    load_parsed_document,
+)
+
+DEFAULT_PAPERS = ["Lancet", "Psychiatry", "WJCC"]
+
+
+def run_cost(results: List[ExtractionResult]) -> Dict[str, Any]:
+    """Cost/latency as if every call were live (replayed calls use their original numbers)."""
+    cost, latency, calls = 0.0, 0.0, 0
+    for result in results:
+        for rec in result.llm_calls:
+            calls += 1
+            if rec.get("cache_hit"):
+                cost += rec.get("original_cost_usd") or 0.0
+                latency += rec.get("original_latency_ms") or 0.0
+            else:
+                cost += rec.get("cost_usd") or 0.0
+                latency += rec.get("latency_ms") or 0.0
+    facts = sum(len(r.triples) for r in results)
+    return {"calls": calls, "facts": facts, "cost_usd": round(cost, 4), "latency_s": round(latency / 1000.0, 1)}
+
+
+def agreement(baseline: List[ExtractionResult], cascade: List[ExtractionResult]) -> Dict[str, Any]:
+    """Overlap of (drug, relation, condition) keys: cascade facts vs all-strong facts."""
+    base = {fact_key(t.model_dump()) for r in baseline for t in r.triples}
+    casc = {fact_key(t.model_dump()) for r in cascade for t in r.triples}
+    both = base & casc
+    precision = len(both) / len(casc) if casc else None
+    recall = len(both) / len(base) if base else None
+    f1 = 2 * precision * recall / (precision + recall) if precision and recall else None
+    return {
+        "baseline_keys": len(base),
+        "cascade_keys": len(casc),
+        "shared_keys": len(both),
+        "precision": round(precision, 3) if precision is not None else None,
+        "recall": round(recall, 3) if recall is not None else None,
+        "f1": round(f1, 3) if f1 is not None else None,
+    }
+
+
+def compare_paper(parsed_path: Path, policy: CascadePolicy, store: CacheStore) -> Dict[str, Any]:
+    doc = load_parsed_document(parsed_path)
+    source_id = doc["metadata"]["source_id"]
+    print(f"\n📄 {source_id}: {len(doc['sections'])} sections")
+
+    baseline = [extract_from_section(s, source_id, model=policy.strong_model, response_cache=store)
+                for s in doc["sections"]]
+    cascade = [extract_with_cascade(s, source_id, policy, response_cache=store) for s in doc["sections"]]
+
+    return {
+        "source_id": source_id,
+        "all_strong": run_cost(baseline),
+        "cascade": {
+            **run_cost(cascade),
+            "tiers": dict(Counter(r.tier for r in cascade if r.tier)),
+            "escalations": dict(Counter(r.escalation_reason for r in cascade if r.escalation_reason)),
+        },
+        "agreement": agreement(baseline, cascade),
+    }
+
+
+def main():
+    cascade_cfg = get_setting("extraction.cascade", {})
+    cache_cfg = get_setting("extraction.response_cache", {})
+
+    parser = argparse.ArgumentParser(description="Compare the extraction cascade with all-strong extraction")
+    parser.add_argument("--papers", nargs="+", default=DEFAULT_PAPERS, help="Paper ids under data/interim/<id>_parsed.json")
+    parser.add_argument("--cheap-model", default=cascade_cfg.get("cheap_model"), help="Cheap tier model")
+    parser.add_argument("--strong-model", default=cascade_cfg.get("strong_model"), help="Strong tier / baseline model")
+    parser.add_argument("--cache", default=cache_cfg.get("path"), help="SQLite response cache")
+    parser.add_argument("--output", default="data/eval/cascade_comparison.json", help="Where to write the report")
+    args = parser.parse_args()
+
+    policy = CascadePolicy.from_config({**cascade_cfg, "enabled": True,
+                                        "cheap_model": args.cheap_model, "strong_model": args.strong_model})
+    store = CacheStore(args.cache, namespace="chat")
+    print(f"🪜 Cascade {policy.cheap_model} → {policy.strong_model} vs all-{policy.strong_model}")
+    print(f"🗄  Response cache: {args.cache} ({len(store)} entries)")
+
+    papers = []
+    for paper_id in args.papers:
+        parsed_path = Path("data/interim") / f"{paper_id}_parsed.json"
+        if not parsed_path.exists():
+            print(f"⚠️  Skipping {paper_id}: {parsed_path} not found")
+            continue
+        papers.append(compare_paper(parsed_path, policy, store))
+
+    totals = {}
+    for arm in ("all_strong", "cascade"):
+        totals[arm] = {k: round(sum(p[arm][k] for p in papers), 4) for k in ("calls", "facts", "cost_usd", "latency_s")}
+    shared = sum(p["agreement"]["shared_keys"] for p in papers)
+    base = sum(p["agreement"]["baseline_keys"] for p in papers)
+    casc = sum(p["agreement"]["cascade_keys"] for p in papers)
+    totals["agreement"] = {
+        "precision": round(shared / casc, 3) if casc else None,
+        "recall": round(shared / base, 3) if base else None,
+    }
+
+    report = {"policy": policy.__dict__, "papers": papers, "totals": totals,
+              "response_cache": {"hits": store.hits, "misses": store.misses}}
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print("\n📊 Cascade vs all-strong:")
+    for p in papers:
+        a, c, g = p["all_strong"], p["cascade"], p["agreement"]
+        print(f"   {p['source_id']}: ${a['cost_usd']:.4f} → ${c['cost_usd']:.4f}, "
+              f"{a['latency_s']}s → {c['latency_s']}s, tiers={c['tiers']}, "
+              f"precision={g['precision']} recall={g['recall']}")
+    a, c = totals["all_strong"], totals["cascade"]
+    saved = (1 - c["cost_usd"] / a["cost_usd"]) if a["cost_usd"] else 0.0
+    print(f"   Total: ${a['cost_usd']:.4f} → ${c['cost_usd']:.4f} ({saved:.0%} saved), "
+          f"agreement precision={totals['agreement']['precision']} recall={totals['agreement']['recall']}")
+    print(f"   Cache: {store.hits} hits / {store.misses} misses")
+    print(f"💾 Report: {output}")
+
+
+if __name__ == "__main__":
+    main()
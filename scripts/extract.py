@@ -13,13 +13,24 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from src.core.extract_llm import extract_pipeline
+from src.core.extract_llm import extract_pipeline, load_parsed_document, print_prompt_budget
+from src.core.sentence_select import SentenceSelector
 
 def main():
     parser = argparse.ArgumentParser(description="Extract clinical facts from parsed documents")
     parser.add_argument("--input", required=True, help="Path to parsed JSON file from Docling")
     parser.add_argument("--output", help="Path for extracted facts JSON output (default: data/processed/extracted/{stem}_extracted.json)")
-    parser.add_argument("--model", default="gpt-4o", help="OpenAI model to use (display only; pipeline uses configured default)")
+    parser.add_argument("--model", default="gpt-4o", help="OpenAI model to use")
+    parser.add_argument("--full", action="store_true", help="Ignore the section manifest and re-extract every section")
+    parser.add_argument("--no-dedupe", action="store_true", help="Keep duplicate facts extracted from different sections")
+    parser.add_argument("--cascade", action=argparse.BooleanOptionalAction, default=None,
+                        help="Use the cheap→strong model cascade (default: extraction.cascade.enabled in configs/app.yaml)")
+    parser.add_argument("--select-sentences", action=argparse.BooleanOptionalAction, default=None,
+                        help="Send only high-scoring sentences (default: extraction.sentence_selection.enabled)")
+    parser.add_argument("--response-cache", action=argparse.BooleanOptionalAction, default=None,
+                        help="Replay/store raw LLM responses (default: extraction.response_cache.enabled)")
+    parser.add_argument("--budget", action="store_true",
+                        help="Print static vs per-section prompt tokens and exit (no LLM calls)")
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -28,6 +39,10 @@ def main():
         print("💡 First run: python -m scripts.parse_doc --source <pdf_or_url>")
         sys.exit(1)
 
+    if args.budget:
+        print_prompt_budget(load_parsed_document(input_path), SentenceSelector.from_config(args.select_sentences))
+        return
+
     if not args.output:
         out_dir = Path("data/processed/extracted")
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -43,7 +58,9 @@ def main():
     print("-" * 50)
 
     try:
-        triples = extract_pipeline(input_path, args.output)
+        triples = extract_pipeline(input_path, args.output, model=args.model, incremental=not args.full, dedupe=not args.no_dedupe,
+                                   cascade=args.cascade, response_cache=args.response_cache,
+                                   sentence_selection=args.select_sentences)
         print("-" * 50)
         print(f"✅ Extraction complete! {len(triples)} facts")
         print(f"💾 Saved: {args.output}")
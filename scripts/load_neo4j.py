@@ -4,7 +4,16 @@ import argparse
 import os
 import sys
 import hashlib
+from pathlib import Path
 from dotenv import load_dotenv
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.core.vocabulary import get_vocabulary
+
 # Load environment variables
 load_dotenv()
 
@@ -14,31 +23,10 @@ NEO4J_USER = os.getenv('NEO4J_USER', 'neo4j')
 NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', 'password')
 
 
-# Define all valid relationship types
-VALID_RELATIONS = {
-    "TREATS", "IMPROVES", "ASSOCIATED_WITH_SE", "AUGMENTS",
-    "CONTRAINDICATED_FOR", "SUPERIOR_TO", "EQUIVALENT_TO", "INFERIOR_TO",
-    # NEW
-    "PREVENTS_RELAPSE_IN", "FIRST_LINE_FOR", "MAINTENANCE_FOR",
-    "WELL_TOLERATED_IN", "EFFECTIVE_IN_SUBGROUP",
-}
-
-RELATION_LABELS = {
-    "TREATS": "treats",
-    "IMPROVES": "improves",
-    "ASSOCIATED_WITH_SE": "associated_with_side_effect",
-    "AUGMENTS": "augments",
-    "CONTRAINDICATED_FOR": "contraindicated_for",
-    "SUPERIOR_TO": "superior_to",
-    "EQUIVALENT_TO": "equivalent_to",
-    "INFERIOR_TO": "inferior_to",
-    # NEW
-    "PREVENTS_RELAPSE_IN": "prevents_relapse_in",
-    "FIRST_LINE_FOR": "first_line_for",
-    "MAINTENANCE_FOR": "maintenance_for",
-    "WELL_TOLERATED_IN": "well_tolerated_in",
-    "EFFECTIVE_IN_SUBGROUP": "effective_in_subgroup",
-}
+# Relationship types and their Neo4j labels come from configs/relations.yaml
+VOCAB = get_vocabulary()
+VALID_RELATIONS = VOCAB.relation_set
+RELATION_LABELS = VOCAB.relation_labels
 
 # Neo4j connection configuration
 NEO4J_URI = "bolt://localhost:7687"
@@ -84,7 +72,7 @@ def load_normalized_data(loader, normalized_file):
 
         nodes_created = set()
         relationships_created = 0
-        relationship_counts = {rel: 0 for rel in VALID_RELATIONS}
+        relationship_counts = {rel: 0 for rel in VOCAB.relations}
 
         for i, fact in enumerate(facts):
             if i % 10 == 0:
@@ -182,6 +170,10 @@ def _process_fact_complete(tx, fact, raw_fact, existing_nodes, rel_counts):
             "effect_size": raw_fact.get('effect_size'),
             "confidence_interval": raw_fact.get('confidence_interval'),
             "outcome": raw_fact.get('outcome'),
+            # Dedupe stage: how many distinct spans back this edge, and where the others are
+            "evidence_count": int(raw_fact.get('evidence_count') or 1),
+            "additional_evidence": [e.get('span', '') for e in raw_fact.get('additional_evidence') or []],
+            "additional_sections": [e.get('section', '') for e in raw_fact.get('additional_evidence') or []],
         }
 
         tx.run(f"""
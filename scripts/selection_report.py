@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Report prompt tokens sent vs facts recovered with and without sentence selection.
+Offline by default: a fact counts as recoverable when its span is found (exact or fuzzy)
+in the text the LLM would see. --live re-extracts the selected sections and compares
+fact keys with the existing extracted files.
+Usage: python -m scripts.selection_report [--papers Lancet Psychiatry WJCC] [--min-score 3] [--context 1] [--live]
+"""
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.core.dedupe import fact_key
+from src.core.sentence_select import SelectionConfig, SentenceSelector
+from src.core.span_index import SpanIndex
+from src.core.token_count import estimate_tokens
+
+DEFAULT_PAPERS = ["Lancet", "Psychiatry", "WJCC"]
+# Mirrors extract_llm (kept here so the offline report needs no API key)
+MAX_SECTION_CHARS = 4000
+SKIP_SECTIONS = {"references", "funding", "author information", "conflict", "acknowledgment"}
+
+
+def _sent_sections(sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [s for s in sections
+            if s["name"].lower() not in SKIP_SECTIONS and len(s["text"].strip()) >= 50]
+
+
+def _prompt_overhead() -> int:
+    """Tokens of the fixed system prompt + static instructions + section header per call."""
+    try:
+        from src.core.extract_llm import extraction_prompt_budget
+    except Exception:  # extract_llm refuses to import without OPENAI_API_KEY
+        return 0
+    budget = extraction_prompt_budget({"name": "", "text": "", "sentences": []}, "")
+    return budget["total_tokens"]
+
+
+def arm_stats(sections: List[Dict[str, Any]], facts: List[Dict[str, Any]], overhead: int) -> Dict[str, Any]:
+    sent = _sent_sections(sections)
+    texts = [s["text"][:MAX_SECTION_CHARS] for s in sent]
+    index = SpanIndex("\n\n".join(texts))
+    recovered = [f for f in facts if index.resolve(f.get("span", "")).match_type != "unmatched"]
+    text_tokens = sum(estimate_tokens(t) for t in texts)
+    return {
+        "calls": len(sent),
+        "text_tokens": text_tokens,
+        "prompt_tokens": text_tokens + overhead * len(sent),
+        "facts_recoverable": len(recovered),
+        "_recovered": recovered,
+    }
+
+
+def live_fact_keys(sections: List[Dict[str, Any]], source_id: str) -> List[tuple]:
+    from src.core.extract_llm import extract_from_section, resolve_extraction_options
+
+    _, store = resolve_extraction_options(cascade=False, response_cache=True)
+    keys = []
+    for section in sections:
+        result = extract_from_section(section, source_id, response_cache=store)
+        keys += [fact_key(t.model_dump()) for t in result.triples]
+    return keys
+
+
+def main():
+    config = SelectionConfig.from_config()
+    parser = argparse.ArgumentParser(description="Tokens sent vs facts recovered with sentence selection")
+    parser.add_argument("--papers", nargs="+", default=DEFAULT_PAPERS, help="Paper ids under data/interim/<id>_parsed.json")
+    parser.add_argument("--min-score", type=float, default=config.min_score, help="Sentence score threshold")
+    parser.add_argument("--context", type=int, default=config.context, help="Neighbour sentences kept on each side")
+    parser.add_argument("--embeddings", action="store_true", default=config.embeddings, help="Add local embedding similarity")
+    parser.add_argument("--live", action="store_true", help="Re-extract selected sections (needs OPENAI_API_KEY, uses the response cache)")
+    parser.add_argument("--output", default="data/eval/selection_report.json", help="Where to write the report")
+    args = parser.parse_args()
+
+    config = SelectionConfig(**{**asdict(config), "enabled": True, "min_score": args.min_score,
+                                "context": args.context, "embeddings": args.embeddings})
+    selector = SentenceSelector(config)
+    overhead = _prompt_overhead()
+
+    papers = []
+    for paper_id in args.papers:
+        parsed_path = Path("data/interim") / f"{paper_id}_parsed.json"
+        extracted_path = Path("data/processed/extracted") / f"{paper_id}_extracted.json"
+        if not parsed_path.exists() or not extracted_path.exists():
+            print(f"⚠️  Skipping {paper_id}: need {parsed_path} and {extracted_path}")
+            continue
+        doc = json.loads(parsed_path.read_text(encoding="utf-8"))
+        facts = json.loads(extracted_path.read_text(encoding="utf-8")).get("extracted_facts", [])
+        selected = [selector.apply(s) for s in doc["sections"]]
+
+        full = arm_stats(doc["sections"], facts, overhead)
+        sel = arm_stats(selected, facts, overhead)
+        # Recall only over facts whose span the full-section prompt actually contained
+        baseline_ids = {id(f) for f in full.pop("_recovered")}
+        kept = sum(1 for f in sel.pop("_recovered") if id(f) in baseline_ids)
+        entry = {
+            "source_id": paper_id,
+            "full_sections": full,
+            "selected": sel,
+            "token_reduction": round(1 - sel["prompt_tokens"] / full["prompt_tokens"], 3) if full["prompt_tokens"] else None,
+            "recall_proxy": round(kept / len(baseline_ids), 3) if baseline_ids else None,
+        }
+        if args.live:
+            baseline_keys = {fact_key(f) for f in facts}
+            live_keys = set(live_fact_keys(_sent_sections(selected), doc["metadata"]["source_id"]))
+            entry["live"] = {
+                "facts_extracted": len(live_keys),
+                "baseline_keys": len(baseline_keys),
+                "shared_keys": len(baseline_keys & live_keys),
+                "recall": round(len(baseline_keys & live_keys) / len(baseline_keys), 3) if baseline_keys else None,
+            }
+        papers.append(entry)
+
+    totals = {
+        arm: {k: sum(p[arm][k] for p in papers) for k in ("calls", "text_tokens", "prompt_tokens", "facts_recoverable")}
+        for arm in ("full_sections", "selected")
+    }
+    report = {"config": asdict(config), "prompt_overhead_tokens": overhead, "papers": papers, "totals": totals}
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"📉 Sentence selection (min_score={config.min_score}, context={config.context}):")
+    for p in papers:
+        f, s = p["full_sections"], p["selected"]
+        line = (f"   {p['source_id']}: {f['prompt_tokens']:,} → {s['prompt_tokens']:,} prompt tokens "
+                f"({p['token_reduction']:.0%} less, {f['calls']} → {s['calls']} calls), "
+                f"facts recoverable {s['facts_recoverable']}/{f['facts_recoverable']}")
+        if "live" in p:
+            line += f", live recall {p['live']['recall']}"
+        print(line)
+    f, s = totals["full_sections"], totals["selected"]
+    if f["prompt_tokens"]:
+        print(f"   Total: {f['prompt_tokens']:,} → {s['prompt_tokens']:,} tokens "
+              f"({1 - s['prompt_tokens'] / f['prompt_tokens']:.0%} less)")
+    if overhead == 0:
+        print("ℹ️  Set OPENAI_API_KEY to include the fixed prompt template in token counts")
+    print(f"💾 Report: {output}")
+
+
+if __name__ == "__main__":
+    main()
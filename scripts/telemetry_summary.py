@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Summarize the LLM call ledger: p50/p95 latency, tokens per fact and cost per paper.
+Usage: python -m scripts.telemetry_summary [--paper Lancet] [--run-id <id>] [--stage extract]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path for imports
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.core.telemetry import LEDGER_PATH, load_ledger, print_summary, summarize_ledger
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize LLM cost and latency telemetry")
+    parser.add_argument("--ledger", type=Path, default=LEDGER_PATH, help=f"Ledger JSONL (default: {LEDGER_PATH})")
+    parser.add_argument("--paper", nargs="+", help="Only include these source_ids")
+    parser.add_argument("--run-id", help="Only include calls from one pipeline run")
+    parser.add_argument("--stage", choices=["extract", "judge"], help="Only include one stage")
+    parser.add_argument("--json", action="store_true", help="Print the rollup as JSON")
+    args = parser.parse_args()
+
+    if not args.ledger.exists():
+        print(f"❌ Ledger not found: {args.ledger}")
+        print("💡 Run extraction or the LLM judge first; calls are recorded automatically.")
+        sys.exit(1)
+
+    records = load_ledger(args.ledger, run_id=args.run_id, source_ids=args.paper, stage=args.stage)
+    if not records:
+        print("ℹ️  No ledger records match these filters")
+        sys.exit(0)
+
+    summary = summarize_ledger(records)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"📒 Ledger: {args.ledger} ({len(records)} records)")
+        print_summary(summary)
+
+if __name__ == "__main__":
+    main()
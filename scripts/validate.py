@@ -11,30 +11,113 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from src.core.validate import validate_extracted_facts, save_validation_results
+from src.core.validate import (
+    DEFAULT_RULE_TIER,
+    RULE_TIERS,
+    VALIDATION_ENGINES,
+    VALIDATION_RULES,
+    print_rule_stats,
+    save_validation_results,
+    validate_extracted_facts,
+    validate_stream,
+)
+from src.core.validate_corpus import SHARD_FACTS, resolve_inputs, validate_corpus
+
+def run_corpus(args) -> None:
+    try:
+        inputs = resolve_inputs(args.corpus)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not inputs:
+        print(f"❌ No extracted files found for: {args.corpus}")
+        print("💡 Pass a directory of *_extracted.json files or a glob such as 'data/processed/extracted/*.json'")
+        sys.exit(1)
+    if args.engine != "rules" or args.output or args.issues:
+        print("ℹ️ Corpus mode streams each file with the rules engine into --output-dir; "
+              "--engine/--output/--issues are ignored")
+
+    try:
+        summary = validate_corpus(inputs, args.output_dir, workers=args.workers, shard_facts=args.shard_size,
+                                  rule_tier=args.rule_tier, extra_rules=args.rule, instrument=args.instrument,
+                                  parsed=args.parsed)
+    except KeyboardInterrupt:
+        print("\n⏹ Validation cancelled by user")
+        sys.exit(1)
+
+    totals = summary["validation_summary"]
+    print("-" * 60)
+    print("✅ Corpus validation complete!")
+    if totals["original_count"]:
+        pct = totals["valid_count"] / totals["original_count"] * 100
+        print(f"📊 Clean dataset: {totals['valid_count']}/{totals['original_count']} ({pct:.1f}%) "
+              f"across {len(summary['files'])} files")
+    print(f"⏱ {summary['elapsed_seconds']:.1f}s, {summary['facts_per_second'] or 0:,.0f} facts/s "
+          f"({summary['workers']} workers, {summary['shards']} tasks)")
+    if args.show_details and summary["issue_counts"]:
+        print(f"\n🔍 Issues by type:")
+        for issue_type, count in sorted(summary["issue_counts"].items(), key=lambda kv: -kv[1]):
+            print(f"   {issue_type.replace('_', ' ').title()}: {count}")
+    if summary.get("rule_stats"):
+        print_rule_stats(summary["rule_stats"], summary["rule_tier"])
 
 def main():
     parser = argparse.ArgumentParser(description="Validate extracted clinical facts")
-    parser.add_argument("--input", required=True, help="Path to extracted facts JSON file")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="Path to extracted facts JSON file")
+    source.add_argument("--corpus", help="Directory of *_extracted.json[l] files, or a glob, validated across a process pool")
     parser.add_argument("--output", help="Path for validated facts output (default: data/processed/validated/{stem}_validated.json)")
     parser.add_argument("--issues", help="Path to save detailed validation issues report")
     parser.add_argument("--show-details", action="store_true", help="Show detailed validation issues")
+    parser.add_argument("--engine", choices=VALIDATION_ENGINES, default="rules",
+                        help="rules: FactValidator per fact; batch: columnar pandas engine (same issues, for large corpora)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read facts incrementally (JSON or JSONL) and write JSONL outputs with flat memory")
+    parser.add_argument("--workers", type=int, help="Corpus mode: worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=SHARD_FACTS,
+                        help=f"Corpus mode: facts per shard when splitting large files (default: {SHARD_FACTS})")
+    parser.add_argument("--output-dir", default="data/processed/validated",
+                        help="Corpus mode: directory for per-file outputs and the corpus summary")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-validate every fact instead of reusing cached verdicts (rules engine)")
+    parser.add_argument("--rule-tier", choices=RULE_TIERS, default=DEFAULT_RULE_TIER,
+                        help="Run rules up to this cost tier (core: default checks; extended: + strict span/comparison "
+                             "checks; expensive: + span-in-source check against the parsed paper)")
+    parser.add_argument("--rule", action="append", default=[], choices=list(VALIDATION_RULES), metavar="NAME",
+                        help="Also run one rule beyond --rule-tier (repeatable), e.g. --rule comparison_logic")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Record per-rule call count, time and rejection rate in the summary (rules engine, no cache)")
+    parser.add_argument("--parsed",
+                        help="Parsed paper (*_parsed.json) or a directory of {source_id}_parsed.json files for the "
+                             "span-in-source rule (default: data/interim)")
     args = parser.parse_args()
 
+    if args.corpus:
+        run_corpus(args)
+        return
+
     in_path = Path(args.input)
     if not in_path.exists():
         print(f"❌ Input file not found: {args.input}")
         print("💡 First run extract: python -m scripts.extract --input <parsed.json>")
         sys.exit(1)
 
+    if args.stream and args.engine != "rules":
+        print("❌ --stream validates one fact at a time; it cannot be combined with --engine batch")
+        sys.exit(1)
+    if args.engine == "batch" and (args.rule_tier != DEFAULT_RULE_TIER or args.rule or args.instrument):
+        print("❌ The batch engine implements the core rules only; use --engine rules with --rule-tier/--rule/--instrument")
+        sys.exit(1)
+
+    suffix = ".jsonl" if args.stream else ".json"
     if not args.output:
         out_dir = Path("data/processed/validated")
         out_dir.mkdir(parents=True, exist_ok=True)
-        args.output = out_dir / f"{in_path.stem}_validated.json"
+        args.output = out_dir / f"{in_path.stem}_validated{suffix}"
 
     if args.show_details and not args.issues:
         out_path = Path(args.output)
-        args.issues = out_path.parent / f"{out_path.stem}_issues.json"
+        args.issues = out_path.parent / f"{out_path.stem}_issues{suffix}"
 
     print(f"🔍 Validating: {in_path}")
     print(f"📝 Clean facts → {args.output}")
@@ -42,10 +125,35 @@ def main():
         print(f"📋 Issues → {args.issues}")
     print("-" * 60)
 
+    if args.stream:
+        try:
+            report = validate_stream(in_path, args.output, args.issues, args.rule_tier, args.rule, args.instrument,
+                                     args.parsed)
+        except KeyboardInterrupt:
+            print("\n⏹ Validation cancelled by user")
+            sys.exit(1)
+        report.print_summary()
+        if args.show_details and report.issue_counts:
+            print(f"\n🔍 Issues by type:")
+            for issue_type, count in sorted(report.issue_counts.items(), key=lambda kv: -kv[1]):
+                print(f"   {issue_type.replace('_', ' ').title()}: {count}")
+        print("-" * 60)
+        print("✅ Validation complete!")
+        if report.total_facts:
+            pct = report.valid_facts / report.total_facts * 100
+            print(f"📊 Clean dataset: {report.valid_facts}/{report.total_facts} ({pct:.1f}%)")
+        print("\nNext:")
+        print(f"  python -m scripts.auto_validate_quality --input \"{args.output}\"")
+        print(f"  python -m scripts.normalize --input \"{args.output}\"")
+        return
+
     try:
         import json
         facts_data = json.loads(in_path.read_text(encoding="utf-8"))
-        valid_facts, report = validate_extracted_facts(facts_data)
+        valid_facts, report = validate_extracted_facts(facts_data, engine=args.engine,
+                                                       use_cache=False if args.no_cache else None,
+                                                       rule_tier=args.rule_tier, extra_rules=args.rule,
+                                                       instrument=args.instrument, parsed=args.parsed)
         report.print_summary()
 
         if args.show_details and report.issues:
@@ -16,7 +16,9 @@ sys.path.insert(0, str(project_root))
 from src.core.ingest_docling import parse_document
 from src.core.extract_llm import extract_pipeline
 from src.core.validate import validate_extracted_facts, save_validation_results
+from src.core.issue_log import IssueLog, read_issue_log
 from src.core.normalize_ontology import OntologyNormalizer
+from src.core.telemetry import load_ledger, summarize_ledger
 
 
 def check_neo4j_connection(uri: str, user: str, password: str) -> tuple[bool, str]:
@@ -98,6 +100,15 @@ def load_json_safe(path: Path) -> Optional[Dict]:
         st.error(f"Error loading {path}: {e}")
     return None
 
+def load_issue_log_safe(path: Path) -> Optional[IssueLog]:
+    """Safely load a validation issues file (compact, legacy or JSONL)."""
+    try:
+        if path.exists():
+            return read_issue_log(path)
+    except Exception as e:
+        st.error(f"Error loading {path}: {e}")
+    return None
+
 def run_script_subprocess(script_name: str, args: List[str]) -> tuple[int, str, str]:
     """Run a script using subprocess and capture output."""
     cmd = [sys.executable, f"scripts/{script_name}.py"] + args
@@ -313,12 +324,13 @@ with st.sidebar:
     
     default_methods = st.multiselect(
         "Default Assessment Methods",
-        options=["heuristic", "nli", "llm_judge", "knowledge_base"],
+        options=["heuristic", "nli", "entailment", "llm_judge", "knowledge_base"],
         default=st.session_state.default_quality_methods,
         help="""
         Select which methods to use by default:
         • **heuristic**: Fast rule-based checks (FREE)
         • **nli**: Semantic similarity (requires sentence-transformers)
+        • **entailment**: NLI cross-encoder, int8 ONNX on CPU (requires onnxruntime)
         • **llm_judge**: GPT-4o verification (COSTS API CALLS ~$0.001/fact)
         • **knowledge_base**: Cross-reference known facts
         
@@ -371,12 +383,12 @@ if not st.session_state.current_paper:
     
     with st.expander("Method Comparison"):
         comparison_data = {
-            "Method": ["Heuristic", "NLI", "LLM Judge", "Knowledge Base"],
-            "Speed": ["⚡ Fast", "🐢 Slow", "🐌 Very Slow", "⚡ Fast"],
-            "Cost": ["FREE", "FREE", "$$$ (~$0.001/fact)", "FREE"],
-            "Accuracy": ["Good (70-80%)", "Very Good (80-90%)", "Excellent (90-95%)", "Perfect (100% on known)"],
-            "Dependencies": ["None", "sentence-transformers", "OpenAI API", "Curated database"],
-            "Use Case": ["Default", "Semantic validation", "High-stakes verification", "Cross-reference check"]
+            "Method": ["Heuristic", "NLI", "Entailment", "LLM Judge", "Knowledge Base"],
+            "Speed": ["⚡ Fast", "⚡ Batched", "⚡ Batched", "🐢 Batched", "⚡ Fast"],
+            "Cost": ["FREE", "FREE", "FREE", "$$$ (~$0.001/fact)", "FREE"],
+            "Accuracy": ["Good (70-80%)", "Very Good (80-90%)", "Catches negations", "Excellent (90-95%)", "Perfect (100% on known)"],
+            "Dependencies": ["None", "sentence-transformers", "onnxruntime + tokenizers", "OpenAI API", "Curated database"],
+            "Use Case": ["Default", "Semantic validation", "Span entails claim", "High-stakes verification", "Cross-reference check"]
         }
         df = pd.DataFrame(comparison_data)
         st.dataframe(df, use_container_width=True)
@@ -397,12 +409,17 @@ if not st.session_state.current_paper:
         - Computes embedding similarity
         - Checks if span supports claim
         
-        **3. LLM Judge (GPT-4o Verification)**
+        **3. Entailment (NLI Cross-Encoder)**
+        - Reads span and claim together (int8 ONNX model on CPU)
+        - Scores P(entailment) against P(contradiction)
+        - Separates "X treats Y" from "X does not treat Y"
+        
+        **4. LLM Judge (GPT-4o Verification)**
         - Uses GPT-4o to verify each fact
         - Most accurate but expensive
         - Best for final validation
         
-        **4. Knowledge Base (Cross-Reference)**
+        **5. Knowledge Base (Cross-Reference)**
         - Checks against known drug-condition pairs
         - Perfect accuracy on known facts
         - Limited coverage
@@ -575,9 +592,27 @@ else:
                                 df = pd.DataFrame(facts[:10])
                                 # NEW: Show new clinical fields if present
                                 display_cols = ['drug_name', 'condition_name', 'relation', 'confidence']
-                                optional_cols = ['treatment_line', 'patient_subgroup', 'sample_size', 'study_design']
+                                optional_cols = ['treatment_line', 'patient_subgroup', 'sample_size', 'study_design', 'evidence_count', 'span_match', 'sentence_ids']
                                 available_cols = [c for c in (display_cols + optional_cols) if c in df.columns]
                                 st.dataframe(df[available_cols] if available_cols else df)
+                    
+                    # LLM cost & latency for this paper (all runs in the ledger)
+                    ledger_records = load_ledger(source_ids=[paper_id])
+                    if ledger_records:
+                        with st.expander("💰 LLM Cost & Latency"):
+                            telemetry = summarize_ledger(ledger_records)
+                            overall = telemetry["overall"]
+                            col1, col2, col3, col4 = st.columns(4)
+                            with col1:
+                                st.metric("LLM Calls", overall["calls"], help=f"{overall['cache_hits']} served from cache")
+                            with col2:
+                                st.metric("Cost", f"${overall['cost_usd']:.4f}")
+                            with col3:
+                                p50, p95 = overall["latency_p50_ms"], overall["latency_p95_ms"]
+                                st.metric("Latency p50 / p95", f"{p50 or 0:.0f} / {p95 or 0:.0f} ms")
+                            with col4:
+                                st.metric("Tokens per Fact", overall["tokens_per_fact"] or "N/A")
+                            st.dataframe(pd.DataFrame.from_dict(telemetry["by_stage"], orient="index"))
             else:
                 # Show command
                 if st.session_state.execution_mode == 'subprocess':
@@ -643,15 +678,14 @@ else:
                         col1, col2 = st.columns(2)
                         with col1:
                             st.metric("Valid Facts", len(facts))
+                        issue_log = load_issue_log_safe(issues_path)
                         with col2:
-                            issues_data = load_json_safe(issues_path)
-                            if issues_data:
-                                st.metric("Issues Found", len(issues_data.get("issues", [])))
+                            if issue_log is not None:
+                                st.metric("Issues Found", len(issue_log))
                         
                         with st.expander("View Issues"):
-                            if issues_data and issues_data.get("issues"):
-                                issues_df = pd.DataFrame(issues_data["issues"])
-                                st.dataframe(issues_df)
+                            if issue_log:
+                                st.dataframe(pd.DataFrame(issue_log.records()))
             else:
                 # Show command
                 if st.session_state.execution_mode == 'subprocess':
@@ -757,6 +791,11 @@ else:
                         value="nli" in st.session_state.default_quality_methods,
                         help="Semantic similarity using sentence-transformers (requires library)"
                     )
+                    use_entailment = st.checkbox(
+                        "🔬 Entailment (Cross-Encoder)",
+                        value="entailment" in st.session_state.default_quality_methods,
+                        help="Does the span entail the claim? int8 ONNX NLI model on CPU (requires onnxruntime)"
+                    )
                 
                 with col2:
                     use_llm = st.checkbox(
@@ -770,12 +809,22 @@ else:
                         help="Cross-reference against known drug-condition pairs"
                     )
                 
+                use_cascade = st.checkbox(
+                    "🪜 Cascade (early exit)",
+                    value=False,
+                    help="Heuristic first; only uncertain facts go on to NLI, and only facts still ambiguous "
+                         "reach the LLM judge (tiers and thresholds in configs/app.yaml → quality.cascade). "
+                         "Replaces the methods above."
+                )
+                
                 # Build methods list
                 selected_methods = []
                 if use_heuristic:
                     selected_methods.append("heuristic")
                 if use_nli:
                     selected_methods.append("nli")
+                if use_entailment:
+                    selected_methods.append("entailment")
                 if use_llm:
                     selected_methods.append("llm_judge")
                 if use_kb:
@@ -799,7 +848,8 @@ else:
                 # Show command
                 if st.session_state.execution_mode == 'subprocess' and selected_methods:
                     methods_arg = " ".join(selected_methods)
-                    st.code(f"python scripts/auto_validate_quality.py --input \"{Path('data/processed/validated') / f'{paper_id}_validated.json'}\" --output \"{quality_report_path}\" --methods {methods_arg}", language="bash")
+                    cascade_arg = " --cascade" if use_cascade else ""
+                    st.code(f"python scripts/auto_validate_quality.py --input \"{Path('data/processed/validated') / f'{paper_id}_validated.json'}\" --output \"{quality_report_path}\" --methods {methods_arg}{cascade_arg}", language="bash")
                 
                 if st.button("▶️ Run Quality Check", key="quality_btn", disabled=not selected_methods):
                     with st.spinner(f"Assessing quality using {len(selected_methods)} method(s)..."):
@@ -816,10 +866,10 @@ else:
                                 
                                 # Progress bar for LLM judge
                                 if "llm_judge" in selected_methods:
-                                    st.warning("⏳ LLM Judge is running... This may take several minutes.")
+                                    st.warning("⏳ LLM Judge is running (several facts per prompt, prompts in parallel)...")
                                 
                                 # Run assessment with selected methods
-                                quality_report = assess_dataset_quality(facts, methods=selected_methods)
+                                quality_report = assess_dataset_quality(facts, methods=selected_methods, cascade=use_cascade)
                                 
                                 quality_report_path.parent.mkdir(parents=True, exist_ok=True)
                                 quality_report_path.write_text(json.dumps(quality_report, indent=2), encoding='utf-8')
@@ -828,7 +878,13 @@ else:
                                 avg_quality = quality_report.get("average_quality_score", 0)
                                 
                                 st.success(f"✅ Quality: {avg_quality:.1f}/100, Precision: {precision:.1%}")
-                                st.info(f"Methods used: {', '.join(selected_methods)}")
+                                if use_cascade:
+                                    cascade_report = quality_report.get("cascade", {})
+                                    st.info(f"Cascade exits: {cascade_report.get('exits')} · "
+                                            f"est. cost ${cascade_report.get('estimated_cost_usd', 0):.4f} "
+                                            f"(saved ${cascade_report.get('estimated_cost_saved_usd', 0):.4f})")
+                                else:
+                                    st.info(f"Methods used: {', '.join(selected_methods)}")
                                 
                                 if precision < quality_threshold:
                                     st.warning(f"⚠️ Precision {precision:.1%} < threshold {quality_threshold:.1%}")
@@ -838,6 +894,8 @@ else:
                                 methods_args = []
                                 for method in selected_methods:
                                     methods_args.extend(["--methods", method])
+                                if use_cascade:
+                                    methods_args.append("--cascade")
                                 
                                 returncode, stdout, stderr = run_script_subprocess(
                                     "auto_validate_quality",
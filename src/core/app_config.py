@@ -0,0 +1,127 @@
+"""Application settings from ``configs/app.yaml``.
+
+Pipeline knobs (model cascade, response cache, ...) live in ``configs/app.yaml``.
+Keys missing from the file fall back to :data:`DEFAULTS`, so an empty file is valid.
+Override the location with ``APP_CONFIG_PATH``.
+"""
+from __future__ import annotations
+
+import copy
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+import yaml
+
+APP_CONFIG_PATH = Path(os.getenv("APP_CONFIG_PATH", "configs/app.yaml"))
+
+DEFAULTS: Dict[str, Any] = {
+    "extraction": {
+        "cascade": {
+            "enabled": False,
+            "cheap_model": "gpt-4o-mini",
+            "strong_model": "gpt-4o",
+            "escalate_below_confidence": 0.8,
+            "escalate_on_failure": True,
+            "numeric_density": 0.12,
+        },
+        "sentence_selection": {
+            "enabled": False,
+            "min_score": 3.0,
+            "context": 1,
+            "min_sentences": 6,
+            "embeddings": False,
+            "embedding_model": "all-MiniLM-L6-v2",
+            "embedding_weight": 3.0,
+        },
+        "response_cache": {
+            "enabled": False,
+            "path": "data/cache/llm_responses.sqlite",
+        },
+    },
+    "validation": {
+        "cache": {
+            "enabled": "auto",
+            "path": "data/cache/validation.sqlite",
+        },
+    },
+    "embedding_store": {
+        "enabled": True,
+        "path": "data/cache/embeddings",
+    },
+    "quality": {
+        "judge": {
+            "batch_size": 8,
+            "concurrency": 8,
+            "rpm": None,
+            "tpm": None,
+            "cache": {
+                "enabled": True,
+                "path": "data/cache/quality.sqlite",
+                "ttl_days": 90,
+                "max_entries": 200_000,
+            },
+        },
+        "entailment": {
+            "model": "cross-encoder/nli-deberta-v3-xsmall",
+            "path": "data/models",
+            "max_length": 256,
+            "batch_tokens": 4096,
+            "threads": None,
+        },
+        "cascade": {
+            "tiers": [
+                {"method": "heuristic", "accept": 90, "reject": 30},
+                {"method": "nli", "accept": 75, "reject": 35},
+                {"method": "llm_judge"},
+            ],
+            "cost_per_fact": {"llm_judge": 0.0015},
+        },
+        "sampling": {
+            "initial": 50,
+            "step": 50,
+            "max_samples": None,
+            "confidence": 0.95,
+            "interval": "wilson",
+            "bootstrap": 2000,
+        },
+    },
+}
+
+
+def _deep_merge(base: Dict[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+@lru_cache(maxsize=8)
+def _load(path: str) -> Dict[str, Any]:
+    config_path = Path(path)
+    raw: Dict[str, Any] = {}
+    if config_path.exists():
+        with config_path.open("r", encoding="utf-8") as fh:
+            raw = yaml.safe_load(fh) or {}
+        if not isinstance(raw, Mapping):
+            raise ValueError(f"{config_path} must contain a mapping at the top level")
+    return _deep_merge(DEFAULTS, raw)
+
+
+def load_app_config(path: Path | str | None = None) -> Dict[str, Any]:
+    """Merged settings (defaults + YAML). Returns a copy callers may mutate."""
+    return copy.deepcopy(_load(str(path or APP_CONFIG_PATH)))
+
+
+def get_setting(dotted_key: str, default: Any = None, path: Path | str | None = None) -> Any:
+    """Look up ``"extraction.cascade.enabled"``-style keys."""
+    node: Any = _load(str(path or APP_CONFIG_PATH))
+    for part in dotted_key.split("."):
+        if not isinstance(node, Mapping) or part not in node:
+            return default
+        node = node[part]
+    return copy.deepcopy(node)
@@ -0,0 +1,143 @@
+"""Small SQLite key-value cache shared by pipeline stages.
+
+Values are JSON documents stored under ``(namespace, key)``. Keys are usually a
+sha256 of everything that determines the value (see :func:`make_key`), so a cache
+entry can never be served for a different request. One file can hold several
+namespaces (e.g. raw LLM responses, per-fact validation verdicts). A store with a
+``ttl`` ignores entries older than that; :meth:`CacheStore.evict` deletes expired
+entries and trims a namespace to a maximum size (oldest first).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+# SQLite caps bound parameters per statement (999 on older builds)
+BATCH_KEYS = 500
+
+
+def make_key(*parts: Any) -> str:
+    """Stable sha256 over JSON-serialisable parts."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStore:
+    """Thread-safe JSON cache backed by one SQLite file."""
+
+    def __init__(self, path: Path | str, namespace: str = "default", ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.ttl = ttl  # seconds; None = entries never expire
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                   namespace TEXT NOT NULL,
+                   key TEXT NOT NULL,
+                   value TEXT NOT NULL,
+                   created REAL NOT NULL,
+                   PRIMARY KEY (namespace, key)
+               )"""
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def _oldest_valid(self) -> float:
+        return time.time() - self.ttl if self.ttl else 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ? AND created >= ?",
+                (self.namespace, key, self._oldest_valid()),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Values for the keys that are cached (one query per ``BATCH_KEYS`` keys)."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        oldest = self._oldest_valid()
+        with self._lock:
+            for start in range(0, len(keys), BATCH_KEYS):
+                chunk = keys[start:start + BATCH_KEYS]
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE namespace = ? AND created >= ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})",
+                    (self.namespace, oldest, *chunk),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        """Store several values in one transaction."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+                [(self.namespace, key, json.dumps(value, ensure_ascii=False), now) for key, value in items.items()],
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """Delete entries past ``ttl`` and, beyond ``max_entries``, the oldest ones; returns how many."""
+        with self._lock:
+            removed = 0
+            if self.ttl:
+                removed += self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND created < ?", (self.namespace, self._oldest_valid())
+                ).rowcount
+            if max_entries is not None:
+                removed += self._conn.execute(
+                    """DELETE FROM cache WHERE namespace = ? AND key NOT IN (
+                           SELECT key FROM cache WHERE namespace = ? ORDER BY created DESC LIMIT ?
+                       )""",
+                    (self.namespace, self.namespace, max(0, max_entries)),
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,200 @@
+"""Near-duplicate fact collapsing.
+
+The same claim is usually extracted several times per paper (abstract, results,
+discussion). Every copy is then validated, judged, normalized and loaded, so this
+stage runs right after extraction:
+
+1. Facts are bucketed by a normalized ``(drug, relation, condition)`` key, extended by
+   the fields that make a claim distinct for some relations (``KEY_FIELDS``: the
+   outcome for ``IMPROVES``, since the graph edge points at the outcome node; the
+   subgroup and treatment line for subgroup, tolerability and line-of-treatment claims).
+2. Spans are clustered with MinHash/LSH over word shingles, so copies of the same
+   sentence (re-extracted, or paraphrased between abstract and results) are recognised.
+3. Each bucket keeps its best-supported fact; the other *distinct* spans are attached
+   as ``additional_evidence`` (with their quantitative fields) and counted in
+   ``evidence_count``. A near-duplicate span is only dropped when its quantitative
+   fields add nothing to what its cluster already carries.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.telemetry import load_ledger, percentile
+
+NUM_PERM = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: pairs with Jaccard >= ~0.5 collide with high probability
+SHINGLE_SIZE = 3
+SPAN_JACCARD = 0.6
+_MERSENNE = (1 << 61) - 1
+
+_rng = np.random.RandomState(1234)  # fixed seed: signatures must be stable across runs
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.int64)
+
+QUANT_FIELDS = ("effect_size", "confidence_interval", "p_value", "sample_size", "outcome", "dose", "duration")
+EVIDENCE_FIELDS = ("section", "span", "confidence", "span_start", "span_end", "sentence_ids") + QUANT_FIELDS
+KEY_FIELDS = {
+    "IMPROVES": ("outcome",),
+    "EFFECTIVE_IN_SUBGROUP": ("patient_subgroup", "treatment_line"),
+    "WELL_TOLERATED_IN": ("patient_subgroup", "treatment_line"),
+    "FIRST_LINE_FOR": ("patient_subgroup", "treatment_line"),
+    "MAINTENANCE_FOR": ("patient_subgroup", "treatment_line"),
+}
+
+
+# -----------------------------
+# Keys & MinHash
+# -----------------------------
+def _norm(text: Any) -> str:
+    text = re.sub(r"[^a-z0-9]+", " ", str(text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def fact_key(fact: Dict[str, Any]) -> Tuple[str, ...]:
+    relation = str(fact.get("relation") or "").upper().strip()
+    key = (_norm(fact.get("drug_name")), relation, _norm(fact.get("condition_name")))
+    return key + tuple(_norm(fact.get(f)) for f in KEY_FIELDS.get(relation, ()))
+
+
+def _quant(fact: Dict[str, Any]) -> Dict[str, Any]:
+    return {f: fact[f] for f in QUANT_FIELDS if fact.get(f) not in (None, "", [])}
+
+
+def _shingles(text: str) -> List[int]:
+    words = _norm(text).split()
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    # blake2b instead of hash(): Python's str hash is salted per process
+    return [int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in set(grams)]
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    x = np.asarray(shingles, dtype=np.int64)[:, None]
+    return ((x * _PERM_A + _PERM_B) % _MERSENNE).min(axis=0)
+
+
+def cluster_spans(spans: Sequence[str], threshold: float = SPAN_JACCARD) -> List[int]:
+    """Cluster id per span; spans whose estimated Jaccard >= threshold share a cluster."""
+    parent = list(range(len(spans)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = [minhash_signature(s) for s in spans]
+    rows = NUM_PERM // LSH_BANDS
+    buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(LSH_BANDS):
+            buckets[(band, sig[band * rows:(band + 1) * rows].tobytes())].append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for a_pos, a in enumerate(members):
+            for b in members[a_pos + 1:]:
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if float(np.mean(signatures[a] == signatures[b])) >= threshold:
+                    parent[find(b)] = find(a)
+    return [find(i) for i in range(len(spans))]
+
+
+# -----------------------------
+# Collapsing
+# -----------------------------
+def support_score(fact: Dict[str, Any]) -> Tuple[float, int, int, int]:
+    """Higher is better: confidence, then quantitative detail, then exact anchoring, then span length."""
+    quant = sum(1 for f in QUANT_FIELDS if fact.get(f) not in (None, "", []))
+    anchored = 1 if fact.get("span_match") == "exact" else 0
+    return (float(fact.get("confidence") or 0.0), quant, anchored, len(fact.get("span") or ""))
+
+
+def dedupe_facts(facts: Sequence[Dict[str, Any]], threshold: float = SPAN_JACCARD) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Collapse duplicate facts; returns ``(kept_facts, stats)`` with input order preserved."""
+    clusters = cluster_spans([f.get("span") or "" for f in facts], threshold=threshold)
+
+    buckets: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+    for i, fact in enumerate(facts):
+        buckets[fact_key(fact)].append(i)
+
+    kept: List[Tuple[int, Dict[str, Any]]] = []
+    near_duplicate_spans = 0
+    for indices in buckets.values():
+        best = max(indices, key=lambda i: (support_score(facts[i]), -i))
+        merged = dict(facts[best])
+
+        evidence = []
+        # Quantitative fields already carried per span cluster (kept fact or an evidence entry)
+        seen_clusters = {clusters[best]: [_quant(merged)]}
+        side_effects = list(merged.get("side_effects") or [])
+        for i in indices:
+            if i == best:
+                continue
+            for se in facts[i].get("side_effects") or []:
+                if se not in side_effects:
+                    side_effects.append(se)
+            quant = _quant(facts[i])
+            carried = seen_clusters.setdefault(clusters[i], [])
+            if any(quant.items() <= known.items() for known in carried):
+                near_duplicate_spans += 1
+                continue
+            carried.append(quant)
+            evidence.append({k: facts[i].get(k) for k in EVIDENCE_FIELDS if facts[i].get(k) is not None})
+
+        merged["side_effects"] = side_effects
+        merged["additional_evidence"] = list(merged.get("additional_evidence") or []) + evidence
+        merged["evidence_count"] = 1 + len(merged["additional_evidence"])
+        kept.append((min(indices), merged))
+
+    kept.sort(key=lambda pair: pair[0])
+    result = [fact for _, fact in kept]
+    removed = len(facts) - len(result)
+    stats = {
+        "facts_before": len(facts),
+        "facts_after": len(result),
+        "facts_removed": removed,
+        "reduction_pct": round(100.0 * removed / len(facts), 1) if facts else 0.0,
+        "span_clusters": len(set(clusters)),
+        "near_duplicate_spans": near_duplicate_spans,
+        "downstream_savings": estimate_downstream_savings(removed),
+    }
+    return result, stats
+
+
+def estimate_downstream_savings(removed: int, ledger_path: Optional[Any] = None) -> Dict[str, Any]:
+    """Per-fact downstream work avoided, priced with observed LLM-judge calls from the ledger."""
+    judged = [r for r in load_ledger(ledger_path, stage="judge") if not r.get("cache_hit")]
+    latencies = [r.get("latency_ms", 0.0) for r in judged]
+    costs = [r["cost_usd"] for r in judged if r.get("cost_usd") is not None]
+    p50 = percentile(latencies, 50)
+    return {
+        "facts_not_validated": removed,
+        "judge_calls_saved": removed,
+        "est_judge_seconds_saved": round(removed * p50 / 1000.0, 1) if p50 is not None else None,
+        "est_judge_cost_saved_usd": round(removed * sum(costs) / len(costs), 4) if costs else None,
+    }
+
+
+def print_dedupe_stats(stats: Dict[str, Any]) -> None:
+    savings = stats["downstream_savings"]
+    print(f"🧬 Dedupe: {stats['facts_before']} → {stats['facts_after']} facts "
+          f"(-{stats['facts_removed']}, {stats['reduction_pct']}%), "
+          f"{stats['near_duplicate_spans']} near-duplicate spans merged")
+    if savings["est_judge_seconds_saved"] is not None:
+        print(f"   Saves ~{savings['judge_calls_saved']} judge calls "
+              f"(~{savings['est_judge_seconds_saved']}s, ~${savings['est_judge_cost_saved_usd'] or 0:.4f})")
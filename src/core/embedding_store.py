@@ -0,0 +1,190 @@
+"""Persistent text-embedding store.
+
+Embeddings are keyed by a hash of the text under one directory per model, so the
+same span is encoded once across quality runs, Streamlit reruns and the second
+quality pass in ``add_paper``. Each model directory holds:
+
+- ``vectors.f32``: float32 rows, appended and read through ``np.memmap``
+- ``keys.bin``: the 16-byte blake2b digest of each row's text, in row order
+- ``meta.json``: model name and vector dimension
+
+:meth:`lookup` and :meth:`encode_rows` return row numbers into :attr:`matrix`, so
+callers gather exactly the rows they need straight from the memory map (NumPy
+copies on fancy indexing, so returning gathered vectors would copy every batch).
+Only texts not yet stored are passed to the encoder and appended. Appends hold an exclusive file lock
+(where ``fcntl`` exists), so concurrent processes can share a store.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.core.app_config import get_setting
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still applies
+    fcntl = None
+
+KEY_BYTES = 16
+VECTORS_NAME = "vectors.f32"
+KEYS_NAME = "keys.bin"
+META_NAME = "meta.json"
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+def _model_dir_name(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_") or "model"
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped embeddings of one model."""
+
+    def __init__(self, model_name: str, root: Path | str = "data/cache/embeddings"):
+        self.model_name = model_name
+        self.dir = Path(root) / _model_dir_name(model_name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.dir / VECTORS_NAME
+        self._keys_path = self.dir / KEYS_NAME
+        self._meta_path = self.dir / META_NAME
+        self._lock = threading.Lock()
+        self._rows: Dict[bytes, int] = {}
+        self._count = 0  # rows mapped so far (keys.bin position, even if a digest repeats)
+        self._vectors: Optional[np.ndarray] = None
+        self.dim: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            self.dim = int(meta["dim"])
+        self._refresh()
+
+    @classmethod
+    def from_config(cls, model_name: str, enabled: Optional[bool] = None) -> Optional["EmbeddingStore"]:
+        """Store per ``embedding_store`` in configs/app.yaml (``enabled`` overrides); None when disabled."""
+        cfg = get_setting("embedding_store", {})
+        if not (cfg.get("enabled", True) if enabled is None else enabled):
+            return None
+        return cls(model_name, cfg.get("path", "data/cache/embeddings"))
+
+    # -----------------------------
+    # Files
+    # -----------------------------
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with self._lock, open(self.dir / ".lock", "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _stored_rows(self) -> int:
+        """Complete rows on disk (a torn append leaves one file longer than the other)."""
+        if self.dim is None or not self._keys_path.exists() or not self._vectors_path.exists():
+            return 0
+        return min(self._keys_path.stat().st_size // KEY_BYTES,
+                   self._vectors_path.stat().st_size // (4 * self.dim))
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last map (by this or another process)."""
+        rows = self._stored_rows()
+        if rows <= self._count:
+            return
+        with self._keys_path.open("rb") as fh:
+            fh.seek(self._count * KEY_BYTES)
+            data = fh.read((rows - self._count) * KEY_BYTES)
+        for row, i in enumerate(range(0, len(data), KEY_BYTES), self._count):
+            self._rows.setdefault(data[i:i + KEY_BYTES], row)
+        self._count = rows
+        self._vectors = (np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+                         if rows else None)
+
+    def _append(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        with self._file_lock():
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._meta_path.write_text(json.dumps({"model": self.model_name, "dim": self.dim}), encoding="utf-8")
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {vectors.shape[1]} does not match store dim {self.dim} ({self.dir})")
+            self._refresh()
+            rows = self._stored_rows()
+            # Drop a torn tail so keys and vectors stay aligned
+            for path, width in ((self._keys_path, KEY_BYTES), (self._vectors_path, 4 * self.dim)):
+                if path.exists() and path.stat().st_size != rows * width:
+                    os.truncate(path, rows * width)
+            fresh = [i for i, key in enumerate(keys) if key not in self._rows]
+            if not fresh:
+                return
+            with self._vectors_path.open("ab") as fh:
+                fh.write(np.ascontiguousarray(vectors[fresh], dtype=np.float32).tobytes())
+            with self._keys_path.open("ab") as fh:
+                fh.write(b"".join(keys[i] for i in fresh))
+            self._refresh()
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, text: str) -> bool:
+        return text_key(text) in self._rows
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Stored vector of ``text`` as a read-only view into the map (None if absent)."""
+        row = self._rows.get(text_key(text))
+        return None if row is None else self._vectors[row]
+
+    def rows(self, texts: Sequence[str]) -> List[Optional[int]]:
+        """Row of each text in :attr:`matrix` (None if absent)."""
+        return [self._rows.get(text_key(text)) for text in texts]
+
+    @property
+    def matrix(self) -> Optional[np.ndarray]:
+        """All stored vectors (read-only memory map)."""
+        return self._vectors
+
+    def lookup(self, texts: Sequence[str]) -> Optional[List[int]]:
+        """Rows of ``texts`` in :attr:`matrix` if every one is stored, else None (nothing is encoded)."""
+        self._refresh()
+        rows = self.rows(texts)
+        if not texts or any(row is None for row in rows):
+            return None
+        self.hits += len(texts)
+        return rows
+
+    def encode_rows(self, texts: Sequence[str], encoder: Encoder) -> List[int]:
+        """Rows of ``texts`` in :attr:`matrix`: stored rows are reused, the rest come from ``encoder`` and are appended."""
+        self._refresh()
+        keys = [text_key(text) for text in texts]
+        absent = [text for text, key in zip(texts, keys) if key not in self._rows]
+        self.misses += len(absent)
+        self.hits += len(texts) - len(absent)
+        missing = list(dict.fromkeys(absent))
+        if missing:
+            vectors = np.asarray(encoder(missing), dtype=np.float32)
+            self._append([text_key(text) for text in missing], vectors)
+        return [self._rows[key] for key in keys]
+
+    def encode(self, texts: Sequence[str], encoder: Encoder) -> np.ndarray:
+        """Vectors for ``texts`` as a new array (gathered from the map, so a copy); see :meth:`encode_rows`."""
+        rows = self.encode_rows(texts, encoder)
+        if not rows:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._vectors[rows]
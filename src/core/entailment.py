@@ -0,0 +1,155 @@
+"""Int8-quantized NLI cross-encoder for span/claim entailment on CPU.
+
+A cross-encoder reads the span and the claim together and classifies entailment /
+neutral / contradiction, so unlike the embedding similarity behind the ``nli``
+quality method it separates "X treats Y" from "X does not treat Y". The model is
+exported to ONNX once, its weights dynamically quantized to int8, and served with
+``onnxruntime`` + ``tokenizers`` only. Each model directory under
+``data/models/`` holds:
+
+- ``model.onnx``: the quantized graph
+- ``tokenizer.json``: the fast tokenizer
+- ``labels.json``: source model, label order and pad id
+
+The one-time export needs ``optimum[onnxruntime]`` (torch + transformers). At
+inference, pairs are tokenized up front, sorted by length and packed into batches
+under a padded-token budget, so short spans are not padded to the longest one.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.core.app_config import get_setting
+
+DEFAULT_MODEL = "cross-encoder/nli-deberta-v3-xsmall"
+DEFAULT_MODELS_DIR = Path("data/models")
+MODEL_NAME = "model.onnx"
+TOKENIZER_NAME = "tokenizer.json"
+LABELS_NAME = "labels.json"
+
+
+def quantized_model_dir(model_name: str, root: Path | str = DEFAULT_MODELS_DIR) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_") or "model"
+    return Path(root) / f"{safe}-int8"
+
+
+def export_quantized(model_name: str, out_dir: Path | str) -> Path:
+    """Export ``model_name`` to ONNX and int8-quantize its weights into ``out_dir``."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(tmp)
+        quantize_dynamic(Path(tmp) / MODEL_NAME, out_dir / MODEL_NAME, weight_type=QuantType.QInt8)
+    tokenizer.backend_tokenizer.save(str(out_dir / TOKENIZER_NAME))
+    id2label = model.config.id2label
+    meta = {
+        "model": model_name,
+        "labels": [str(id2label[i]).lower() for i in range(len(id2label))],
+        "pad_id": tokenizer.pad_token_id or 0,
+    }
+    (out_dir / LABELS_NAME).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return out_dir
+
+
+class EntailmentScorer:
+    """ONNX Runtime session + tokenizer of one quantized NLI cross-encoder."""
+
+    def __init__(self, model_dir: Path | str, threads: Optional[int] = None,
+                 max_length: int = 256, batch_tokens: int = 4096):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        meta = json.loads((self.model_dir / LABELS_NAME).read_text(encoding="utf-8"))
+        self.model_name = meta.get("model", self.model_dir.name)
+        self.labels: List[str] = meta["labels"]
+        self.entailment = self.labels.index("entailment")
+        self.contradiction = self.labels.index("contradiction")
+        self.pad_id = int(meta.get("pad_id", 0))
+        self.batch_tokens = batch_tokens
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / TOKENIZER_NAME))
+        self.tokenizer.no_padding()
+        self.tokenizer.enable_truncation(max_length=max_length)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads or 0  # 0 = onnxruntime default (all cores)
+        options.inter_op_num_threads = 1
+        self.threads = threads or os.cpu_count() or 1
+        self.session = ort.InferenceSession(str(self.model_dir / MODEL_NAME), options,
+                                            providers=["CPUExecutionProvider"])
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+    @classmethod
+    def from_config(cls, model_name: Optional[str] = None, threads: Optional[int] = None) -> "EntailmentScorer":
+        """Scorer per ``quality.entailment`` in configs/app.yaml, exporting the model on first use."""
+        cfg = get_setting("quality.entailment", {})
+        model_name = model_name or cfg.get("model", DEFAULT_MODEL)
+        model_dir = quantized_model_dir(model_name, cfg.get("path", DEFAULT_MODELS_DIR))
+        if not (model_dir / MODEL_NAME).exists():
+            print(f"📦 Exporting {model_name} to int8 ONNX (one-time) → {model_dir}")
+            export_quantized(model_name, model_dir)
+        return cls(model_dir, threads=threads or cfg.get("threads"),
+                   max_length=cfg.get("max_length", 256), batch_tokens=cfg.get("batch_tokens", 4096))
+
+    # -----------------------------
+    # Inference
+    # -----------------------------
+    def length_batches(self, lengths: Sequence[int]) -> List[List[int]]:
+        """Indices sorted by length, cut so each batch's padded size stays within ``batch_tokens``."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # Ascending order: the newcomer is the batch's longest item
+            if current and (len(current) + 1) * lengths[i] > self.batch_tokens:
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+        return batches
+
+    def predict(self, premises: Sequence[str], hypotheses: Sequence[str]) -> np.ndarray:
+        """Label probabilities, shape (pairs, labels), for each premise/hypothesis pair."""
+        encodings = self.tokenizer.encode_batch(list(zip(premises, hypotheses)))
+        lengths = [len(e.ids) for e in encodings]
+        probs = np.zeros((len(encodings), len(self.labels)), dtype=np.float32)
+        for batch in self.length_batches(lengths):
+            width = max(lengths[i] for i in batch)
+            feeds: Dict[str, np.ndarray] = {
+                "input_ids": np.full((len(batch), width), self.pad_id, dtype=np.int64),
+                "attention_mask": np.zeros((len(batch), width), dtype=np.int64),
+                "token_type_ids": np.zeros((len(batch), width), dtype=np.int64),
+            }
+            for row, i in enumerate(batch):
+                n = lengths[i]
+                feeds["input_ids"][row, :n] = encodings[i].ids
+                feeds["attention_mask"][row, :n] = 1
+                feeds["token_type_ids"][row, :n] = encodings[i].type_ids
+            logits = self.session.run(None, {k: v for k, v in feeds.items() if k in self._inputs})[0]
+            logits = logits - logits.max(axis=1, keepdims=True)
+            exp = np.exp(logits)
+            probs[batch] = exp / exp.sum(axis=1, keepdims=True)
+        return probs
+
+    def entailment_vs_contradiction(self, premises: Sequence[str],
+                                    hypotheses: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """P(entailment) renormalized against contradiction only (neutral mass dropped), plus all label probabilities."""
+        probs = self.predict(premises, hypotheses)
+        entail = probs[:, self.entailment]
+        contradict = probs[:, self.contradiction]
+        return entail / np.maximum(entail + contradict, 1e-9), probs
@@ -1,13 +1,26 @@
 from __future__ import annotations
+import hashlib
 import json
 import os
+import re
+import time
 from datetime import datetime
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
 from pathlib import Path
 import openai
 from pydantic import BaseModel, Field, ValidationError
 
+from src.core.app_config import get_setting
+from src.core.cache_store import CacheStore, make_key
+from src.core.dedupe import dedupe_facts, print_dedupe_stats
+from src.core.sentence_select import SentenceSelector
+from src.core.span_index import SpanIndex
+from src.core.telemetry import call_cost, record_llm_call, usage_from_response, write_records
+from src.core.token_count import prompt_budget
+from src.core.vocabulary import get_vocabulary
+
 # Load environment variables from .env file if it exists
 try:
     from dotenv import load_dotenv
@@ -23,40 +36,17 @@ if not api_key:
 
 client = openai.OpenAI(api_key=api_key)
 
+# Relations and lexicons shared with validation (configs/relations.yaml, configs/vocabulary.yaml)
+VOCAB = get_vocabulary()
+
 # ----------------------------- 
 # Normalization & Validation Helpers
 # -----------------------------
 def normalize_condition(condition: str) -> str:
     """Normalize condition names to canonical forms."""
-    if not condition:
-        return condition
-    
-    condition_lower = condition.lower().strip()
-    
-    normalization_map = {
-        "anxious depression": "depression",
-        "major depression": "major depressive disorder",
-        "treatment resistant depression": "treatment-resistant depression",
-        "treatment-resistant depression": "treatment-resistant depression",
-        "trd": "treatment-resistant depression",
-        "mdd": "major depressive disorder",
-        "gad": "generalized anxiety disorder",
-        "social anxiety disorder": "social anxiety",
-        "ptsd": "post-traumatic stress disorder",
-        "ocd": "obsessive compulsive disorder",
-        "bipolar i disorder": "bipolar disorder",
-        "bipolar ii disorder": "bipolar disorder",
-    }
-    
-    normalized = normalization_map.get(condition_lower, condition)
-    return normalized
-
-INVALID_SIDE_EFFECTS = {
-    "side effect frequency", "adverse event", "adverse events",
-    "side effects", "adverse effect", "adverse effects",
-    "effect", "outcome", "symptom", "symptoms",
-    "placebo", "response", "remission", "improvement"
-}
+    return VOCAB.normalize_condition(condition)
+
+INVALID_SIDE_EFFECTS = VOCAB.invalid_side_effects
 
 def is_valid_side_effect(side_effect: str) -> bool:
     """Check if a side effect is actually a specific medical side effect."""
@@ -118,7 +108,7 @@ class Triple(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score 0-1")
 
     # NEW optional clinical context (safe for pipeline)
-    treatment_line: Optional[str] = Field(None, description="first | second | maintenance | acute")
+    treatment_line: Optional[str] = Field(None, description=" | ".join(VOCAB.treatment_lines))
     patient_subgroup: Optional[str] = Field(None, description="e.g., elderly, adolescents, treatment-resistant")
     study_design: Optional[str] = Field(None, description="e.g., RCT, meta-analysis, observational")
     sample_size: Optional[int] = Field(None, description="Study sample size if present")
@@ -126,6 +116,17 @@ class Triple(BaseModel):
     dose: Optional[str] = Field(None, description="e.g., 50-200mg/day")
     p_value: Optional[float] = Field(None, ge=0.0, le=1.0, description="p-value if provided")
 
+    # Provenance anchoring (filled by SpanIndex after extraction, never by the LLM)
+    span_start: Optional[int] = Field(None, description="Character offset of the span in full_text")
+    span_end: Optional[int] = Field(None, description="End offset (exclusive) of the span in full_text")
+    span_match: Optional[str] = Field(None, description="exact | fuzzy | unmatched")
+    span_score: Optional[float] = Field(None, description="Share of span n-grams found at the anchored location")
+    sentence_ids: List[str] = Field(default_factory=list, description="Parsed sentence ids as 'section:sentence'")
+
+    # Filled by the dedupe stage when the same claim was extracted more than once
+    additional_evidence: List[Dict[str, Any]] = Field(default_factory=list, description="Other distinct spans supporting this fact")
+    evidence_count: int = Field(1, description="Number of distinct supporting spans")
+
     @property
     def side_effects_list(self) -> List[str]:
         """Ensure side_effects is always a list, never None."""
@@ -135,6 +136,11 @@ class ExtractionResult(BaseModel):
     triples: List[Triple] = Field(default_factory=list)
     section_name: str = Field(..., description="Name of the section processed")
     total_sentences: int = Field(..., description="Total sentences in this section")
+    status: str = Field("ok", description="ok | skipped | failed (failed results are never cached)")
+    model: Optional[str] = Field(None, description="Model that produced this result")
+    tier: Optional[str] = Field(None, description="Cascade tier: cheap | strong (None without a cascade)")
+    escalation_reason: Optional[str] = Field(None, description="Why the cascade sent this section to the strong model")
+    llm_calls: List[Dict[str, Any]] = Field(default_factory=list, exclude=True, description="Ledger records of the calls made")
 
 # -----------------------------
 # Extraction prompts
@@ -174,19 +180,15 @@ Confidence guidance
 Extract multiple facts per sentence when warranted (e.g., efficacy + tolerability).
 Return JSON only."""
 
-EXTRACTION_USER_PROMPT = """Extract clinical facts from this section for a depression/anxiety knowledge graph.
-
-DOCUMENT: {source_id}
-SECTION: {section_name}
-TOTAL_SENTENCES: {total_sentences}
-
-TEXT:
-{section_text}
+# Static instructions + few-shot example. Everything per-section goes in
+# EXTRACTION_SECTION_PROMPT *after* this block, so the system prompt and these
+# instructions form an identical prefix on every call (provider-side prompt caching).
+EXTRACTION_USER_PROMPT = """Extract clinical facts for a depression/anxiety knowledge graph from the section given at the end of this message (after DOCUMENT, SECTION, TOTAL_SENTENCES and TEXT).
 
-Return a JSON object with this structure exactly:
-{{
+Return a JSON object with this structure exactly. The example facts come from a different paper: always set source_id to DOCUMENT, section and section_name to SECTION, and total_sentences to TOTAL_SENTENCES.
+{
   "triples": [
-    {{
+    {
       "drug_name": "escitalopram",
       "condition_name": "major depressive disorder",
       "relation": "FIRST_LINE_FOR",
@@ -201,38 +203,38 @@ Return a JSON object with this structure exactly:
       "treatment_line": "first",
       "patient_subgroup": null,
       "p_value": 0.001,
-      "source_id": "{source_id}",
-      "section": "{section_name}",
+      "source_id": "ExampleTrial2019",
+      "section": "Results",
       "span": "In an 8‑week randomized trial (n=485) in adults with major depressive disorder, escitalopram 10–20 mg/day achieved higher remission (42% vs 28% placebo; NNT=7; 95% CI 1.2–2.4; p<0.01). Nausea and sexual dysfunction were the most frequent adverse events.",
       "confidence": 1.0
-    }},
-    {{
+    },
+    {
       "drug_name": "sertraline",
       "condition_name": "major depressive disorder",
       "relation": "PREVENTS_RELAPSE_IN",
       "study_design": "RCT",
       "sample_size": 312,
       "duration": "6 months",
-      "source_id": "{source_id}",
-      "section": "{section_name}",
+      "source_id": "ExampleTrial2019",
+      "section": "Results",
       "span": "Continuation treatment with sertraline over 6 months reduced relapse rates compared with placebo in patients with major depressive disorder, according to a randomized withdrawal design.",
       "confidence": 0.9
-    }},
-    {{
+    },
+    {
       "drug_name": "cognitive behavioral therapy",
       "condition_name": "major depressive disorder",
       "relation": "WELL_TOLERATED_IN",
       "patient_subgroup": "adolescents",
       "study_design": "observational",
-      "source_id": "{source_id}",
-      "section": "{section_name}",
+      "source_id": "ExampleTrial2019",
+      "section": "Results",
       "span": "In adolescents with major depressive disorder treated in outpatient settings, cognitive behavioral therapy was generally well tolerated with low discontinuation for adverse events.",
       "confidence": 0.8
-    }}
+    }
   ],
-  "section_name": "{section_name}",
-  "total_sentences": {total_sentences}
-}}
+  "section_name": "Results",
+  "total_sentences": 14
+}
 
 Focus on:
 - Efficacy with quantitative signals (response/remission %, effect sizes, p-values, CIs, n)
@@ -242,60 +244,277 @@ Focus on:
 
 Return only the JSON object."""
 
+EXTRACTION_SECTION_PROMPT = """DOCUMENT: {source_id}
+SECTION: {section_name}
+TOTAL_SENTENCES: {total_sentences}
+
+TEXT:
+{section_text}"""
+
+# -----------------------------
+# Structured output schema
+# -----------------------------
+RELATION_TYPES = list(VOCAB.relations)
+TREATMENT_LINES = list(VOCAB.treatment_lines)
+FIELD_ENUMS = {"relation": RELATION_TYPES, "treatment_line": TREATMENT_LINES}
+# Filled after extraction (span anchoring, dedupe) - never requested from the LLM
+POST_EXTRACTION_FIELDS = {"span_start", "span_end", "span_match", "span_score", "sentence_ids",
+                          "additional_evidence", "evidence_count"}
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+def _field_schema(name: str, field: Any) -> Dict[str, Any]:
+    annotation = field.annotation
+    nullable = False
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        nullable = len(args) < len(get_args(annotation))
+        annotation = args[0]
+    # side_effects is Optional[List[str]] but an empty list is the "none" value
+    if get_origin(annotation) in (list, List):
+        schema: Dict[str, Any] = {"type": "array", "items": {"type": _JSON_TYPES[get_args(annotation)[0]]}}
+        nullable = False
+    else:
+        schema = {"type": _JSON_TYPES[annotation]}
+    if name in FIELD_ENUMS:
+        schema["enum"] = list(FIELD_ENUMS[name]) + ([None] if nullable else [])
+    if nullable:
+        schema["type"] = [schema["type"], "null"]
+    if field.description:
+        schema["description"] = field.description
+    return schema
+
+def build_extraction_schema() -> Dict[str, Any]:
+    """Strict JSON schema for ExtractionResult, generated from the Triple model.
+
+    Strict mode needs every property listed in ``required`` and no additional
+    properties, so optional Triple fields become nullable instead of omitted.
+    """
+    triple_props = {
+        name: _field_schema(name, field)
+        for name, field in Triple.model_fields.items()
+        if name not in POST_EXTRACTION_FIELDS
+    }
+    triple_schema = {
+        "type": "object",
+        "properties": triple_props,
+        "required": list(triple_props),
+        "additionalProperties": False,
+    }
+    return {
+        "name": "extraction_result",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "triples": {"type": "array", "items": triple_schema},
+                "section_name": {"type": "string"},
+                "total_sentences": {"type": "integer"},
+            },
+            "required": ["triples", "section_name", "total_sentences"],
+            "additionalProperties": False,
+        },
+    }
+
+EXTRACTION_SCHEMA = build_extraction_schema()
+# Set EXTRACTION_STRUCTURED_OUTPUT=0 for backends without json_schema support
+STRUCTURED_OUTPUT = os.getenv("EXTRACTION_STRUCTURED_OUTPUT", "1") != "0"
+_schema_unsupported_models: set = set()
+
+def response_format_for(model: str) -> Dict[str, Any]:
+    """json_schema (strict) where supported, else plain json_object."""
+    if STRUCTURED_OUTPUT and model not in _schema_unsupported_models:
+        return {"type": "json_schema", "json_schema": EXTRACTION_SCHEMA}
+    return {"type": "json_object"}
+
+def _is_schema_unsupported(error: Exception) -> bool:
+    message = str(error).lower()
+    return isinstance(error, openai.BadRequestError) and ("response_format" in message or "json_schema" in message)
+
 # -----------------------------
 # Core extraction functions
 # -----------------------------
+MAX_SECTION_CHARS = 4000
+MAX_COMPLETION_TOKENS = 2000
+EXTRACTION_TEMPERATURE = 0.1
+SKIP_SECTIONS = {"references", "funding", "author information", "conflict", "acknowledgment"}
+
+def should_skip_section(section: Dict[str, Any]) -> bool:
+    """Sections unlikely to have clinical facts never go to the LLM."""
+    return section["name"].lower() in SKIP_SECTIONS or len(section["text"].strip()) < 50
+
+def build_extraction_messages(section: Dict[str, Any], source_id: str) -> List[Dict[str, str]]:
+    """Assemble the chat messages sent for one section (text truncated to MAX_SECTION_CHARS).
+
+    Layout is static-first: system prompt, then the static user instructions, then the
+    per-section block, so only the tail differs between calls.
+    """
+    user_prompt = EXTRACTION_USER_PROMPT + "\n\n" + EXTRACTION_SECTION_PROMPT.format(
+        source_id=source_id,
+        section_name=section["name"],
+        section_text=section["text"][:MAX_SECTION_CHARS],
+        total_sentences=len(section.get("sentences", []))
+    )
+    return [
+        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def extraction_prompt_budget(section: Dict[str, Any], source_id: str) -> Dict[str, int]:
+    """Static-prefix vs per-section tokens of the extraction prompt for ``section``."""
+    messages = build_extraction_messages(section, source_id)
+    static_text = EXTRACTION_SYSTEM_PROMPT + EXTRACTION_USER_PROMPT
+    dynamic_text = messages[1]["content"][len(EXTRACTION_USER_PROMPT):]
+    return prompt_budget(static_text, dynamic_text, messages=len(messages))
+
+def print_prompt_budget(parsed_doc: Dict[str, Any], selector: Optional[SentenceSelector] = None) -> Dict[str, int]:
+    """Per-section token budget for a parsed document (no LLM calls)."""
+    source_id = parsed_doc["metadata"]["source_id"]
+    totals = {"calls": 0, "static_tokens": 0, "dynamic_tokens": 0, "cacheable_tokens": 0}
+    print(f"🧮 Prompt budget for {source_id}:")
+    for section in parsed_doc["sections"]:
+        if should_skip_section(section):
+            continue
+        if selector is not None:
+            section = selector.apply(section)
+        budget = extraction_prompt_budget(section, source_id)
+        print(f"   - {section['name'][:40]:<40} static={budget['static_tokens']:,} "
+              f"dynamic={budget['dynamic_tokens']:,} cacheable={budget['cacheable_tokens']:,}")
+        totals["calls"] += 1
+        for key in ("static_tokens", "dynamic_tokens", "cacheable_tokens"):
+            totals[key] += budget[key]
+    total = totals["static_tokens"] + totals["dynamic_tokens"]
+    if total:
+        print(f"   Total: {total:,} prompt tokens over {totals['calls']} calls, "
+              f"{totals['static_tokens'] / total:.0%} static, "
+              f"{totals['cacheable_tokens'] / total:.0%} cacheable after the first call")
+    return totals
+
+@dataclass
+class LLMCompletion:
+    """Raw chat completion (live or replayed from the response cache)."""
+    content: Optional[str]
+    refusal: Optional[str]
+    usage: Dict[str, int]
+    latency_ms: float
+    cached: bool = False
+
+def _chat_completion(
+    model: str,
+    messages: List[Dict[str, str]],
+    response_format: Dict[str, Any],
+    response_cache: Optional[Any] = None,
+    read_cache: bool = True
+) -> LLMCompletion:
+    """Call the chat API, reading/writing ``response_cache`` (a CacheStore) when given."""
+    key = None
+    if response_cache is not None:
+        key = make_key("chat", model, messages, response_format, EXTRACTION_TEMPERATURE, MAX_COMPLETION_TOKENS)
+        entry = response_cache.get(key) if read_cache else None
+        if entry is not None:
+            return LLMCompletion(entry["content"], entry.get("refusal"), entry["usage"], entry["latency_ms"], cached=True)
+
+    started = time.perf_counter()
+    response = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=EXTRACTION_TEMPERATURE,  # Low temperature for consistency
+        max_completion_tokens=MAX_COMPLETION_TOKENS,  # Fixed: use max_completion_tokens instead of max_tokens
+        response_format=response_format  # Schema-constrained JSON (json_object fallback)
+    )
+    message = response.choices[0].message
+    completion = LLMCompletion(
+        content=message.content,
+        refusal=getattr(message, "refusal", None),
+        usage=usage_from_response(response),
+        latency_ms=(time.perf_counter() - started) * 1000,
+    )
+    if key is not None:
+        response_cache.set(key, {"content": completion.content, "refusal": completion.refusal,
+                                 "usage": completion.usage, "latency_ms": completion.latency_ms})
+    return completion
+
+def _record_extract(model: str, completion: Optional[LLMCompletion], started: float, **fields: Any) -> Dict[str, Any]:
+    """Ledger record for one attempt; replayed responses cost nothing but keep their original numbers."""
+    if completion is None:
+        return record_llm_call("extract", model, latency_ms=(time.perf_counter() - started) * 1000, **fields)
+    if completion.cached:
+        return record_llm_call(
+            "extract", model, cache_hit=True,
+            original_latency_ms=round(completion.latency_ms, 1),
+            original_cost_usd=call_cost(model, completion.usage["prompt_tokens"], completion.usage["completion_tokens"],
+                                        completion.usage.get("cached_tokens", 0)),
+            **fields,
+        )
+    return record_llm_call("extract", model, latency_ms=completion.latency_ms, **completion.usage, **fields)
+
 def extract_from_section(
     section: Dict[str, Any], 
     source_id: str,
     model: str = "gpt-4o",  
-    max_retries: int = 2
+    max_retries: int = 2,
+    rate_limiter: Optional[Any] = None,
+    response_cache: Optional[Any] = None,
+    tier: Optional[str] = None,
+    defer_ledger: bool = False
 ) -> ExtractionResult:
-    """Extract facts from a single document section using LLM."""
+    """Extract facts from a single document section using LLM.
+
+    ``rate_limiter`` (see ``src.core.extract_scheduler.RateLimiter``) is charged before
+    every attempt so retries count against the shared RPM/TPM budget too.
+    ``response_cache`` (a ``CacheStore``) replays identical first attempts; retries
+    always go to the API. ``tier`` is only recorded (see :func:`extract_with_cascade`).
+    With ``defer_ledger`` the call records are returned in ``llm_calls`` but not
+    written; the caller writes them with ``write_records``.
+    """
     
     section_name = section["name"]
     section_text = section["text"]
     total_sentences = len(section.get("sentences", []))
     
     # Skip sections unlikely to have clinical facts
-    skip_sections = {"references", "funding", "author information", "conflict", "acknowledgment"}
-    if section_name.lower() in skip_sections or len(section_text.strip()) < 50:
+    if should_skip_section(section):
         print(f"⏭ Skipping {section_name} (no clinical content expected)")
         return ExtractionResult(
             triples=[],
             section_name=section_name,
-            total_sentences=total_sentences
+            total_sentences=total_sentences,
+            status="skipped"
         )
     
     # Truncate very long sections to stay within token limits
-    max_chars = 4000
-    truncated_text = section_text[:max_chars]
-    if len(section_text) > max_chars:
-        print(f"✂️ Truncated {section_name} from {len(section_text)} to {max_chars} chars")
+    if len(section_text) > MAX_SECTION_CHARS:
+        print(f"✂️ Truncated {section_name} from {len(section_text)} to {MAX_SECTION_CHARS} chars")
     
-    user_prompt = EXTRACTION_USER_PROMPT.format(
-        source_id=source_id,
-        section_name=section_name,
-        section_text=truncated_text,
-        total_sentences=total_sentences
-    )
+    messages = build_extraction_messages(section, source_id)
+    calls: List[Dict[str, Any]] = []
     
-    for attempt in range(max_retries + 1):
+    attempt = 0
+    while attempt <= max_retries:
+        completion = None
+        started = time.perf_counter()
+        response_format = response_format_for(model)
+        call_fields = {"source_id": source_id, "section": section_name, "attempt": attempt + 1,
+                       "response_format": response_format["type"], "tier": tier, "write": not defer_ledger}
         try:
-            print(f"🤖 Processing {section_name} (attempt {attempt + 1})...")
+            print(f"🤖 Processing {section_name} with {model} (attempt {attempt + 1})...")
+            if rate_limiter is not None:
+                rate_limiter.acquire_for_messages(messages, MAX_COMPLETION_TOKENS)
             
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,  # Low temperature for consistency
-                max_completion_tokens=2000,  # Fixed: use max_completion_tokens instead of max_tokens
-                response_format={"type": "json_object"}  # Ensures JSON response
-            )
+            started = time.perf_counter()
+            try:
+                completion = _chat_completion(model, messages, response_format, response_cache, read_cache=attempt == 0)
+            except openai.BadRequestError as e:
+                if response_format["type"] != "json_schema" or not _is_schema_unsupported(e):
+                    raise
+                # Backend rejected json_schema: remember it and retry this attempt with json_object
+                _schema_unsupported_models.add(model)
+                calls.append(_record_extract(model, None, started, outcome="schema_unsupported", **call_fields))
+                print(f"ℹ️  {model} does not support json_schema output, falling back to json_object")
+                continue
             
-            content = response.choices[0].message.content
+            if completion.refusal:
+                raise ValueError(f"Model refused: {completion.refusal}")
+            content = completion.content
             raw_data = json.loads(content)
             
             # Clean up and filter triples before validation
@@ -315,7 +534,7 @@ def extract_from_section(
                     # NEW: Normalize treatment_line if present
                     if "treatment_line" in triple and isinstance(triple["treatment_line"], str):
                         tl = triple["treatment_line"].strip().lower()
-                        if tl in {"first", "second", "maintenance", "acute"}:
+                        if tl in TREATMENT_LINES:
                             triple["treatment_line"] = tl
                         else:
                             triple["treatment_line"] = None
@@ -391,24 +610,134 @@ def extract_from_section(
                 raw_data["triples"] = cleaned_triples
             
             # Validate with Pydantic
-            result = ExtractionResult(**raw_data)
+            for key in ("status", "model", "tier", "escalation_reason", "llm_calls"):
+                raw_data.pop(key, None)
+            result = ExtractionResult(**raw_data, model=model, tier=tier)
+            calls.append(_record_extract(model, completion, started, outcome="ok", facts=len(result.triples), **call_fields))
+            result.llm_calls = calls
             
             print(f"✓ Extracted {len(result.triples)} valid facts from {section_name}")
             return result
             
         except (json.JSONDecodeError, ValidationError) as e:
+            calls.append(_record_extract(model, completion, started, outcome="parse_error", **call_fields))
             print(f"⚠️  Validation error on attempt {attempt + 1} for {section_name}: {e}")
             if attempt == max_retries:
                 print(f"✗ Failed to extract from {section_name} after {max_retries + 1} attempts")
         except Exception as e:
+            calls.append(_record_extract(model, completion, started, outcome="error", **call_fields))
             print(f"⚠️  Unexpected error on attempt {attempt + 1} for {section_name}: {e}")
             if attempt == max_retries:
                 print(f"✗ Failed to extract from {section_name} after {max_retries + 1} attempts")
+        attempt += 1
     
     # Return empty result if all attempts failed
-    return ExtractionResult(triples=[], section_name=section_name, total_sentences=total_sentences)
+    return ExtractionResult(triples=[], section_name=section_name, total_sentences=total_sentences, status="failed",
+                            model=model, tier=tier, llm_calls=calls)
+
+# -----------------------------
+# Two-tier model cascade
+# -----------------------------
+# Sections go to a cheap model first; only uncertain ones are re-run on the strong
+# model. Configure under ``extraction.cascade`` in configs/app.yaml.
+_DIGIT = re.compile(r"\d")
+
+def numeric_density(text: str) -> float:
+    """Share of whitespace tokens containing a digit (stats-heavy results tables score high)."""
+    words = text.split()
+    return sum(1 for w in words if _DIGIT.search(w)) / len(words) if words else 0.0
+
+@dataclass(frozen=True)
+class CascadePolicy:
+    """Routing policy between the cheap and the strong extraction model."""
+    cheap_model: str = "gpt-4o-mini"
+    strong_model: str = "gpt-4o"
+    escalate_below_confidence: float = 0.8
+    escalate_on_failure: bool = True
+    numeric_density: float = 0.12
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> Optional["CascadePolicy"]:
+        """Policy from ``extraction.cascade`` (None when the cascade is disabled)."""
+        cfg = cfg if cfg is not None else get_setting("extraction.cascade", {})
+        if not cfg.get("enabled"):
+            return None
+        return cls(**{f.name: cfg[f.name] for f in fields(cls) if f.name in cfg})
+
+    @property
+    def signature(self) -> str:
+        """Used in place of the model name in section fingerprints and manifests."""
+        digest = hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        return f"cascade:{self.cheap_model}>{self.strong_model}:{digest}"
+
+    def route_before_call(self, section: Dict[str, Any]) -> Optional[str]:
+        """Numeric-dense sections skip the cheap tier (it would almost always escalate)."""
+        text = section.get("text", "")[:MAX_SECTION_CHARS]
+        return "numeric_dense" if numeric_density(text) >= self.numeric_density else None
+
+    def escalation_reason(self, result: ExtractionResult) -> Optional[str]:
+        if result.status == "failed":
+            return "failure" if self.escalate_on_failure else None
+        if any(t.confidence < self.escalate_below_confidence for t in result.triples):
+            return "low_confidence"
+        return None
+
+def extract_with_cascade(
+    section: Dict[str, Any],
+    source_id: str,
+    policy: CascadePolicy,
+    rate_limiter: Optional[Any] = None,
+    response_cache: Optional[Any] = None
+) -> ExtractionResult:
+    """Cheap model first, strong model for failures, low-confidence output and numeric-dense sections."""
+    if should_skip_section(section):
+        return extract_from_section(section, source_id, model=policy.cheap_model)
+
+    reason = policy.route_before_call(section)
+    cheap_calls: List[Dict[str, Any]] = []
+    if reason is None:
+        cheap = extract_from_section(
+            section, source_id, model=policy.cheap_model,
+            # a schema/parse failure escalates anyway, so don't pay for cheap retries
+            max_retries=0 if policy.escalate_on_failure else 2,
+            rate_limiter=rate_limiter, response_cache=response_cache, tier="cheap", defer_ledger=True,
+        )
+        reason = policy.escalation_reason(cheap)
+        if reason is None:
+            write_records(cheap.llm_calls)
+            return cheap
+        # The strong call's facts replace these, so the ledger must not count them too
+        cheap_calls = cheap.llm_calls
+        for record in cheap_calls:
+            record.update(discarded=True, discarded_facts=record["facts"], facts=0)
+        write_records(cheap_calls)
+    print(f"⤴️  Escalating {section['name']} to {policy.strong_model} ({reason})")
 
-def extract_from_document(parsed_doc: Dict[str, Any]) -> List[Triple]:
+    strong = extract_from_section(
+        section, source_id, model=policy.strong_model,
+        rate_limiter=rate_limiter, response_cache=response_cache, tier="strong",
+    )
+    strong.escalation_reason = reason
+    strong.llm_calls = cheap_calls + strong.llm_calls
+    return strong
+
+def resolve_extraction_options(
+    cascade: Optional[bool] = None,
+    response_cache: Optional[bool] = None
+) -> Tuple[Optional[CascadePolicy], Optional[CacheStore]]:
+    """Cascade policy and response cache to use; ``None`` arguments follow configs/app.yaml."""
+    policy = CascadePolicy.from_config()
+    if cascade is True and policy is None:
+        policy = CascadePolicy.from_config({**get_setting("extraction.cascade", {}), "enabled": True})
+    elif cascade is False:
+        policy = None
+
+    cache_cfg = get_setting("extraction.response_cache", {})
+    use_cache = cache_cfg.get("enabled", False) if response_cache is None else response_cache
+    store = CacheStore(cache_cfg.get("path", "data/cache/llm_responses.sqlite"), namespace="chat") if use_cache else None
+    return policy, store
+
+def extract_from_document(parsed_doc: Dict[str, Any], model: str = "gpt-4o") -> List[Triple]:
     """Extract facts from all sections of a parsed document."""
     
     source_id = parsed_doc["metadata"]["source_id"]
@@ -419,19 +748,172 @@ def extract_from_document(parsed_doc: Dict[str, Any]) -> List[Triple]:
     all_triples = []
     for i, section in enumerate(sections, 1):
         print(f"\n📄 Section {i}/{len(sections)}: {section['name']}")
-        result = extract_from_section(section, source_id)
+        result = extract_from_section(section, source_id, model=model)
         all_triples.extend(result.triples)
     
     print(f"\n✅ Extraction complete: {len(all_triples)} total facts from {source_id}")
     return all_triples
 
+# -----------------------------
+# Incremental re-extraction manifest
+# -----------------------------
+# The manifest lives next to *_extracted.json and remembers, per section, a hash of
+# (section text, prompt version, model) plus the triples that section produced.
+# On rerun only sections whose hash changed go back to the LLM.
+PROMPT_VERSION = hashlib.sha256(
+    (EXTRACTION_SYSTEM_PROMPT + EXTRACTION_USER_PROMPT + EXTRACTION_SECTION_PROMPT + json.dumps(EXTRACTION_SCHEMA, sort_keys=True)).encode("utf-8")
+).hexdigest()[:12]
+
+@dataclass
+class SectionJob:
+    """One section of a parsed document plus its manifest fingerprint and cached triples."""
+    source_id: str
+    index: int
+    section: Dict[str, Any]
+    fingerprint: str
+    cached_triples: Optional[List[Dict[str, Any]]] = None
+    result: Optional[ExtractionResult] = None
+    # which model/cascade tier produced the triples (from the manifest for cached sections)
+    model: Optional[str] = None
+    tier: Optional[str] = None
+    escalation_reason: Optional[str] = None
+
+    @property
+    def is_cached(self) -> bool:
+        return self.cached_triples is not None
+
+def manifest_path_for(output_path: str | Path) -> Path:
+    """Manifest sits beside the extracted file: Lancet_extracted.json -> Lancet_extracted.manifest.json."""
+    return Path(output_path).with_suffix(".manifest.json")
+
+def section_fingerprint(section: Dict[str, Any], source_id: str, model: str) -> str:
+    """Hash everything that determines what the LLM sees for this section."""
+    payload = json.dumps({
+        "source_id": source_id,
+        "name": section.get("name", ""),
+        "text": section.get("text", ""),
+        "total_sentences": len(section.get("sentences", [])),
+        "prompt_version": PROMPT_VERSION,
+        "model": model,
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def load_manifest(manifest_path: str | Path) -> Dict[str, Any]:
+    """Load a section manifest, returning an empty one if missing or unreadable."""
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return {}
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️  Ignoring unreadable manifest {manifest_path}: {e}")
+        return {}
+
+def save_manifest(manifest: Dict[str, Any], manifest_path: str | Path) -> None:
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def plan_section_jobs(
+    parsed_doc: Dict[str, Any],
+    model: str = "gpt-4o",
+    manifest: Optional[Dict[str, Any]] = None,
+    selector: Optional[SentenceSelector] = None
+) -> List[SectionJob]:
+    """Fingerprint every section and attach cached triples where the manifest hash still matches.
+
+    With a ``selector`` each section is first reduced to its selected sentences; the
+    fingerprint covers the reduced text, so changing the selection settings only
+    re-extracts sections whose selected text actually changed.
+    """
+    source_id = parsed_doc["metadata"]["source_id"]
+    cached_by_hash = {
+        entry["hash"]: entry
+        for entry in (manifest or {}).get("sections", [])
+        if entry.get("hash")
+    }
+
+    jobs = []
+    for i, section in enumerate(parsed_doc["sections"]):
+        if selector is not None:
+            section = selector.apply(section)
+        fp = section_fingerprint(section, source_id, model)
+        entry = cached_by_hash.get(fp)
+        jobs.append(SectionJob(
+            source_id=source_id,
+            index=i,
+            section=section,
+            fingerprint=fp,
+            cached_triples=entry.get("triples", []) if entry is not None else None,
+            model=(entry or {}).get("model"),
+            tier=(entry or {}).get("tier"),
+            escalation_reason=(entry or {}).get("escalation_reason"),
+        ))
+    return jobs
+
+def run_section_job(
+    job: SectionJob,
+    model: str = "gpt-4o",
+    rate_limiter: Optional[Any] = None,
+    cascade: Optional[CascadePolicy] = None,
+    response_cache: Optional[Any] = None
+) -> SectionJob:
+    """Extract a single pending section in place (no-op for cached sections)."""
+    if not job.is_cached:
+        if cascade is not None:
+            job.result = extract_with_cascade(job.section, job.source_id, cascade,
+                                              rate_limiter=rate_limiter, response_cache=response_cache)
+        else:
+            job.result = extract_from_section(job.section, job.source_id, model=model,
+                                              rate_limiter=rate_limiter, response_cache=response_cache)
+        job.model = job.result.model
+        job.tier = job.result.tier
+        job.escalation_reason = job.result.escalation_reason
+    return job
+
+def collect_section_jobs(jobs: List[SectionJob], model: str = "gpt-4o") -> Tuple[List[Triple], Dict[str, Any]]:
+    """Merge fresh and cached triples in section order and build the updated manifest."""
+    triples: List[Triple] = []
+    entries = []
+    for job in sorted(jobs, key=lambda j: j.index):
+        if job.is_cached:
+            section_triples = [Triple(**t) for t in job.cached_triples]
+        elif job.result is not None:
+            section_triples = job.result.triples
+        else:
+            section_triples = []
+        triples.extend(section_triples)
+
+        # Failed sections are left out of the manifest so the next run retries them
+        if job.is_cached or (job.result is not None and job.result.status != "failed"):
+            entries.append({
+                "index": job.index,
+                "name": job.section.get("name", ""),
+                "hash": job.fingerprint,
+                "model": job.model,
+                "tier": job.tier,
+                "escalation_reason": job.escalation_reason,
+                "triples": [t.model_dump() for t in section_triples],
+            })
+
+    manifest = {
+        "source_id": jobs[0].source_id if jobs else None,
+        "prompt_version": PROMPT_VERSION,
+        "model": model,
+        "updated": datetime.now().isoformat(),
+        "sections": entries,
+    }
+    return triples, manifest
+
 # -----------------------------
 # Utility functions
 # -----------------------------
 def save_extraction_results(
     triples: List[Triple], 
     output_path: str | Path,
-    include_metadata: bool = True
+    include_metadata: bool = True,
+    model: str = "gpt-4o",
+    extra_metadata: Optional[Dict[str, Any]] = None
 ) -> None:
     """Save extraction results to JSON file."""
     
@@ -443,8 +925,10 @@ def save_extraction_results(
             "extracted_facts": [t.model_dump() for t in triples],
             "total_facts": len(triples),
             "extraction_timestamp": datetime.now().isoformat(),
-            "extraction_model": "gpt-4o",
+            "extraction_model": model,
         }
+        if extra_metadata:
+            output.update(extra_metadata)
     else:
         output = [t.model_dump() for t in triples]
     
@@ -458,22 +942,105 @@ def load_parsed_document(json_path: str | Path) -> Dict[str, Any]:
     with open(json_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def save_section_jobs(
+    parsed_doc: Dict[str, Any],
+    jobs: List[SectionJob],
+    output_path: str | Path,
+    model: str = "gpt-4o",
+    dedupe: bool = True
+) -> List[Triple]:
+    """Merge finished section jobs, then write the extracted facts and the refreshed manifest.
+
+    The manifest keeps every section's raw triples; collapsing duplicates across
+    sections happens afterwards so reruns always dedupe the full set again.
+    """
+    triples, manifest = collect_section_jobs(jobs, model=model)
+    # Anchor every span (cached ones too, so older manifests gain offsets)
+    anchored = SpanIndex.from_parsed(parsed_doc).anchor(triples)
+    print(f"⚓ Span anchoring: {anchored.get('exact', 0)} exact, {anchored.get('fuzzy', 0)} fuzzy, "
+          f"{anchored.get('unmatched', 0)} unmatched")
+    for job in jobs:
+        if job.is_cached:
+            record_llm_call("extract", model, job.source_id, section=job.section.get("name"),
+                            cache_hit=True, outcome="cached", facts=len(job.cached_triples))
+    print(f"\n✅ Extraction complete: {len(triples)} total facts from {parsed_doc['metadata']['source_id']}")
+
+    extra_metadata = {
+        "prompt_version": PROMPT_VERSION,
+        "sections_total": len(jobs),
+        "sections_reused": sum(1 for job in jobs if job.is_cached),
+        "sections_extracted": sum(1 for job in jobs if not job.is_cached),
+        "span_anchoring": anchored,
+    }
+    selected = [job.section["selection"] for job in jobs if "selection" in job.section]
+    if selected:
+        extra_metadata["sentence_selection"] = {
+            "sections_reduced": len(selected),
+            "sentences_kept": sum(s["kept"] for s in selected),
+            "sentences_total": sum(s["total"] for s in selected),
+        }
+    tiers = Counter(job.tier for job in jobs if job.tier)
+    if tiers:
+        extra_metadata["cascade"] = {
+            "tiers": dict(tiers),
+            "escalations": dict(Counter(job.escalation_reason for job in jobs if job.escalation_reason)),
+        }
+    if dedupe and triples:
+        deduped, dedupe_stats = dedupe_facts([t.model_dump() for t in triples])
+        print_dedupe_stats(dedupe_stats)
+        triples = [Triple(**f) for f in deduped]
+        extra_metadata["dedupe"] = dedupe_stats
+    
+    print(f"💾 Saving extraction results...")
+    save_extraction_results(triples, output_path, model=model, extra_metadata=extra_metadata)
+    save_manifest(manifest, manifest_path_for(output_path))
+    return triples
+
 # -----------------------------
 # Main extraction pipeline  
 # -----------------------------
-def extract_pipeline(parsed_json_path: str | Path, output_path: str | Path) -> List[Triple]:
-    """Complete extraction pipeline: load parsed doc -> extract -> save -> return."""
+def extract_pipeline(
+    parsed_json_path: str | Path,
+    output_path: str | Path,
+    model: str = "gpt-4o",
+    incremental: bool = True,
+    dedupe: bool = True,
+    cascade: Optional[bool] = None,
+    response_cache: Optional[bool] = None,
+    sentence_selection: Optional[bool] = None
+) -> List[Triple]:
+    """Complete extraction pipeline: load parsed doc -> extract -> save -> return.
+
+    With ``incremental=True`` the section manifest next to ``output_path`` is consulted
+    and only sections whose text, prompt version or model changed are re-extracted.
+    With ``dedupe=True`` facts repeated across sections are collapsed before saving.
+    ``cascade`` / ``response_cache`` / ``sentence_selection`` override ``extraction.*`` in configs/app.yaml;
+    with the cascade on, ``model`` is ignored in favour of the policy's two models.
+    """
     
     print(f"📂 Loading parsed document: {parsed_json_path}")
     parsed_doc = load_parsed_document(parsed_json_path)
+    policy, store = resolve_extraction_options(cascade, response_cache)
+    if policy is not None:
+        print(f"🪜 Model cascade: {policy.cheap_model} → {policy.strong_model}")
+        model = policy.signature
+    selector = SentenceSelector.from_config(sentence_selection)
+    if selector is not None:
+        print(f"🎯 Sentence selection: min_score={selector.config.min_score}, context=±{selector.config.context}")
     
-    print(f"🔬 Extracting clinical facts...")
-    triples = extract_from_document(parsed_doc)
-    
-    print(f"💾 Saving extraction results...")
-    save_extraction_results(triples, output_path)
+    manifest_path = manifest_path_for(output_path)
+    previous = load_manifest(manifest_path) if incremental else {}
+    jobs = plan_section_jobs(parsed_doc, model=model, manifest=previous, selector=selector)
+    reused = sum(1 for job in jobs if job.is_cached)
+    if incremental and reused:
+        print(f"♻️  Reusing {reused}/{len(jobs)} unchanged sections from {manifest_path.name}")
     
-    return triples
+    print(f"🔬 Extracting clinical facts...")
+    pending = [job for job in jobs if not job.is_cached]
+    for n, job in enumerate(pending, 1):
+        print(f"\n📄 Section {n}/{len(pending)}: {job.section['name']}")
+        run_section_job(job, model=model, cascade=policy, response_cache=store)
+    return save_section_jobs(parsed_doc, jobs, output_path, model=model, dedupe=dedupe)
 
 if __name__ == "__main__":
     # Example usage for testing
@@ -483,6 +1050,12 @@ if __name__ == "__main__":
     parser.add_argument("--input", required=True, help="Path to parsed JSON file")
     parser.add_argument("--output", required=True, help="Path for extracted facts JSON")
     parser.add_argument("--model", default="gpt-4o", help="OpenAI model to use")
+    parser.add_argument("--full", action="store_true", help="Ignore the section manifest and re-extract every section")
+    parser.add_argument("--no-dedupe", action="store_true", help="Keep duplicate facts extracted from different sections")
+    parser.add_argument("--cascade", action=argparse.BooleanOptionalAction, default=None,
+                        help="Use the cheap→strong model cascade (default: extraction.cascade.enabled in configs/app.yaml)")
+    parser.add_argument("--select-sentences", action=argparse.BooleanOptionalAction, default=None,
+                        help="Send only high-scoring sentences (default: extraction.sentence_selection.enabled)")
     
     args = parser.parse_args()
     
@@ -491,4 +1064,5 @@ if __name__ == "__main__":
         print("❌ Please set OPENAI_API_KEY environment variable")
         exit(1)
     
-    extract_pipeline(args.input, args.output)
\ No newline at end of file
+    extract_pipeline(args.input, args.output, model=args.model, incremental=not args.full, dedupe=not args.no_dedupe,
+                     cascade=args.cascade, sentence_selection=args.select_sentences)
\ No newline at end of file
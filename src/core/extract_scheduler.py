@@ -0,0 +1,286 @@
+"""Corpus-wide extraction scheduler.
+
+``extract_pipeline`` walks one paper's sections in order, so a batch run leaves the
+account's rate-limit budget idle while each paper's last sections finish. This module
+queues the pending sections of *every* paper in one list, orders them (paper priority
+first, then longest section first), dispatches them to a thread pool under a single
+shared requests-per-minute / tokens-per-minute budget, and finally reassembles the
+per-paper outputs (extracted facts + section manifests) exactly like
+``extract_pipeline`` would.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from src.core.extract_llm import (
+    MAX_COMPLETION_TOKENS,
+    SectionJob,
+    Triple,
+    build_extraction_messages,
+    load_manifest,
+    load_parsed_document,
+    manifest_path_for,
+    plan_section_jobs,
+    resolve_extraction_options,
+    run_section_job,
+    save_section_jobs,
+    should_skip_section,
+)
+from src.core.sentence_select import SentenceSelector
+from src.core.token_count import estimate_messages_tokens
+
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM_LIMIT", "30000"))
+DEFAULT_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "8"))
+
+# -----------------------------
+# Shared rate limiter
+# -----------------------------
+class RateLimiter:
+    """Sliding one-minute window over requests and tokens, shared by all workers.
+
+    OpenAI charges ``prompt + max_completion_tokens`` against TPM when a request is
+    admitted, so callers should reserve both. A single request larger than the whole
+    TPM budget is still admitted once the window is empty rather than blocking forever.
+    """
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self._events: Deque[Tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.total_tokens = 0
+        self.total_wait = 0.0  # seconds slept, summed over every waiting worker
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Grant the reservation and return 0, or return how long to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            while self._events and self._events[0][0] <= now - self.window:
+                _, old = self._events.popleft()
+                self._tokens_in_window -= old
+
+            fits_rpm = len(self._events) < self.rpm
+            fits_tpm = self._tokens_in_window + tokens <= self.tpm or not self._events
+            if fits_rpm and fits_tpm:
+                self._events.append((now, tokens))
+                self._tokens_in_window += tokens
+                self.total_requests += 1
+                self.total_tokens += tokens
+                return 0.0
+            return max(0.01, self._events[0][0] + self.window - now)
+
+    def _record_wait(self, wait: float) -> None:
+        with self._lock:
+            self.total_wait += wait
+
+    def acquire(self, tokens: int) -> None:
+        """Block until the request fits in the budget."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                return
+            self._record_wait(wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int) -> None:
+        """asyncio flavour of :meth:`acquire` for coroutine-based callers."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                return
+            self._record_wait(wait)
+            await asyncio.sleep(wait)
+
+    def acquire_for_messages(self, messages: Sequence[Dict[str, str]], completion_tokens: int = 0) -> None:
+        self.acquire(estimate_messages_tokens(messages) + completion_tokens)
+
+
+# -----------------------------
+# Corpus scheduling
+# -----------------------------
+@dataclass
+class PaperPlan:
+    """One queued paper: its parsed document, output path and section jobs."""
+
+    parsed_path: Path
+    output_path: Path
+    parsed_doc: Dict[str, Any]
+    jobs: List[SectionJob]
+    priority: int = 0
+
+    @property
+    def source_id(self) -> str:
+        return self.parsed_doc["metadata"]["source_id"]
+
+
+@dataclass
+class SchedulerStats:
+    papers: int = 0
+    sections_total: int = 0
+    sections_reused: int = 0
+    sections_dispatched: int = 0
+    estimated_tokens: int = 0
+    elapsed_seconds: float = 0.0
+    rate_limit_worker_wait_seconds: float = 0.0  # summed over workers, so it can exceed elapsed_seconds
+    tpm_limit: int = DEFAULT_TPM
+    failed_papers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def tokens_per_minute(self) -> float:
+        return self.estimated_tokens / (self.elapsed_seconds / 60.0) if self.elapsed_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "papers": self.papers,
+            "sections_total": self.sections_total,
+            "sections_reused": self.sections_reused,
+            "sections_dispatched": self.sections_dispatched,
+            "estimated_tokens": self.estimated_tokens,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "rate_limit_worker_wait_seconds": round(self.rate_limit_worker_wait_seconds, 2),
+            "tokens_per_minute": round(self.tokens_per_minute, 1),
+            "tpm_utilization": round(self.tokens_per_minute / self.tpm_limit, 3) if self.tpm_limit else None,
+            "failed_papers": self.failed_papers,
+        }
+
+
+def _job_cost(job: SectionJob) -> int:
+    if should_skip_section(job.section):
+        return 0
+    return estimate_messages_tokens(build_extraction_messages(job.section, job.source_id)) + MAX_COMPLETION_TOKENS
+
+
+def order_section_jobs(
+    plans: Sequence[PaperPlan],
+    order: str = "longest"
+) -> List[Tuple[PaperPlan, SectionJob]]:
+    """Flatten pending sections of all papers into dispatch order.
+
+    ``longest`` puts higher-priority papers first and, within a priority level, the
+    longest sections first so the long tail is made of short calls. ``fifo`` keeps
+    paper/section order (still honouring priority).
+    """
+    queue = [(plan, job) for plan in plans for job in plan.jobs if not job.is_cached]
+    if order == "longest":
+        queue.sort(key=lambda pj: (-pj[0].priority, -len(pj[1].section.get("text", ""))))
+    elif order == "fifo":
+        queue.sort(key=lambda pj: -pj[0].priority)
+    else:
+        raise ValueError(f"Unknown scheduling order: {order}")
+    return queue
+
+
+def plan_corpus(
+    papers: Sequence[Tuple[str | Path, str | Path]],
+    model: str = "gpt-4o",
+    incremental: bool = True,
+    priorities: Optional[Dict[str, int]] = None,
+    stats: Optional[SchedulerStats] = None,
+    selector: Optional[SentenceSelector] = None
+) -> List[PaperPlan]:
+    """Load every parsed document and fingerprint its sections against the manifests."""
+    plans: List[PaperPlan] = []
+    for parsed_path, output_path in papers:
+        parsed_path, output_path = Path(parsed_path), Path(output_path)
+        try:
+            parsed_doc = load_parsed_document(parsed_path)
+        except Exception as e:
+            print(f"❌ Could not load {parsed_path}: {e}")
+            if stats is not None:
+                stats.failed_papers[parsed_path.stem.removesuffix("_parsed")] = str(e)
+            continue
+        previous = load_manifest(manifest_path_for(output_path)) if incremental else {}
+        jobs = plan_section_jobs(parsed_doc, model=model, manifest=previous, selector=selector)
+        source_id = parsed_doc["metadata"]["source_id"]
+        plans.append(PaperPlan(
+            parsed_path=parsed_path,
+            output_path=output_path,
+            parsed_doc=parsed_doc,
+            jobs=jobs,
+            priority=(priorities or {}).get(source_id, 0),
+        ))
+    return plans
+
+
+def extract_corpus(
+    papers: Sequence[Tuple[str | Path, str | Path]],
+    model: str = "gpt-4o",
+    max_workers: int = DEFAULT_WORKERS,
+    rpm: int = DEFAULT_RPM,
+    tpm: int = DEFAULT_TPM,
+    incremental: bool = True,
+    order: str = "longest",
+    priorities: Optional[Dict[str, int]] = None,
+    dedupe: bool = True,
+    cascade: Optional[bool] = None,
+    response_cache: Optional[bool] = None,
+    sentence_selection: Optional[bool] = None
+) -> Tuple[Dict[str, List[Triple]], SchedulerStats]:
+    """Extract a whole corpus of ``(parsed_json_path, extracted_output_path)`` pairs.
+
+    Returns ``({source_id: triples}, stats)``; each paper's extracted JSON and manifest
+    are written as soon as the whole corpus has been dispatched. ``cascade``,
+    ``response_cache`` and ``sentence_selection`` follow configs/app.yaml when None
+    (see ``extract_pipeline``).
+    """
+    policy, store = resolve_extraction_options(cascade, response_cache)
+    if policy is not None:
+        model = policy.signature
+    stats = SchedulerStats(tpm_limit=tpm)
+    plans = plan_corpus(papers, model=model, incremental=incremental, priorities=priorities, stats=stats,
+                        selector=SentenceSelector.from_config(sentence_selection))
+    queue = order_section_jobs(plans, order=order)
+
+    stats.papers = len(plans)
+    stats.sections_total = sum(len(p.jobs) for p in plans)
+    stats.sections_reused = sum(1 for p in plans for j in p.jobs if j.is_cached)
+    stats.sections_dispatched = len(queue)
+    stats.estimated_tokens = sum(_job_cost(job) for _, job in queue)
+
+    print(f"🗓  Scheduling {len(queue)} sections from {len(plans)} papers "
+          f"({stats.sections_reused} reused) | workers={max_workers} rpm={rpm} tpm={tpm}")
+
+    limiter = RateLimiter(rpm=rpm, tpm=tpm)
+    started = time.monotonic()
+    # ThreadPoolExecutor runs submissions FIFO, so submission order is dispatch order
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(run_section_job, job, model, limiter, policy, store): (plan, job)
+            for plan, job in queue
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            plan, job = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"⚠️  Section '{job.section.get('name')}' of {plan.source_id} crashed: {e}")
+            if done % 10 == 0 or done == len(futures):
+                print(f"   Progress: {done}/{len(futures)} sections")
+    stats.elapsed_seconds = time.monotonic() - started
+    stats.rate_limit_worker_wait_seconds = limiter.total_wait
+
+    results: Dict[str, List[Triple]] = {}
+    for plan in plans:
+        # One paper's write/dedupe/anchoring error must not cost the others their output
+        try:
+            results[plan.source_id] = save_section_jobs(plan.parsed_doc, plan.jobs, plan.output_path,
+                                                        model=model, dedupe=dedupe)
+        except Exception as e:
+            print(f"❌ Could not save {plan.source_id}: {e}")
+            stats.failed_papers[plan.source_id] = str(e)
+
+    print(f"📈 Corpus extraction: {stats.sections_dispatched} sections in {stats.elapsed_seconds:.1f}s "
+          f"(~{stats.tokens_per_minute:,.0f} tokens/min of {tpm:,} TPM)")
+    return results, stats
@@ -0,0 +1,163 @@
+"""Incremental fact readers and JSONL writers.
+
+``iter_facts`` yields facts one at a time from either JSONL (one fact per line) or
+the pipeline's JSON files (a list, or an object with the facts under ``triples`` /
+``validated_facts`` / ``extracted_facts``) without loading the whole document, so
+validation memory stays flat regardless of corpus size.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+FACT_LIST_KEYS = ("triples", "validated_facts", "extracted_facts")
+JSONL_SUFFIXES = {".jsonl", ".ndjson"}
+CHUNK_CHARS = 1 << 16
+_WHITESPACE = " \t\r\n"
+
+MISSING_KEY_MESSAGE = "Expected a list under one of keys: 'triples', 'validated_facts', or 'extracted_facts'"
+BAD_FORMAT_MESSAGE = ("Input JSON must be a list of facts or an object containing "
+                      "'triples', 'validated_facts', or 'extracted_facts'")
+
+
+class _JsonTokens:
+    """Pulls JSON values off a text stream with ``raw_decode`` over a sliding buffer."""
+
+    def __init__(self, fh: IO[str], chunk_chars: int = CHUNK_CHARS):
+        self.fh = fh
+        self.chunk_chars = chunk_chars
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.fh.read(self.chunk_chars)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character (not consumed); "" at end of input."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed JSON: expected '{char}', found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal touching the buffer end may continue in the next chunk
+            if end == len(self.buf) and not isinstance(obj, (dict, list, str)) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def array_items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            self.pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"Malformed JSON array: expected ',' or ']', found '{sep or 'end of file'}'")
+
+
+def _iter_json(fh: IO[str]) -> Iterator[Dict[str, Any]]:
+    tokens = _JsonTokens(fh)
+    first = tokens.peek()
+    if first == "[":
+        yield from tokens.array_items()
+        return
+    if first != "{":
+        raise ValueError(BAD_FORMAT_MESSAGE)
+
+    tokens.expect("{")
+    while tokens.peek() not in ("}", ""):
+        key = tokens.value()
+        tokens.expect(":")
+        if key in FACT_LIST_KEYS and tokens.peek() == "[":
+            yield from tokens.array_items()
+            return
+        tokens.value()  # skip metadata
+        if tokens.peek() == ",":
+            tokens.pos += 1
+    raise ValueError(MISSING_KEY_MESSAGE)
+
+
+def _iter_jsonl(fh: IO[str]) -> Iterator[Dict[str, Any]]:
+    for line_no, line in enumerate(fh, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_no}: {e}") from e
+
+
+def is_jsonl(path: Path | str) -> bool:
+    return Path(path).suffix.lower() in JSONL_SUFFIXES
+
+
+def iter_facts(path: Path | str) -> Iterator[Dict[str, Any]]:
+    """Yield facts from a JSONL file or a pipeline JSON file, one at a time.
+
+    For JSON objects the first fact-list key in file order is used.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Input file not found: {path}")
+    with path.open("r", encoding="utf-8") as fh:
+        yield from (_iter_jsonl(fh) if is_jsonl(path) else _iter_json(fh))
+
+
+def load_facts(path: Path | str) -> List[Dict[str, Any]]:
+    """All facts from a JSONL or JSON file (see :func:`iter_facts`)."""
+    return list(iter_facts(path))
+
+
+class JsonlWriter:
+    """Appends one JSON document per line; use as a context manager."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.count = 0
+        self._fh: Optional[IO[str]] = None
+
+    def __enter__(self) -> "JsonlWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("w", encoding="utf-8")
+        return self
+
+    def write(self, obj: Any) -> None:
+        self._fh.write(json.dumps(obj, ensure_ascii=False))
+        self._fh.write("\n")
+        self.count += 1
+
+    def __exit__(self, *exc) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
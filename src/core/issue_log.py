@@ -0,0 +1,268 @@
+"""Compact validation issue log.
+
+Validation rules emit many issues that differ only in a name or number, so the
+log stores four small integer columns per issue - issue-type code, fact index,
+field id and an id into an interned table of template arguments - and renders
+``ValidationIssue`` records (message + suggestion) from per-type templates only
+when they are read. The same layout is written to disk (``*_issues.json``), with
+the templates in the file so old reports render the same after rules change.
+"""
+from __future__ import annotations
+
+import json
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, overload
+
+from pydantic import BaseModel
+from pydantic_core import core_schema
+
+ISSUE_LOG_FORMAT = "issue_log/1"
+# Template for issues added as already-rendered records (stream samples, legacy files)
+RAW_MESSAGE, RAW_SUGGESTION = "{0}", "{1}"
+
+
+class ValidationIssue(BaseModel):
+    """Represents a validation problem with an extracted fact."""
+    fact_index: int
+    issue_type: str
+    severity: str  # "error", "warning", "info"
+    field: str
+    message: str
+    suggestion: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class IssueTemplate:
+    """Severity, default field and ``str.format`` templates (positional args) of one issue type."""
+    severity: str
+    field: str
+    message: str
+    suggestion: Optional[str] = None
+
+
+class IssueLog:
+    """Array-backed, list-like sequence of ``ValidationIssue`` records."""
+
+    def __init__(self, catalog: Optional[Mapping[str, IssueTemplate]] = None):
+        self.catalog: Mapping[str, IssueTemplate] = catalog or {}
+        # (issue_type, severity, message template, suggestion template)
+        self._types: List[Tuple[str, str, str, Optional[str]]] = []
+        self._type_ids: Dict[Tuple[str, str, str, Optional[str]], int] = {}
+        self._catalog_ids: Dict[str, int] = {}
+        self._fields: List[str] = []
+        self._field_ids: Dict[str, int] = {}
+        self._args: List[Tuple[str, ...]] = []
+        self._arg_ids: Dict[Tuple[str, ...], int] = {}
+        self._type_col = array("H")
+        self._fact_col = array("q")
+        self._field_col = array("H")
+        self._args_col = array("l")
+
+    # ----- writing -----
+    def _type_id(self, key: Tuple[str, str, str, Optional[str]]) -> int:
+        type_id = self._type_ids.get(key)
+        if type_id is None:
+            type_id = self._type_ids[key] = len(self._types)
+            self._types.append(key)
+        return type_id
+
+    def _field_id(self, field: str) -> int:
+        field_id = self._field_ids.get(field)
+        if field_id is None:
+            field_id = self._field_ids[field] = len(self._fields)
+            self._fields.append(field)
+        return field_id
+
+    def _push(self, type_id: int, fact_index: int, field: str, args: Tuple[str, ...]) -> None:
+        args_id = self._arg_ids.get(args)
+        if args_id is None:
+            args_id = self._arg_ids[args] = len(self._args)
+            self._args.append(args)
+        self._type_col.append(type_id)
+        self._fact_col.append(fact_index)
+        self._field_col.append(self._field_id(field))
+        self._args_col.append(args_id)
+
+    def add(self, fact_index: int, issue_type: str, *args: Any, field: Optional[str] = None) -> None:
+        """Record a catalog issue; ``args`` fill the type's message/suggestion templates."""
+        template = self.catalog[issue_type]
+        type_id = self._catalog_ids.get(issue_type)
+        if type_id is None:
+            type_id = self._catalog_ids[issue_type] = self._type_id(
+                (issue_type, template.severity, template.message, template.suggestion))
+        self._push(type_id, fact_index, field or template.field, tuple(str(a) for a in args))
+
+    def add_entries(self, fact_index: int, entries: Iterable[Sequence[Any]]) -> None:
+        """Replay :meth:`entries` output (e.g. a cached verdict) for ``fact_index``."""
+        for issue_type, field, args in entries:
+            type_id = self._catalog_ids.get(issue_type)
+            if type_id is None:
+                self.add(fact_index, issue_type, *args, field=field)
+            else:
+                self._push(type_id, fact_index, field, tuple(args))
+
+    def append(self, issue: Union[ValidationIssue, Mapping[str, Any]]) -> None:
+        """Record an already-rendered issue (kept verbatim)."""
+        if not isinstance(issue, ValidationIssue):
+            issue = ValidationIssue(**issue)
+        suggestion = RAW_SUGGESTION if issue.suggestion is not None else None
+        type_id = self._type_id((issue.issue_type, issue.severity, RAW_MESSAGE, suggestion))
+        args = (issue.message, issue.suggestion) if issue.suggestion is not None else (issue.message,)
+        self._push(type_id, issue.fact_index, issue.field, args)
+
+    def extend(self, issues: Iterable[Union[ValidationIssue, Mapping[str, Any]]]) -> None:
+        for issue in issues:
+            self.append(issue)
+
+    def clear(self) -> None:
+        """Drop all issues (and interned arguments, so long-lived logs stay small)."""
+        for column in (self._type_col, self._fact_col, self._field_col, self._args_col):
+            del column[:]
+        self._args.clear()
+        self._arg_ids.clear()
+
+    # ----- reading -----
+    def __len__(self) -> int:
+        return len(self._type_col)
+
+    def _render(self, i: int) -> ValidationIssue:
+        issue_type, severity, message, suggestion = self._types[self._type_col[i]]
+        args = self._args[self._args_col[i]]
+        return ValidationIssue(
+            fact_index=self._fact_col[i],
+            issue_type=issue_type,
+            severity=severity,
+            field=self._fields[self._field_col[i]],
+            message=message.format(*args),
+            suggestion=suggestion.format(*args) if suggestion is not None else None,
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> ValidationIssue: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[ValidationIssue]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._render(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("issue index out of range")
+        return self._render(index)
+
+    def __iter__(self) -> Iterator[ValidationIssue]:
+        return (self._render(i) for i in range(len(self)))
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def _count_by(self, position: int) -> Dict[str, int]:
+        per_type: Dict[int, int] = {}
+        for type_id in self._type_col:
+            per_type[type_id] = per_type.get(type_id, 0) + 1
+        counts: Dict[str, int] = {}
+        for type_id, count in per_type.items():
+            key = self._types[type_id][position]
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def type_counts(self) -> Dict[str, int]:
+        """Issues per issue_type (first-seen order)."""
+        return self._count_by(0)
+
+    def severity_counts(self) -> Dict[str, int]:
+        return self._count_by(1)
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> List[List[Any]]:
+        """Unrendered ``[issue_type, field, args]`` of issues ``start:stop`` (replay with :meth:`add`)."""
+        return [
+            [self._types[self._type_col[i]][0], self._fields[self._field_col[i]], list(self._args[self._args_col[i]])]
+            for i in range(*slice(start, stop).indices(len(self)))
+        ]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Rendered issues as plain dicts (e.g. for a DataFrame)."""
+        return [issue.model_dump() for issue in self]
+
+    # ----- (de)serialization -----
+    def to_dict(self) -> Dict[str, Any]:
+        """Columnar form: shared tables plus one int per column per issue."""
+        return {
+            "types": [list(t) for t in self._types],
+            "fields": list(self._fields),
+            "args": [list(a) for a in self._args],
+            "issues": {
+                "type": self._type_col.tolist(),
+                "fact_index": self._fact_col.tolist(),
+                "field": self._field_col.tolist(),
+                "args": self._args_col.tolist(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "IssueLog":
+        log = cls()
+        for issue_type, severity, message, suggestion in data.get("types", []):
+            log._type_id((issue_type, severity, message, suggestion))
+        for field in data.get("fields", []):
+            log._field_id(field)
+        for args in data.get("args", []):
+            args = tuple(args)
+            log._arg_ids.setdefault(args, len(log._args))
+            log._args.append(args)
+        columns = data.get("issues", {})
+        log._type_col.extend(columns.get("type", []))
+        log._fact_col.extend(columns.get("fact_index", []))
+        log._field_col.extend(columns.get("field", []))
+        log._args_col.extend(columns.get("args", []))
+        return log
+
+    # ----- pydantic integration (ValidationReport.issues) -----
+    @classmethod
+    def _coerce(cls, value: Any) -> "IssueLog":
+        if isinstance(value, IssueLog):
+            return value
+        log = cls()
+        log.extend(value or [])
+        return log
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(lambda log: log.records()),
+        )
+
+
+# -----------------------------
+# Files
+# -----------------------------
+def write_issue_log(path: Path | str, log: IssueLog, summary: Optional[Dict[str, Any]] = None) -> None:
+    """Write ``log`` in the compact on-disk format (one JSON document, no per-issue duplication)."""
+    payload = {
+        "format": ISSUE_LOG_FORMAT,
+        "validation_summary": summary or {},
+        "issue_counts": log.type_counts(),
+        **log.to_dict(),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+def read_issue_log(path: Path | str) -> IssueLog:
+    """Issues from a compact ``*_issues.json``, a legacy issues report or a streamed ``*_issues.jsonl``."""
+    path = Path(path)
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        log = IssueLog()
+        with path.open("r", encoding="utf-8") as fh:
+            log.extend(json.loads(line) for line in fh if line.strip())
+        return log
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("format") == ISSUE_LOG_FORMAT:
+        return IssueLog.from_dict(data)
+    # Legacy layout: {"validation_report": {"issues": [...]}, "issues_by_type": {...}}
+    return IssueLog._coerce((data.get("validation_report") or {}).get("issues", []))
@@ -0,0 +1,113 @@
+"""Multi-pattern substring matching for validation lexicons.
+
+``LexiconMatcher`` compiles a list of terms into an Aho-Corasick automaton, so one
+pass over a string finds every term it contains instead of one ``term in text``
+scan per lexicon entry. Terms keep their position in the original list (``rank``),
+which lets callers reproduce "first term in iteration order" semantics exactly.
+
+``SubstringIndex`` answers the reverse question - which terms *contain* a string -
+with a dict of every term substring.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+_NO_MATCH = -1
+
+
+class LexiconMatcher:
+    """Aho-Corasick automaton over ``terms`` (matched as plain substrings)."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = list(terms)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lowest rank among terms ending at a state (including via fail links)
+        self._best: List[int] = [_NO_MATCH]
+        self._build()
+
+    def _build(self) -> None:
+        for rank, term in enumerate(self.terms):
+            if not term:
+                continue
+            state = 0
+            for ch in term:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(_NO_MATCH)
+                state = nxt
+            if self._best[state] == _NO_MATCH or rank < self._best[state]:
+                self._best[state] = rank
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                inherited = self._best[self._fail[nxt]]
+                if inherited != _NO_MATCH and (self._best[nxt] == _NO_MATCH or inherited < self._best[nxt]):
+                    self._best[nxt] = inherited
+
+        # Fold fail links into complete per-state transition tables (BFS order, so a
+        # state's fail target is already complete) - scanning is then one dict lookup per char
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [{} for _ in self._goto[1:]]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self._delta[state] = {**self._delta[self._fail[state]], **self._goto[state]}
+            queue.extend(self._goto[state].values())
+
+    def _scan(self, text: str, stop_at_first: bool) -> int:
+        delta, best = self._delta, self._best
+        state, found = 0, _NO_MATCH
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            rank = best[state]
+            if rank != _NO_MATCH:
+                if stop_at_first or rank == 0:
+                    return rank
+                if found == _NO_MATCH or rank < found:
+                    found = rank
+        return found
+
+    def contains_any(self, text: str) -> bool:
+        """Equivalent to ``any(term in text for term in terms)``."""
+        return self._scan(text, stop_at_first=True) != _NO_MATCH
+
+    def first_match(self, text: str) -> Optional[str]:
+        """Equivalent to ``next((t for t in terms if t in text), None)``."""
+        rank = self._scan(text, stop_at_first=False)
+        return self.terms[rank] if rank != _NO_MATCH else None
+
+    def first_rank(self, text: str) -> int:
+        """Rank of :meth:`first_match` (``-1`` when nothing matches)."""
+        return self._scan(text, stop_at_first=False)
+
+
+class SubstringIndex:
+    """Maps every substring of ``terms`` to the lowest rank of a term containing it."""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = list(terms)
+        self._ranks: Dict[str, int] = {}
+        for rank, term in enumerate(self.terms):
+            for i in range(len(term)):
+                for j in range(i + 1, len(term) + 1):
+                    self._ranks.setdefault(term[i:j], rank)
+        # "" is a substring of every term
+        if self.terms:
+            self._ranks[""] = 0
+
+    def first_rank(self, text: str) -> int:
+        """Rank of the first term with ``text in term`` (``-1`` when none)."""
+        return self._ranks.get(text, _NO_MATCH)
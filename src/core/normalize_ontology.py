@@ -20,6 +20,7 @@ from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional
 
 import yaml
 
+from src.core.fact_stream import load_facts
 from src.schemas.triples import NormalizationMatch, NormalizedTriple
 
 # ---------------------------------------------------------------------------
@@ -263,27 +264,9 @@ class OntologyNormalizer:
         return NormalizationMatch(text=value, match_type="unmatched", score=0.0)
 
     def _load_facts(self, path: Path) -> List[Mapping[str, Any]]:
-        if not path.exists():
-            raise FileNotFoundError(f"Input file not found: {path}")
-
-        with path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
-
-        if isinstance(data, list):
-            return [dict(item) for item in data]
-        if isinstance(data, Mapping):
-            # Support multiple common wrapper keys produced by earlier pipeline stages
-            # in addition to the raw list or the 'triples' key used by extraction.
-            for key in ("triples", "validated_facts", "extracted_facts"):
-                if key in data and isinstance(data[key], list):
-                    return [dict(item) for item in data[key]]
-            raise ValueError(
-                "Expected a list under one of keys: 'triples', 'validated_facts', or 'extracted_facts'"
-            )
-
-        raise ValueError(
-            "Input JSON must be a list of facts or an object containing 'triples', 'validated_facts', or 'extracted_facts'"
-        )
+        # JSONL (one fact per line) or a list / object with 'triples', 'validated_facts'
+        # or 'extracted_facts' as produced by earlier pipeline stages
+        return [dict(item) for item in load_facts(path)]
 
     # ------------------------------------------------------------------
     # Reporting helpers
@@ -0,0 +1,244 @@
+"""Sentence selection for extraction prompts.
+
+Whole sections are mostly background, methods boilerplate and citations. The
+selector scores every parsed sentence for "clinical fact likelihood" and keeps only
+the top-scoring ones plus a little surrounding context, so the LLM sees far fewer
+tokens per paper.
+
+Scores combine:
+- drug/intervention mentions (``configs/mappings.yaml`` drugs + class words + common
+  antidepressant suffixes) - facts need a drug in the span, so this dominates
+- outcome / side-effect lexicon hits (mappings outcomes and side effects + scale names)
+- relation cue words (efficacy, superior, first-line, tolerated, relapse, ...)
+- numeric / statistics patterns (p-values, CIs, %, n=, OR/RR/NNT)
+- optionally, cosine similarity to a "clinical finding" prototype from a small local
+  sentence-transformers model
+
+Configure under ``extraction.sentence_selection`` in configs/app.yaml.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from src.core.app_config import get_setting
+from src.core.embedding_store import EmbeddingStore
+
+GAP_MARKER = "[...]"
+
+DRUG_CLASS_TERMS = [
+    "ssri", "ssris", "snri", "snris", "tca", "tcas", "maoi", "maois", "antidepressant", "antidepressants",
+    "antipsychotic", "antipsychotics", "benzodiazepine", "benzodiazepines", "placebo", "psychotherapy",
+    "cognitive behavioral therapy", "cognitive behavioural therapy", "cbt", "ect", "electroconvulsive",
+    "tms", "transcranial", "lithium", "ketamine", "esketamine", "augmentation",
+]
+DRUG_SUFFIX = re.compile(r"\b\w+(?:pram|xetine|faxine|azine|apine|tyline|ipramine|azodone|zapine|ipiprazole|oxetine)\b", re.I)
+OUTCOME_TERMS = [
+    "ham-d", "hamd", "hdrs", "madrs", "phq-9", "gad-7", "ham-a", "cgi", "qids",
+    "response", "remission", "relapse", "recurrence", "efficacy", "acceptability", "tolerability",
+    "dropout", "discontinuation", "adverse", "side effect", "side effects",
+]
+RELATION_CUES = [
+    "effective", "efficacious", "superior", "inferior", "equivalent", "more than", "less than", "compared with",
+    "versus", "vs", "first-line", "first line", "maintenance", "continuation", "prevent", "reduced", "improved",
+    "improvement", "well tolerated", "tolerated", "associated with", "contraindicated", "augment", "recommend",
+]
+STATS_PATTERN = re.compile(
+    r"(\bp\s*[<=>≤]\s*0?\.\d+|\b95\s*%|\bci\b|\bci\s*[\[(]|\d+(?:\.\d+)?\s*%|\bn\s*=\s*\d+|"
+    r"\b(?:or|rr|hr|nnt|nnh|smd|md)\b\s*[=:]?\s*\d|\d+\s*/\s*\d+)",
+    re.I,
+)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z(\[])")
+
+PROTOTYPE = ("In a randomized trial, the antidepressant improved remission of major depressive disorder "
+             "compared with placebo (response 52% vs 38%, p<0.01) and was well tolerated.")
+
+
+@dataclass(frozen=True)
+class SelectionConfig:
+    enabled: bool = False
+    min_score: float = 3.0          # sentences scoring below this are dropped
+    context: int = 1                # neighbours kept on each side of a selected sentence
+    min_sentences: int = 6          # shorter sections are sent whole
+    embeddings: bool = False        # add similarity from a local sentence-transformers model
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_weight: float = 3.0
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "SelectionConfig":
+        cfg = cfg if cfg is not None else get_setting("extraction.sentence_selection", {})
+        return cls(**{f.name: cfg[f.name] for f in fields(cls) if f.name in cfg})
+
+
+# -----------------------------
+# Lexicons
+# -----------------------------
+def _phrase_pattern(terms: List[str]) -> Optional[re.Pattern]:
+    terms = sorted({t.lower().strip() for t in terms if t and (len(t.strip()) > 2 or t == "vs")}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r"(?<![\w-])(?:" + "|".join(re.escape(t) for t in terms) + r")(?![\w-])", re.I)
+
+
+@lru_cache(maxsize=4)
+def load_lexicons(mappings_path: str = "configs/mappings.yaml") -> Dict[str, Optional[re.Pattern]]:
+    """Compiled drug / outcome / cue patterns (mappings.yaml terms + built-ins)."""
+    drugs, outcomes = list(DRUG_CLASS_TERMS), list(OUTCOME_TERMS)
+    path = Path(mappings_path)
+    if path.exists():
+        entities = (yaml.safe_load(path.read_text(encoding="utf-8")) or {}).get("entities", {})
+        for entry in entities.get("drugs", []):
+            drugs += [entry.get("label", "")] + list(entry.get("synonyms", []))
+        for key in ("outcomes", "side_effects"):
+            for entry in entities.get(key, []):
+                outcomes += [entry.get("label", "")] + list(entry.get("synonyms", []))
+    return {
+        "drug": _phrase_pattern(drugs),
+        "outcome": _phrase_pattern(outcomes),
+        "cue": _phrase_pattern(RELATION_CUES),
+    }
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+def score_sentence(text: str, lexicons: Optional[Dict[str, Optional[re.Pattern]]] = None) -> float:
+    """Heuristic clinical-fact likelihood of one sentence."""
+    lexicons = lexicons or load_lexicons()
+
+    def hits(key: str) -> int:
+        pattern = lexicons.get(key)
+        return len(pattern.findall(text)) if pattern is not None else 0
+
+    drug_hits = hits("drug") + len(DRUG_SUFFIX.findall(text))
+    score = 2.0 * min(drug_hits, 2)
+    score += 1.0 * min(hits("outcome"), 2)
+    score += 0.75 * min(hits("cue"), 2)
+    score += 0.75 * min(len(STATS_PATTERN.findall(text)), 3)
+    # Citation-only or very short fragments rarely hold a complete fact
+    if len(text.split()) < 6:
+        score -= 1.0
+    return score
+
+
+class _Embedder:
+    """Lazy sentence-transformers wrapper over the embedding store; disables itself when the package is missing."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model = None
+        self._prototype = None
+        self._store = EmbeddingStore.from_config(model_name)
+        self.available = True
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # Only texts missing from the store get here, so the model loads on first miss
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(texts, normalize_embeddings=True, batch_size=64)
+
+    def _vectors(self, texts: List[str]) -> np.ndarray:
+        return self._store.encode(texts, self._encode) if self._store is not None else self._encode(texts)
+
+    def similarities(self, texts: List[str]) -> Optional[List[float]]:
+        if not self.available or not texts:
+            return None
+        try:
+            if self._prototype is None:
+                self._prototype = self._vectors([PROTOTYPE])[0]
+            vectors = self._vectors(texts)
+        except ImportError:
+            print("⚠️  sentence-transformers not installed; sentence selection uses lexicon scores only")
+            self.available = False
+            return None
+        return [float(v @ self._prototype) for v in vectors]
+
+
+def section_sentences(section: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Parsed sentences of a section (regex split when the parser provided none)."""
+    sentences = section.get("sentences") or []
+    if sentences:
+        return sentences
+    text = section.get("text", "")
+    base = section.get("start_offset", 0)
+    out, pos = [], 0
+    for frag in _SENTENCE_SPLIT.split(text):
+        start = text.find(frag, pos)
+        pos = start + len(frag)
+        out.append({"text": frag, "start": base + start, "end": base + pos})
+    return out
+
+
+# -----------------------------
+# Selection
+# -----------------------------
+class SentenceSelector:
+    """Keeps the top-scoring sentences of a section plus ``context`` neighbours."""
+
+    def __init__(self, config: Optional[SelectionConfig] = None):
+        self.config = config or SelectionConfig.from_config()
+        self.lexicons = load_lexicons()
+        self._embedder = _Embedder(self.config.embedding_model) if self.config.embeddings else None
+
+    @classmethod
+    def from_config(cls, enabled: Optional[bool] = None) -> Optional["SentenceSelector"]:
+        """Selector per configs/app.yaml (``enabled`` overrides); None when disabled."""
+        config = SelectionConfig.from_config()
+        if enabled is not None:
+            config = SelectionConfig(**{**asdict(config), "enabled": enabled})
+        return cls(config) if config.enabled else None
+
+    def scores(self, sentences: List[Dict[str, Any]]) -> List[float]:
+        scores = [score_sentence(s.get("text", ""), self.lexicons) for s in sentences]
+        if self._embedder is not None:
+            sims = self._embedder.similarities([s.get("text", "") for s in sentences])
+            if sims is not None:
+                scores = [sc + self.config.embedding_weight * max(0.0, sim) for sc, sim in zip(scores, sims)]
+        return scores
+
+    def select_indices(self, sentences: List[Dict[str, Any]]) -> List[int]:
+        if len(sentences) <= self.config.min_sentences:
+            return list(range(len(sentences)))
+        keep = set()
+        for i, score in enumerate(self.scores(sentences)):
+            if score >= self.config.min_score:
+                keep.update(range(max(0, i - self.config.context), min(len(sentences), i + self.config.context + 1)))
+        return sorted(keep)
+
+    def apply(self, section: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of ``section`` whose text/sentences are only the selected sentences.
+
+        Gaps between kept runs are marked with ``[...]`` so the model does not read
+        non-adjacent sentences as one passage. The original sentence count is kept
+        under ``selection``.
+        """
+        sentences = section_sentences(section)
+        indices = self.select_indices(sentences)
+        if len(indices) == len(sentences):
+            return section
+
+        parts: List[str] = []
+        prev = None
+        for i in indices:
+            if prev is not None and i != prev + 1:
+                parts.append(GAP_MARKER)
+            parts.append(sentences[i].get("text", "").strip())
+            prev = i
+        selected = dict(section)
+        selected["text"] = " ".join(parts)
+        selected["sentences"] = [sentences[i] for i in indices]
+        selected["selection"] = {"kept": len(indices), "total": len(sentences)}
+        return selected
+
+    def selected_ranges(self, section: Dict[str, Any]) -> List[Tuple[int, int]]:
+        """Absolute ``(start, end)`` offsets of the sentences :meth:`apply` would keep."""
+        sentences = section_sentences(section)
+        return [(sentences[i]["start"], sentences[i]["end"]) for i in self.select_indices(sentences)
+                if sentences[i].get("start") is not None]
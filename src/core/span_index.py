@@ -0,0 +1,214 @@
+"""Span-to-source provenance index.
+
+The LLM returns each fact's ``span`` as free text, so finding it again in the parsed
+document used to mean a linear scan of ``full_text``. :class:`SpanIndex` tokenizes
+``full_text`` once (lower-cased ``\\w+`` tokens with character offsets) and keeps a
+token n-gram -> positions map. A span is resolved by letting each of its n-grams vote
+for an alignment in the document; the best-supported alignment gives ``(start, end)``
+character offsets, an exact/fuzzy flag, a coverage score and the ids of the parsed
+sentences it overlaps.
+
+Sentence ids are ``"<section_index>:<sentence_index>"`` into ``parsed_doc["sections"]``.
+:class:`SourceIndexes` builds one index per source document on first use, for
+checks that look up many facts' spans (validation's span-in-source rule).
+"""
+from __future__ import annotations
+
+import bisect
+import json
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+TOKEN_RE = re.compile(r"\w+")
+NGRAM = 3
+# n-grams occurring more often than this ("of the patients") carry no alignment signal
+MAX_POSTINGS = 64
+# allowed drift (in tokens) between matching n-grams of the same fuzzy alignment
+ALIGN_BAND = 8
+MIN_FUZZY_SCORE = 0.5
+DEFAULT_PARSED_DIR = Path("data/interim")
+
+
+@dataclass
+class SpanMatch:
+    """Where a span was found in ``full_text``."""
+
+    start: Optional[int] = None
+    end: Optional[int] = None
+    match_type: str = "unmatched"  # exact | fuzzy | unmatched
+    score: float = 0.0
+    sentence_ids: List[str] = field(default_factory=list)
+
+    def as_fields(self) -> Dict[str, Any]:
+        """Field names used on extracted triples."""
+        return {
+            "span_start": self.start,
+            "span_end": self.end,
+            "span_match": self.match_type,
+            "span_score": round(self.score, 3),
+            "sentence_ids": list(self.sentence_ids),
+        }
+
+
+def _tokenize(text: str) -> List[Tuple[str, int, int]]:
+    return [(m.group(0).lower(), m.start(), m.end()) for m in TOKEN_RE.finditer(text or "")]
+
+
+class SpanIndex:
+    """Token n-gram index over a parsed document's ``full_text``."""
+
+    def __init__(self, full_text: str, sections: Optional[Sequence[Dict[str, Any]]] = None, n: int = NGRAM):
+        self.full_text = full_text or ""
+        self.n = n
+        tokens = _tokenize(self.full_text)
+        self._words = [t for t, _, _ in tokens]
+        self._starts = [s for _, s, _ in tokens]
+        self._ends = [e for _, _, e in tokens]
+
+        self._postings: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for i in range(len(self._words)):
+            for size in range(1, n + 1):
+                if i + size <= len(self._words):
+                    self._postings[tuple(self._words[i:i + size])].append(i)
+
+        # Sentences sorted by start offset for bisecting character ranges to ids
+        sentences = []
+        for si, section in enumerate(sections or []):
+            for ti, sent in enumerate(section.get("sentences", [])):
+                if sent.get("start") is not None and sent.get("end") is not None:
+                    sentences.append((sent["start"], sent["end"], f"{si}:{ti}"))
+        sentences.sort()
+        self._sent_starts = [s for s, _, _ in sentences]
+        self._sentences = sentences
+
+    @classmethod
+    def from_parsed(cls, parsed_doc: Dict[str, Any]) -> "SpanIndex":
+        return cls(parsed_doc.get("full_text", ""), parsed_doc.get("sections", []))
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    def sentence_ids_for(self, start: int, end: int) -> List[str]:
+        """Ids of sentences overlapping the character range ``[start, end)``."""
+        hi = bisect.bisect_left(self._sent_starts, end)
+        # sentences never span more than a few hundred chars, so walk back from hi
+        ids = []
+        for k in range(hi - 1, -1, -1):
+            s, e, sid = self._sentences[k]
+            if e > start:
+                ids.append(sid)
+            elif s < start - 5000:
+                break
+        return ids[::-1]
+
+    def _match(self, tok_lo: int, tok_hi: int, match_type: str, score: float) -> SpanMatch:
+        start, end = self._starts[tok_lo], self._ends[tok_hi]
+        return SpanMatch(start, end, match_type, score, self.sentence_ids_for(start, end))
+
+    def resolve(self, span: str) -> SpanMatch:
+        """Locate ``span`` in ``full_text`` (exact token match first, then best fuzzy alignment)."""
+        words = [t for t, _, _ in _tokenize(span)]
+        if not words or not self._words:
+            return SpanMatch()
+
+        n = min(self.n, len(words))
+        grams = [tuple(words[i:i + n]) for i in range(len(words) - n + 1)]
+
+        # Each n-gram votes for the document position where the span would start
+        votes: Counter = Counter()
+        hits: Dict[int, List[int]] = defaultdict(list)  # diagonal -> doc positions of matching n-grams
+        for offset, gram in enumerate(grams):
+            postings = self._postings.get(gram)
+            if not postings or (len(postings) > MAX_POSTINGS and len(grams) > 1):
+                continue
+            for pos in postings:
+                diag = pos - offset
+                votes[diag] += 1
+                hits[diag].append(pos)
+
+        if not votes:
+            return SpanMatch()
+
+        # Exact: every token lines up on one diagonal
+        for diag, count in votes.most_common(4):
+            if diag >= 0 and self._words[diag:diag + len(words)] == words:
+                return self._match(diag, diag + len(words) - 1, "exact", 1.0)
+
+        # Fuzzy: pool diagonals within a band to tolerate dropped/inserted words. A window
+        # slides over the sorted diagonals; ties go to the smallest diagonal.
+        diags = sorted(votes)
+        best_diag, best_count = None, 0
+        window = hi = 0
+        for diag in diags:
+            while hi < len(diags) and diags[hi] <= diag + ALIGN_BAND:
+                window += votes[diags[hi]]
+                hi += 1
+            if window > best_count:
+                best_diag, best_count = diag, window
+            window -= votes[diag]
+        if best_diag is None:
+            return SpanMatch()
+
+        positions = [p for d in range(best_diag, best_diag + ALIGN_BAND + 1) for p in hits.get(d, [])]
+        score = min(1.0, best_count / len(grams))
+        if score < MIN_FUZZY_SCORE:
+            return SpanMatch(score=score)
+        lo = min(positions)
+        hi = min(max(positions) + n - 1, len(self._words) - 1)
+        return self._match(lo, hi, "fuzzy", score)
+
+    def anchor(self, facts: Iterable[Any]) -> Dict[str, int]:
+        """Resolve and store offsets on each fact (pydantic Triple or dict). Returns match counts."""
+        counts: Counter = Counter()
+        for fact in facts:
+            span = fact.get("span", "") if isinstance(fact, dict) else getattr(fact, "span", "")
+            match = self.resolve(span)
+            counts[match.match_type] += 1
+            for key, value in match.as_fields().items():
+                if isinstance(fact, dict):
+                    fact[key] = value
+                else:
+                    setattr(fact, key, value)
+        return dict(counts)
+
+
+class SourceIndexes:
+    """One :class:`SpanIndex` per source document, built once on first lookup.
+
+    ``parsed`` is a single ``*_parsed.json`` (used for every source id) or a
+    directory of ``{source_id}_parsed.json`` files.
+    """
+
+    def __init__(self, parsed: Path | str = DEFAULT_PARSED_DIR):
+        self.parsed = Path(parsed)
+        self._single = self.parsed.is_file()
+        self._indexes: Dict[Path, Optional[SpanIndex]] = {}
+        self._fingerprints: Dict[Path, str] = {}
+
+    def path_for(self, source_id: str) -> Path:
+        return self.parsed if self._single else self.parsed / f"{source_id}_parsed.json"
+
+    def get(self, source_id: str) -> Optional[SpanIndex]:
+        """Index of ``source_id``'s parsed document; None (warned once) if it is missing."""
+        path = self.path_for(source_id)
+        if path not in self._indexes:
+            if path.is_file():
+                self._indexes[path] = SpanIndex.from_parsed(json.loads(path.read_text(encoding="utf-8")))
+            else:
+                print(f"⚠️  No parsed document for source '{source_id}' ({path}); span-in-source check skipped")
+                self._indexes[path] = None
+        return self._indexes[path]
+
+    def fingerprint(self, source_id: str) -> str:
+        """Cheap identity of the parsed file (size + mtime) for cache keys."""
+        path = self.path_for(source_id)
+        if path not in self._fingerprints:
+            try:
+                stat = path.stat()
+                self._fingerprints[path] = f"{stat.st_size}-{stat.st_mtime_ns}"
+            except OSError:
+                self._fingerprints[path] = "missing"
+        return self._fingerprints[path]
@@ -0,0 +1,282 @@
+"""Append-only ledger of LLM calls (tokens, latency, cache hits, outcome).
+
+Every extraction attempt and every LLM-judge call appends one JSON line to
+``data/reports/llm_ledger.jsonl`` (override with ``LLM_LEDGER_PATH``). Records carry
+the process ``RUN_ID`` so a batch run can roll up only its own calls.
+:func:`summarize_ledger` turns records into p50/p95 latency, tokens per fact and
+cost per paper; ``scripts/telemetry_summary.py`` is the CLI on top of it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+LEDGER_PATH = Path(os.getenv("LLM_LEDGER_PATH", "data/reports/llm_ledger.jsonl"))
+RUN_ID = uuid.uuid4().hex[:12]
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICES: Dict[str, tuple] = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-5": (1.25, 0.125, 10.00),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+}
+
+_lock = threading.Lock()
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> Optional[float]:
+    """USD cost of one call, or None when the model has no price entry."""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        # dated snapshots like gpt-4o-2024-08-06 share the base model's price
+        prices = next((p for name, p in sorted(MODEL_PRICES.items(), key=lambda kv: -len(kv[0]))
+                       if model.startswith(name)), None)
+    if prices is None:
+        return None
+    input_price, cached_price, output_price = prices
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (uncached * input_price + cached_tokens * cached_price + completion_tokens * output_price) / 1_000_000
+
+
+def usage_from_response(response: Any) -> Dict[str, int]:
+    """Pull token counts out of an OpenAI response (all zeros when unavailable)."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0,
+    }
+
+
+def record_llm_call(
+    stage: str,
+    model: str,
+    source_id: Optional[str] = None,
+    *,
+    section: Optional[str] = None,
+    attempt: int = 1,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    cached_tokens: int = 0,
+    latency_ms: float = 0.0,
+    cache_hit: bool = False,
+    outcome: str = "ok",
+    facts: int = 0,
+    ledger_path: Optional[Path] = None,
+    write: bool = True,
+    **extra: Any
+) -> Dict[str, Any]:
+    """Append one call record to the ledger and return it (``write=False``: only build it, see :func:`write_records`)."""
+    record = {
+        "ts": datetime.now().isoformat(),
+        "run_id": RUN_ID,
+        "stage": stage,
+        "model": model,
+        "source_id": source_id,
+        "section": section,
+        "attempt": attempt,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "latency_ms": round(latency_ms, 1),
+        "cache_hit": cache_hit,
+        "outcome": outcome,
+        "facts": facts,
+        "cost_usd": call_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+    }
+    record.update(extra)
+    if write:
+        write_records([record], ledger_path)
+    return record
+
+
+def write_records(records: List[Dict[str, Any]], ledger_path: Optional[Path] = None) -> None:
+    """Append already-built records (e.g. held back until a cascade decided to keep them)."""
+    if not records:
+        return
+    path = Path(ledger_path or LEDGER_PATH)
+    try:
+        with _lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+    except OSError as e:
+        # Telemetry must never break the pipeline
+        print(f"⚠️  Could not write LLM ledger {path}: {e}")
+
+
+def record_response(
+    stage: str,
+    model: str,
+    response: Any,
+    started: float,
+    **fields: Any
+) -> Dict[str, Any]:
+    """Record a call given its response (may be None on failure) and ``time.perf_counter()`` start."""
+    return record_llm_call(
+        stage,
+        model,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        **usage_from_response(response),
+        **fields,
+    )
+
+
+# -----------------------------
+# Reading & summarizing
+# -----------------------------
+def load_ledger(
+    ledger_path: Optional[Path] = None,
+    *,
+    run_id: Optional[str] = None,
+    source_ids: Optional[Iterable[str]] = None,
+    stage: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Read ledger records, optionally filtered by run, paper(s) and stage."""
+    path = Path(ledger_path or LEDGER_PATH)
+    if not path.exists():
+        return []
+    wanted = set(source_ids) if source_ids is not None else None
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # tolerate a torn last line
+            if run_id and rec.get("run_id") != run_id:
+                continue
+            if wanted is not None and rec.get("source_id") not in wanted:
+                continue
+            if stage and rec.get("stage") != stage:
+                continue
+            records.append(rec)
+    return records
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (pct in 0..100); None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _rollup(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    live = [r for r in records if not r.get("cache_hit")]
+    latencies = [r.get("latency_ms", 0.0) for r in live]
+    prompt = sum(r.get("prompt_tokens", 0) for r in records)
+    completion = sum(r.get("completion_tokens", 0) for r in records)
+    # Reused sections and cache replays cost no tokens, so tokens/fact counts live facts only;
+    # cheap-tier output discarded by a cascade escalation is not counted as facts at all
+    facts = sum(r.get("facts", 0) for r in live if r.get("stage") == "extract" and not r.get("discarded"))
+    cached_facts = sum(r.get("facts", 0) for r in records
+                       if r.get("stage") == "extract" and r.get("cache_hit") and not r.get("discarded"))
+    live_tokens = sum(r.get("prompt_tokens", 0) + r.get("completion_tokens", 0) for r in live)
+    costs = [r["cost_usd"] for r in records if r.get("cost_usd") is not None]
+    p50, p95 = percentile(latencies, 50), percentile(latencies, 95)
+    parse_errors = sum(1 for r in live if r.get("outcome") == "parse_error")
+    # Each extraction of a section starts with attempt 1; later attempts are retries
+    section_runs = sum(1 for r in live if r.get("section") is not None and r.get("attempt", 1) == 1
+                       and r.get("outcome") != "schema_unsupported")
+    retries = sum(1 for r in live if r.get("section") is not None and r.get("attempt", 1) > 1)
+    # Share of live prompt tokens the provider served from its prefix cache
+    live_prompt = sum(r.get("prompt_tokens", 0) for r in live)
+    live_cached = sum(r.get("cached_tokens", 0) for r in live)
+    return {
+        "calls": len(live),
+        "cache_hits": len(records) - len(live),
+        "errors": sum(1 for r in live if r.get("outcome") not in ("ok", "cached")),
+        "parse_errors": parse_errors,
+        "parse_failure_rate": round(parse_errors / len(live), 4) if live else None,
+        "retries_per_section": round(retries / section_runs, 3) if section_runs else None,
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "cached_tokens": sum(r.get("cached_tokens", 0) for r in records),
+        "prompt_cache_rate": round(live_cached / live_prompt, 4) if live_prompt else None,
+        "latency_p50_ms": round(p50, 1) if p50 is not None else None,
+        "latency_p95_ms": round(p95, 1) if p95 is not None else None,
+        "facts_extracted": facts,
+        "facts_cached": cached_facts,
+        "tokens_per_fact": round(live_tokens / facts, 1) if facts else None,
+        "cost_usd": round(sum(costs), 4),
+    }
+
+
+def summarize_ledger(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Overall, per-stage and per-paper rollups of ledger records."""
+    by_stage: Dict[str, List[Dict[str, Any]]] = {}
+    by_paper: Dict[str, List[Dict[str, Any]]] = {}
+    by_format: Dict[str, List[Dict[str, Any]]] = {}
+    for rec in records:
+        by_stage.setdefault(rec.get("stage") or "unknown", []).append(rec)
+        by_paper.setdefault(rec.get("source_id") or "unknown", []).append(rec)
+        if rec.get("stage") == "extract" and not rec.get("cache_hit"):
+            # records written before structured output existed all used json_object
+            by_format.setdefault(rec.get("response_format") or "json_object", []).append(rec)
+
+    return {
+        "overall": _rollup(records),
+        "by_stage": {stage: _rollup(recs) for stage, recs in sorted(by_stage.items())},
+        "by_paper": {paper: _rollup(recs) for paper, recs in sorted(by_paper.items())},
+        "extract_by_response_format": {fmt: _rollup(recs) for fmt, recs in sorted(by_format.items())},
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """Human-readable rendering of :func:`summarize_ledger` output."""
+    def fmt(v, unit=""):
+        return "n/a" if v is None else f"{v:,}{unit}"
+
+    def fmt_pct(v):
+        return "n/a" if v is None else f"{v:.1%}"
+
+    overall = summary["overall"]
+    print(f"\n💰 LLM Telemetry:")
+    print(f"   Calls: {overall['calls']} (+{overall['cache_hits']} cache hits, {overall['errors']} errors)")
+    print(f"   Tokens: {overall['prompt_tokens']:,} prompt / {overall['completion_tokens']:,} completion "
+          f"({overall['cached_tokens']:,} cached, prompt cache rate {fmt_pct(overall.get('prompt_cache_rate'))})")
+    print(f"   Latency: p50={fmt(overall['latency_p50_ms'], 'ms')} p95={fmt(overall['latency_p95_ms'], 'ms')}")
+    print(f"   Tokens/fact: {fmt(overall['tokens_per_fact'])} "
+          f"({overall['facts_extracted']:,} live facts, +{overall.get('facts_cached', 0):,} from cache)")
+    print(f"   Parse failures: {overall['parse_errors']} ({fmt_pct(overall['parse_failure_rate'])}), "
+          f"retries/section: {fmt(overall['retries_per_section'])}")
+    print(f"   Cost: ${overall['cost_usd']:.4f}")
+
+    if summary["by_stage"]:
+        print(f"\n   By stage:")
+        for stage, roll in summary["by_stage"].items():
+            print(f"   - {stage}: {roll['calls']} calls, p50={fmt(roll['latency_p50_ms'], 'ms')}, "
+                  f"p95={fmt(roll['latency_p95_ms'], 'ms')}, prompt cache={fmt_pct(roll.get('prompt_cache_rate'))}, "
+                  f"${roll['cost_usd']:.4f}")
+    if summary.get("extract_by_response_format"):
+        print(f"\n   Extraction by response format:")
+        for response_format, roll in summary["extract_by_response_format"].items():
+            print(f"   - {response_format}: {roll['calls']} calls, parse failures={fmt_pct(roll['parse_failure_rate'])}, "
+                  f"retries/section={fmt(roll['retries_per_section'])}")
+    if summary["by_paper"]:
+        print(f"\n   By paper:")
+        for paper, roll in summary["by_paper"].items():
+            print(f"   - {paper}: ${roll['cost_usd']:.4f}, {roll['facts_extracted']} facts, "
+                  f"tokens/fact={fmt(roll['tokens_per_fact'])}")
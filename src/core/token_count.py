@@ -0,0 +1,48 @@
+"""Token counting for prompt budgeting (tiktoken when available, ~4 chars/token otherwise)."""
+from __future__ import annotations
+
+from typing import Dict, Sequence
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken missing or encoding files unavailable offline
+    _ENCODING = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, else fall back to ~4 chars/token."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+
+def estimate_messages_tokens(messages: Sequence[Dict[str, str]]) -> int:
+    # ~4 tokens of chat framing per message
+    return sum(estimate_tokens(m.get("content", "")) + 4 for m in messages)
+
+
+# OpenAI caches prompt prefixes of at least 1,024 tokens, in 128-token increments
+CACHE_MIN_PREFIX_TOKENS = 1024
+CACHE_PREFIX_INCREMENT = 128
+
+
+def cacheable_prefix_tokens(static_tokens: int) -> int:
+    """Tokens of an identical prompt prefix the provider can serve from its cache."""
+    if static_tokens < CACHE_MIN_PREFIX_TOKENS:
+        return 0
+    return static_tokens - (static_tokens - CACHE_MIN_PREFIX_TOKENS) % CACHE_PREFIX_INCREMENT
+
+
+def prompt_budget(static_text: str, dynamic_text: str, messages: int = 2) -> Dict[str, int]:
+    """Static (shared prefix) vs dynamic (per-call tail) token split of one prompt."""
+    static = estimate_tokens(static_text) + 4 * messages
+    dynamic = estimate_tokens(dynamic_text)
+    return {
+        "static_tokens": static,
+        "dynamic_tokens": dynamic,
+        "total_tokens": static + dynamic,
+        "cacheable_tokens": cacheable_prefix_tokens(static),
+    }
@@ -1,11 +1,22 @@
 from __future__ import annotations
+import hashlib
 import json
+import pickle
 import re
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Set
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 from pydantic import BaseModel, Field, ValidationError
 
+from src.core.app_config import get_setting
+from src.core.cache_store import CacheStore
+from src.core.fact_stream import JsonlWriter, iter_facts
+from src.core.issue_log import IssueLog, IssueTemplate, ValidationIssue, write_issue_log
+from src.core.span_index import DEFAULT_PARSED_DIR, SourceIndexes
+from src.core.vocabulary import get_vocabulary
+
 # Load environment variables if available
 try:
     from dotenv import load_dotenv
@@ -16,22 +27,16 @@ except ImportError:
 # -----------------------------
 # Validation Models
 # -----------------------------
-class ValidationIssue(BaseModel):
-    """Represents a validation problem with an extracted fact."""
-    fact_index: int
-    issue_type: str
-    severity: str  # "error", "warning", "info"
-    field: str
-    message: str
-    suggestion: Optional[str] = None
-
 class ValidationReport(BaseModel):
     """Summary of validation results."""
     total_facts: int
     valid_facts: int
     invalid_facts: int
     warnings: int
-    issues: List[ValidationIssue]
+    issues: IssueLog  # streaming validation keeps only the first few here
+    issue_counts: Dict[str, int] = Field(default_factory=dict)  # per issue_type (streaming only)
+    rule_tier: str = "core"  # active rules: tier, plus "+name" for rules enabled individually
+    rule_stats: Optional[Dict[str, Dict[str, Any]]] = None  # per rule, when instrumented
     
     def print_summary(self):
         """Print a human-readable validation summary."""
@@ -48,6 +53,17 @@ class ValidationReport(BaseModel):
                 print(f"   {icon} Fact #{issue.fact_index}: {issue.message}")
                 if issue.suggestion:
                     print(f"      💡 Suggestion: {issue.suggestion}")
+        
+        if self.rule_stats:
+            print_rule_stats(self.rule_stats, self.rule_tier)
+
+def print_rule_stats(rule_stats: Dict[str, Dict[str, Any]], rule_tier: str) -> None:
+    """Per-rule cost table, most expensive first."""
+    print(f"\n⏱  Rule costs (rules: {rule_tier}):")
+    print(f"   {'rule':<24} {'tier':<9} {'calls':>8} {'µs/call':>8} {'total ms':>9} {'rejected':>9}")
+    for name, stats in sorted(rule_stats.items(), key=lambda kv: -kv[1]["seconds"]):
+        print(f"   {name:<24} {stats['tier']:<9} {stats['calls']:>8} {stats['us_per_call']:>8.1f} "
+              f"{stats['seconds'] * 1000:>9.1f} {stats['rejection_rate']:>8.1%}")
 
 # -----------------------------
 # Validation Rules & Lists
@@ -59,150 +75,208 @@ class ValidationReport(BaseModel):
 
 def normalize_condition_for_validation(condition: str) -> str:
     """Normalize condition names to canonical forms for validation."""
-    if not condition:
-        return condition
-    
-    condition_lower = condition.lower().strip()
-    
-    normalization_map = {
-        "anxious depression": "depression",
-        "major depression": "major depressive disorder",
-        "treatment resistant depression": "treatment-resistant depression",
-        "treatment-resistant depression": "treatment-resistant depression",
-        "trd": "treatment-resistant depression",
-        "mdd": "major depressive disorder",
-        "gad": "generalized anxiety disorder",
-        "social anxiety disorder": "social anxiety",
-        "ptsd": "post-traumatic stress disorder",
-        "ocd": "obsessive compulsive disorder",
-        "bipolar i disorder": "bipolar disorder",
-        "bipolar ii disorder": "bipolar disorder",
-    }
-    
-    return normalization_map.get(condition_lower, condition)
+    return VOCAB.normalize_condition(condition)
 
-# Medical conditions - expanded list
-VALID_CONDITIONS = {
-    # Depression
-    "depression", "major depressive disorder", "major depression", "treatment-resistant depression",
-    "persistent depressive disorder", "dysthymia", "depressive disorder",
-    
-    # Anxiety
-    "anxiety", "generalized anxiety disorder", "gad", "panic disorder", "social anxiety",
-    "social anxiety disorder", "phobia", "anxiety disorder", "separation anxiety",
-    
-    # Trauma
-    "ptsd", "post-traumatic stress disorder", "trauma", "acute stress disorder",
-    
-    # Psychotic
-    "bipolar disorder", "bipolar i", "bipolar ii", "bipolar disorder i", "bipolar disorder ii",
-    "schizophrenia", "schizoaffective disorder", "psychosis", "brief psychotic disorder",
-    
-    # Neurodevelopmental
-    "adhd", "attention deficit hyperactivity disorder", "autism spectrum disorder", "asd",
-    "autism", "add", "attention deficit disorder",
-    
-    # Obsessive
-    "obsessive compulsive disorder", "ocd", "body dysmorphic disorder", "bdd",
-    
-    # Eating
-    "eating disorders", "anorexia", "anorexia nervosa", "bulimia", "bulimia nervosa",
-    "binge eating disorder", "bing eating",
-    
-    # Substance
-    "substance use disorder", "alcohol use disorder", "opioid use disorder", "drug abuse",
-    "substance abuse", "addiction",
-    
-    # Sleep
-    "insomnia", "sleep disorder", "narcolepsy", "sleep apnea",
-    
-    # Other
-    "adjustment disorder", "oppositional defiant disorder", "odd", "conduct disorder",
-    "personality disorder", "borderline personality disorder", "bpd", "antisocial personality disorder",
-}
+# Vocabularies come from configs/vocabulary.yaml and configs/relations.yaml
+# (src/core/vocabulary.py). Ordered tuples keep "first match" results and
+# messages deterministic; frozen sets are for membership checks.
+VOCAB = get_vocabulary()
+VALID_CONDITIONS: FrozenSet[str] = VOCAB.condition_set
+CONDITION_EXCLUSION_WORDS = VOCAB.condition_exclusion_words
+DRUG_NAME_PATTERNS = VOCAB.drug_names
+VALID_RELATIONS: FrozenSet[str] = VOCAB.relation_set
+COMMON_SIDE_EFFECTS = VOCAB.side_effects
+INVALID_SIDE_EFFECTS = VOCAB.invalid_side_effects
 
-# Words that indicate this is NOT a medical condition
-CONDITION_EXCLUSION_WORDS = {
-    "treatment", "therapy", "medication", "drug", "intervention", "approach",
-    "method", "technique", "procedure", "protocol", "regimen", "strategy",
-    "care", "management", "typical medical treatment", "standard care",
-    "placebo", "control", "baseline", "comparison", "comparator"
-}
+REQUIRED_FIELDS = ["drug_name", "condition_name", "relation", "span", "confidence"]
 
-# Valid drug/treatment patterns
-DRUG_NAME_PATTERNS = {
-    # SSRIs
-    "sertraline", "fluoxetine", "paroxetine", "escitalopram", "citalopram", "fluvoxamine",
-    # SNRIs  
-    "venlafaxine", "duloxetine", "desvenlafaxine", "levomilnacipran",
-    # Atypicals
-    "bupropion", "mirtazapine", "trazodone", "nefazodone",
-    # MAOIs
-    "phenelzine", "tranylcypromine", "isocarboxazid", "selegiline",
-    # Tricyclics
-    "amitriptyline", "imipramine", "nortriptyline", "desipramine",
-    # Anxiolytics
-    "buspirone", "hydroxyzine", "propranolol",
-    # Mood Stabilizers
-    "lamottal", "lamotrigine", "valproate", "lithium", "divalproex",
-    # Antipsychotics
-    "clozapine", "risperidone", "olanzapine", "quetiapine", "aripiprazole", "haloperidol",
-    # Drug classes
-    "ssri", "ssris", "selective serotonin reuptake inhibitor", "snri", "snris",
-    "tricyclic", "tricyclics", "maoi", "maois", "antidepressant", "antidepressants",
-    # Non-drug treatments
-    "cbt", "cognitive behavioral therapy", "psychotherapy", "ect", "tms", "vns",
-    "mindfulness", "meditation", "exercise"
-}
+# Placeholder / generic drug names (facts must name a specific treatment)
+PLACEHOLDER_DRUG_NAMES = VOCAB.placeholder_drug_names
+GENERIC_DRUG_TERMS = VOCAB.generic_drug_terms
 
-# Valid relations
-VALID_RELATIONS: Set[str] = {
-    # Core treatment
-    "TREATS", "IMPROVES", 
-    
-    # NEW: Treatment context
-    "FIRST_LINE_FOR", "MAINTENANCE_FOR",
-    
-    # NEW: Efficacy
-    "PREVENTS_RELAPSE_IN",
-    
-    # Safety
-    "ASSOCIATED_WITH_SE", "CONTRAINDICATED_FOR",
-    
-    # NEW: Tolerability
-    "WELL_TOLERATED_IN",
-    
-    # Combination
-    "AUGMENTS",
-    
-    # Comparative
-    "SUPERIOR_TO", "EQUIVALENT_TO", "INFERIOR_TO",
-    
-    # NEW: Subgroup
-    "EFFECTIVE_IN_SUBGROUP",
-}
+# Isolated symptoms and outcomes are not conditions
+ISOLATED_SYMPTOMS = VOCAB.isolated_symptoms
+OUTCOME_INDICATORS = VOCAB.outcome_indicators
 
-# Side effects vocabulary - ONLY specific medical side effects
-COMMON_SIDE_EFFECTS = {
-    "nausea", "headache", "dizziness", "fatigue", "insomnia", "somnolence",
-    "dry mouth", "constipation", "diarrhea", "sexual dysfunction", "weight gain",
-    "weight loss", "tremor", "sweating", "blurred vision", "anxiety", "agitation",
-    "akathisia", "restlessness", "sedation", "drowsiness", "tachycardia", "palpitations",
-    "hypertension", "hypotension", "nausea and vomiting", "loss of appetite", "increased appetite",
-    "insomnia and anxiety", "sleep disturbance", "vivid dreams", "nightmares",
-    "sexual dysfunction and decreased libido", "erectile dysfunction", "decreased libido",
-    "discontinuation syndrome", "withdrawal symptoms", "serotonin syndrome",
-    "hyponatremia", "liver enzyme elevation", "qc prolongation", "torsades de pointes"
-}
+# -----------------------------
+# Compiled lexicons
+# -----------------------------
+_DRUG_MATCHER = VOCAB.drug_matcher
+_OUTCOME_MATCHER = VOCAB.outcome_matcher
+_EXCLUSION_MATCHER = VOCAB.exclusion_matcher
+_CONDITION_LIST = VOCAB.conditions
+_CONDITION_IN_NAME = VOCAB.condition_in_name
+_NAME_IN_CONDITION = VOCAB.name_in_condition
+LEXICON_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=LEXICON_CACHE_SIZE)
+def is_known_drug(drug_name: str) -> bool:
+    """Any DRUG_NAME_PATTERNS entry occurs in ``drug_name``."""
+    return _DRUG_MATCHER.contains_any(drug_name)
+
+
+@lru_cache(maxsize=LEXICON_CACHE_SIZE)
+def condition_exclusion_word(condition_name: str) -> Optional[str]:
+    """First CONDITION_EXCLUSION_WORDS entry occurring in ``condition_name``."""
+    return _EXCLUSION_MATCHER.first_match(condition_name)
 
-# Invalid side effects - metadata/outcomes not actual side effects
-INVALID_SIDE_EFFECTS = {
-    "side effect frequency", "adverse event", "adverse events",
-    "side effects", "adverse effect", "adverse effects",
-    "effect", "outcome", "symptom", "symptoms",
-    "placebo", "response", "remission", "improvement",
-    "efficacy", "benefit", "harm", "adverse"
+
+@lru_cache(maxsize=LEXICON_CACHE_SIZE)
+def condition_partial_match(condition_name: str) -> Optional[str]:
+    """First VALID_CONDITIONS entry that contains or is contained in ``condition_name``."""
+    ranks = [r for r in (_CONDITION_IN_NAME.first_rank(condition_name),
+                         _NAME_IN_CONDITION.first_rank(condition_name)) if r >= 0]
+    return _CONDITION_LIST[min(ranks)] if ranks else None
+
+# -----------------------------
+# Issue templates
+# -----------------------------
+# Messages are rendered from these when issues are read (see src/core/issue_log.py);
+# rules only record the template arguments.
+_ANY_CONFIDENCE = "Confidence must be a number between 0.0 and 1.0"
+ISSUE_TEMPLATES: Dict[str, IssueTemplate] = {
+    "missing_required_field": IssueTemplate("error", "", "Required field '{0}' is missing or empty",
+                                            "Ensure {0} has a valid value"),
+    "placeholder_drug_name": IssueTemplate("error", "drug_name", "Drug name is placeholder: {0}",
+                                           "Facts must have specific drug/treatment names. Skip facts without identifiable treatments."),
+    "generic_drug_name": IssueTemplate("error", "drug_name", "Drug name too generic: {0}",
+                                       "Use specific drug/treatment names (e.g., 'sertraline' not 'medication')"),
+    "drug_name_too_long": IssueTemplate("warning", "drug_name", "Drug name unusually long ({0} chars): {1}...",
+                                        "Check if this extracted the full sentence instead of just the drug name"),
+    "unknown_drug": IssueTemplate("info", "drug_name", "Drug name not in known list: {0}",
+                                  "Verify this is a valid medication or treatment"),
+    "outcome_as_condition": IssueTemplate("error", "condition_name", "Condition is actually an outcome: {0}",
+                                          "Use the underlying medical condition (e.g., 'major depressive disorder'), not treatment outcome"),
+    "symptom_as_condition": IssueTemplate("error", "condition_name", "Condition is just a symptom: {0}",
+                                          "Use the underlying disorder (e.g., 'major depressive disorder', 'generalized anxiety disorder')"),
+    "invalid_condition_name": IssueTemplate("error", "condition_name", "Condition name contains treatment word '{0}': {1}",
+                                            "This should be a medical condition, not a treatment. Check the extraction logic."),
+    "condition_name_variant": IssueTemplate("info", "condition_name", "Condition name variant: {0}",
+                                            "Consider normalizing to: {1}"),
+    "unknown_condition": IssueTemplate("info", "condition_name", "Condition '{0}' not in known list (but may be valid)",
+                                       "Verify this is a real medical condition"),
+    "invalid_relation": IssueTemplate("error", "relation", "Invalid relation type: {0}",
+                                      f"Use one of: {', '.join(VOCAB.relations)}"),
+    "missing_confidence": IssueTemplate("error", "confidence", "Confidence score is missing", _ANY_CONFIDENCE),
+    "invalid_confidence_range": IssueTemplate("error", "confidence", "Confidence {0} outside valid range [0.0, 1.0]",
+                                              "Confidence must be between 0.0 and 1.0"),
+    "invalid_confidence_type": IssueTemplate("error", "confidence", "Confidence must be numeric, got: {0}", _ANY_CONFIDENCE),
+    "drug_not_in_span": IssueTemplate("warning", "span", "Drug name '{0}' not found in supporting text",
+                                      "Check if extraction correctly identified the drug mentioned in the span"),
+    "condition_not_in_span": IssueTemplate("info", "span", "Condition '{0}' not clearly mentioned in span (may be contextual)",
+                                           "Verify the span context supports the extracted condition"),
+    "invalid_side_effects_type": IssueTemplate("warning", "side_effects", "Side effects should be a list",
+                                               "Convert to list format: ['nausea', 'headache']"),
+    "unknown_side_effect": IssueTemplate("info", "side_effects", "Unknown side effect: {0}",
+                                         "Verify this is a valid medical side effect"),
+    "vague_effect_size": IssueTemplate("info", "effect_size", "Effect size lacks quantitative data: {0}",
+                                       "Include specific numbers, percentages, or statistical measures when available"),
+    "drug_not_in_span_strict": IssueTemplate("error", "drug_name", "Drug '{0}' not found in span. Span may mention drug class instead.",
+                                             "Only extract specific drugs if explicitly mentioned. If span says 'TCAs', extract 'TCAs' not 'imipramine'."),
+    "wrong_comparison_direction": IssueTemplate("error", "relation", "Span contains '{0}' but relation is {1} (should be {2})",
+                                                "Reverse comparison direction: change {1} to {3}"),
+    "missing_equivalence_language": IssueTemplate("warning", "relation", "Span doesn't clearly indicate equivalence for EQUIVALENT_TO relation",
+                                                  "Verify span supports equivalence claim"),
+    "incomplete_span": IssueTemplate("error", "span", "Span starts with pronoun '{0}...' without clear referent",
+                                     "Include the previous sentence to provide context for the pronoun"),
+    "very_short_span": IssueTemplate("warning", "span", "Very short span ({0} chars): '{1}'",
+                                     "Consider including more context"),
+    "span_not_in_source": IssueTemplate("error", "span", "Span not found in source document '{0}'",
+                                        "The span may be hallucinated; quote the supporting text verbatim"),
+    "span_partial_in_source": IssueTemplate("warning", "span", "Span only partly matches source document '{0}' (score {1})",
+                                            "Check the span was quoted, not paraphrased"),
 }
+# Fuzzy span matches scoring at least this count as present (near-exact)
+SPAN_NEAR_EXACT_SCORE = 0.9
+
+# -----------------------------
+# Rule registry
+# -----------------------------
+# FactValidator methods register as rules with a cost tier. Rules run in definition
+# order; one returning False rejects the fact, others only record issues. Tiers are
+# cumulative and ordered by cost: "core" is the default rule set, "extended" adds
+# the stricter span/comparison checks, "expensive" the checks against the parsed
+# source document.
+RULE_TIERS = ("core", "extended", "expensive")
+DEFAULT_RULE_TIER = "core"
+
+@dataclass(frozen=True)
+class RuleSpec:
+    name: str
+    tier: str
+    func: Callable[..., Optional[bool]]
+    uses_sources: bool = False  # reads parsed source documents (their identity joins the cache key)
+
+VALIDATION_RULES: Dict[str, RuleSpec] = {}
+
+def validation_rule(tier: str = DEFAULT_RULE_TIER, uses_sources: bool = False):
+    """Register a ``FactValidator._validate_*`` method as a rule of ``tier``."""
+    if tier not in RULE_TIERS:
+        raise ValueError(f"Unknown rule tier '{tier}' (use one of: {', '.join(RULE_TIERS)})")
+    def register(func):
+        name = func.__name__.removeprefix("_validate_")
+        VALIDATION_RULES[name] = RuleSpec(name, tier, func, uses_sources)
+        return func
+    return register
+
+def select_rules(tier: str = DEFAULT_RULE_TIER, extra_rules: Sequence[str] = ()) -> List[RuleSpec]:
+    """Rules of ``tier`` and all cheaper tiers, plus ``extra_rules`` by name (definition order)."""
+    if tier not in RULE_TIERS:
+        raise ValueError(f"Unknown rule tier '{tier}' (use one of: {', '.join(RULE_TIERS)})")
+    unknown = [name for name in extra_rules if name not in VALIDATION_RULES]
+    if unknown:
+        raise ValueError(f"Unknown validation rule(s): {', '.join(unknown)} (use: {', '.join(VALIDATION_RULES)})")
+    tiers = RULE_TIERS[:RULE_TIERS.index(tier) + 1]
+    return [spec for spec in VALIDATION_RULES.values() if spec.tier in tiers or spec.name in extra_rules]
+
+def rule_set_label(tier: str = DEFAULT_RULE_TIER, extra_rules: Sequence[str] = ()) -> str:
+    """``"core"`` or ``"core+comparison_logic"``: the tier plus rules enabled beyond it."""
+    tiers = RULE_TIERS[:RULE_TIERS.index(tier) + 1]
+    extras = sorted({name for name in extra_rules if VALIDATION_RULES[name].tier not in tiers})
+    return "+".join([tier, *extras])
+
+@dataclass
+class RuleStats:
+    """Instrumentation counters of one rule."""
+    tier: str
+    calls: int = 0
+    seconds: float = 0.0
+    rejections: int = 0
+    issues: int = 0
+
+    def merge(self, other: "RuleStats") -> None:
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.rejections += other.rejections
+        self.issues += other.issues
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tier": self.tier,
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "us_per_call": round(self.seconds / self.calls * 1e6, 2) if self.calls else 0.0,
+            "rejections": self.rejections,
+            "rejection_rate": round(self.rejections / self.calls, 4) if self.calls else 0.0,
+            "issues": self.issues,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RuleStats":
+        return cls(data["tier"], data["calls"], data["seconds"], data["rejections"], data["issues"])
+
+def merge_rule_stats(parts: Iterable[Optional[Dict[str, Dict[str, Any]]]]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Sum per-rule stats of several runs (e.g. corpus shards); None if none were instrumented."""
+    merged: Dict[str, RuleStats] = {}
+    for part in parts:
+        for name, data in (part or {}).items():
+            stats = RuleStats.from_dict(data)
+            if name in merged:
+                merged[name].merge(stats)
+            else:
+                merged[name] = stats
+    return {name: stats.to_dict() for name, stats in merged.items()} or None
 
 # -----------------------------
 # Validation Functions
@@ -210,56 +284,73 @@ INVALID_SIDE_EFFECTS = {
 class FactValidator:
     """Validates extracted clinical facts using rules and heuristics."""
     
-    def __init__(self):
-        self.issues: List[ValidationIssue] = []
+    def __init__(
+        self,
+        rule_tier: str = DEFAULT_RULE_TIER,
+        extra_rules: Sequence[str] = (),
+        instrument: bool = False,
+        parsed: Optional[Path | str] = None,
+    ):
+        self.issues = IssueLog(ISSUE_TEMPLATES)
+        self.rules = select_rules(rule_tier, extra_rules)
+        # Parsed source documents (one file, or a directory of {source_id}_parsed.json)
+        self.sources = SourceIndexes(parsed or DEFAULT_PARSED_DIR)
+        self.uses_sources = any(spec.uses_sources for spec in self.rules)
+        self._checks = tuple(spec.func.__get__(self) for spec in self.rules)  # bound once, not per fact
+        self.rule_tier = rule_set_label(rule_tier, extra_rules)
+        self.rule_stats: Optional[Dict[str, RuleStats]] = (
+            {spec.name: RuleStats(spec.tier) for spec in self.rules} if instrument else None
+        )
     
     def validate_fact(self, fact: Dict[str, Any], index: int) -> bool:
         """Validate a single fact. Returns True if valid, False if invalid."""
+        if self.rule_stats is not None:
+            return self._validate_fact_instrumented(fact, index)
         is_valid = True
-        
-        # Required field validation
-        if not self._validate_required_fields(fact, index):
-            is_valid = False
-            
-        # Content validation
-        if not self._validate_drug_name(fact, index):
-            is_valid = False
-            
-        if not self._validate_condition_name(fact, index):
-            is_valid = False
-            
-        if not self._validate_relation(fact, index):
-            is_valid = False
-            
-        if not self._validate_confidence(fact, index):
-            is_valid = False
-            
-        # Consistency validation
-        self._validate_span_consistency(fact, index)
-        self._validate_side_effects(fact, index)
-        self._validate_effect_size_format(fact, index)
-        
+        for check in self._checks:
+            if check(fact, index) is False:
+                is_valid = False
+        return is_valid
+    
+    def _validate_fact_instrumented(self, fact: Dict[str, Any], index: int) -> bool:
+        is_valid = True
+        for spec in self.rules:
+            stats = self.rule_stats[spec.name]
+            issues_before = len(self.issues)
+            start = time.perf_counter()
+            result = spec.func(self, fact, index)
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            stats.issues += len(self.issues) - issues_before
+            if result is False:
+                stats.rejections += 1
+                is_valid = False
         return is_valid
     
+    def cache_scope(self, fact: Dict[str, Any]) -> str:
+        """Cache-key suffix: the source document's fingerprint when source-backed rules run."""
+        if not self.uses_sources:
+            return ""
+        return ":" + self.sources.fingerprint(str(fact.get("source_id") or ""))
+    
+    def rule_stats_dict(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        if self.rule_stats is None:
+            return None
+        return {name: stats.to_dict() for name, stats in self.rule_stats.items()}
+    
+    @validation_rule("core")
     def _validate_required_fields(self, fact: Dict[str, Any], index: int) -> bool:
         """Check that all required fields are present and non-empty."""
-        required_fields = ["drug_name", "condition_name", "relation", "span", "confidence"]
         is_valid = True
         
-        for field in required_fields:
+        for field in REQUIRED_FIELDS:
             if field not in fact or not fact[field] or str(fact[field]).strip() == "":
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="missing_required_field",
-                    severity="error",
-                    field=field,
-                    message=f"Required field '{field}' is missing or empty",
-                    suggestion=f"Ensure {field} has a valid value"
-                ))
+                self.issues.add(index, "missing_required_field", field, field=field)
                 is_valid = False
         
         return is_valid
     
+    @validation_rule("core")
     def _validate_drug_name(self, fact: Dict[str, Any], index: int) -> bool:
         """Validate drug name field with stricter rules."""
         drug_name = str(fact.get("drug_name", "")).lower().strip()
@@ -268,59 +359,26 @@ class FactValidator:
             return False  # Already caught by required fields
         
         # Reject placeholder/missing drug names (NEW - STRICT)
-        placeholder_values = ["n/a", "na", "none", "unknown", "not specified", "not available"]
-        if drug_name in placeholder_values:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="placeholder_drug_name",
-                severity="error",
-                field="drug_name",
-                message=f"Drug name is placeholder: {drug_name}",
-                suggestion="Facts must have specific drug/treatment names. Skip facts without identifiable treatments."
-            ))
+        if drug_name in PLACEHOLDER_DRUG_NAMES:
+            self.issues.add(index, "placeholder_drug_name", drug_name)
             return False
         
         # Reject generic/vague treatment terms (NEW - STRICT)
-        generic_terms = [
-            "switching options", "augmentation options", "treatment options",
-            "medication", "medications", "therapy", "therapies", "intervention",
-            "treatment", "treatments", "drug", "drugs", "antidepressant options"
-        ]
-        if drug_name in generic_terms:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="generic_drug_name",
-                severity="error",
-                field="drug_name",
-                message=f"Drug name too generic: {drug_name}",
-                suggestion="Use specific drug/treatment names (e.g., 'sertraline' not 'medication')"
-            ))
+        if drug_name in GENERIC_DRUG_TERMS:
+            self.issues.add(index, "generic_drug_name", drug_name)
             return False
             
         # Check for overly long drug names (likely extraction errors)
         if len(drug_name) > 100:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="drug_name_too_long",
-                severity="warning",
-                field="drug_name",
-                message=f"Drug name unusually long ({len(drug_name)} chars): {drug_name[:50]}...",
-                suggestion="Check if this extracted the full sentence instead of just the drug name"
-            ))
+            self.issues.add(index, "drug_name_too_long", len(drug_name), drug_name[:50])
         
         # Check if it's a known drug/treatment
-        if not any(pattern in drug_name for pattern in DRUG_NAME_PATTERNS):
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="unknown_drug",
-                severity="info",
-                field="drug_name",
-                message=f"Drug name not in known list: {drug_name}",
-                suggestion="Verify this is a valid medication or treatment"
-            ))
+        if not is_known_drug(drug_name):
+            self.issues.add(index, "unknown_drug", drug_name)
         
         return True
     
+    @validation_rule("core")
     def _validate_condition_name(self, fact: Dict[str, Any], index: int) -> bool:
         """Validate condition name - this catches the main error from your example."""
         condition_name = str(fact.get("condition_name", "")).lower().strip()
@@ -329,135 +387,65 @@ class FactValidator:
             return False  # Already caught by required fields
         
         # Reject outcome-type "conditions" (NEW - STRICT)
-        outcome_indicators = [
-            "remission", "response", "improvement", "outcome", "result", 
-            "change", "reduction", "recovery", "symptom remission"
-        ]
-        if any(indicator in condition_name for indicator in outcome_indicators):
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="outcome_as_condition",
-                severity="error",
-                field="condition_name",
-                message=f"Condition is actually an outcome: {condition_name}",
-                suggestion="Use the underlying medical condition (e.g., 'major depressive disorder'), not treatment outcome"
-            ))
+        if _OUTCOME_MATCHER.contains_any(condition_name):
+            self.issues.add(index, "outcome_as_condition", condition_name)
             return False
         
         # Reject isolated symptoms as "conditions" (NEW - STRICT)
-        isolated_symptoms = [
-            "insomnia", "nervousness", "agitation", "physical symptoms",
-            "insomnia and nervousness", "insomnia and agitation",
-            "fatigue", "headache", "nausea", "dizziness", "pain",
-            "anxiety symptoms", "depressive symptoms"
-        ]
-        if condition_name in isolated_symptoms:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="symptom_as_condition",
-                severity="error",
-                field="condition_name",
-                message=f"Condition is just a symptom: {condition_name}",
-                suggestion="Use the underlying disorder (e.g., 'major depressive disorder', 'generalized anxiety disorder')"
-            ))
+        if condition_name in ISOLATED_SYMPTOMS:
+            self.issues.add(index, "symptom_as_condition", condition_name)
             return False
         
         # Check for treatment words in condition name (major error pattern)
-        for exclusion_word in CONDITION_EXCLUSION_WORDS:
-            if exclusion_word in condition_name:
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="invalid_condition_name",
-                    severity="error",
-                    field="condition_name",
-                    message=f"Condition name contains treatment word '{exclusion_word}': {condition_name}",
-                    suggestion="This should be a medical condition, not a treatment. Check the extraction logic."
-                ))
-                return False
+        exclusion_word = condition_exclusion_word(condition_name)
+        if exclusion_word is not None:
+            self.issues.add(index, "invalid_condition_name", exclusion_word, condition_name)
+            return False
         
         # Check if it's a known condition (now just a warning, not an error)
         if condition_name not in VALID_CONDITIONS:
             # Check for partial matches
-            partial_matches = [cond for cond in VALID_CONDITIONS if cond in condition_name or condition_name in cond]
-            if partial_matches:
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="condition_name_variant",
-                    severity="info",
-                    field="condition_name",
-                    message=f"Condition name variant: {condition_name}",
-                    suggestion=f"Consider normalizing to: {partial_matches[0]}"
-                ))
+            partial_match = condition_partial_match(condition_name)
+            if partial_match:
+                self.issues.add(index, "condition_name_variant", condition_name, partial_match)
             else:
                 # Changed from error to info - allow unknown conditions
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="unknown_condition",
-                    severity="info",  # Changed from error to info
-                    field="condition_name",
-                    message=f"Condition '{condition_name}' not in known list (but may be valid)",
-                    suggestion="Verify this is a real medical condition"
-                ))
+                self.issues.add(index, "unknown_condition", condition_name)
         
         return True
     
+    @validation_rule("core")
     def _validate_relation(self, fact: Dict[str, Any], index: int) -> bool:
         """Validate relation type."""
         relation = str(fact.get("relation", "")).upper().strip()
         
         if relation not in VALID_RELATIONS:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="invalid_relation",
-                severity="error",
-                field="relation",
-                message=f"Invalid relation type: {relation}",
-                suggestion=f"Use one of: {', '.join(VALID_RELATIONS)}"
-            ))
+            self.issues.add(index, "invalid_relation", relation)
             return False
         
         return True
     
+    @validation_rule("core")
     def _validate_confidence(self, fact: Dict[str, Any], index: int) -> bool:
         """Validate confidence score."""
         confidence = fact.get("confidence")
         
         if confidence is None:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="missing_confidence",
-                severity="error",
-                field="confidence",
-                message="Confidence score is missing",
-                suggestion="Confidence must be a number between 0.0 and 1.0"
-            ))
+            self.issues.add(index, "missing_confidence")
             return False
         
         try:
             conf_float = float(confidence)
             if not (0.0 <= conf_float <= 1.0):
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="invalid_confidence_range",
-                    severity="error",
-                    field="confidence",
-                    message=f"Confidence {conf_float} outside valid range [0.0, 1.0]",
-                    suggestion="Confidence must be between 0.0 and 1.0"
-                ))
+                self.issues.add(index, "invalid_confidence_range", conf_float)
                 return False
         except (ValueError, TypeError):
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="invalid_confidence_type",
-                severity="error",
-                field="confidence",
-                message=f"Confidence must be numeric, got: {type(confidence).__name__}",
-                suggestion="Confidence must be a number between 0.0 and 1.0"
-            ))
+            self.issues.add(index, "invalid_confidence_type", type(confidence).__name__)
             return False
         
         return True
     
+    @validation_rule("core")
     def _validate_span_consistency(self, fact: Dict[str, Any], index: int):
         """Check if the span actually supports the extracted fact (lenient warnings only)."""
         span = str(fact.get("span", "")).lower()
@@ -469,56 +457,30 @@ class FactValidator:
             # Check for partial matches or abbreviations
             drug_words = drug_name.split()
             if not any(word in span for word in drug_words if len(word) > 2):
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="drug_not_in_span",
-                    severity="warning",  # Kept as warning (informational)
-                    field="span",
-                    message=f"Drug name '{drug_name}' not found in supporting text",
-                    suggestion="Check if extraction correctly identified the drug mentioned in the span"
-                ))
+                self.issues.add(index, "drug_not_in_span", drug_name)
         
         # Check if condition appears in span (lenient - just info level)
         if condition_name and len(condition_name) > 3:
             condition_words = condition_name.split()
             # More lenient: just check if any significant word is present
             if not any(word in span for word in condition_words if len(word) > 3):
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="condition_not_in_span",
-                    severity="info",  # Info level - not blocking
-                    field="span",
-                    message=f"Condition '{condition_name}' not clearly mentioned in span (may be contextual)",
-                    suggestion="Verify the span context supports the extracted condition"
-                ))
+                self.issues.add(index, "condition_not_in_span", condition_name)
     
+    @validation_rule("core")
     def _validate_side_effects(self, fact: Dict[str, Any], index: int):
         """Validate side effects list."""
         side_effects = fact.get("side_effects", [])
         
         if not isinstance(side_effects, list):
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="invalid_side_effects_type",
-                severity="warning",
-                field="side_effects",
-                message="Side effects should be a list",
-                suggestion="Convert to list format: ['nausea', 'headache']"
-            ))
+            self.issues.add(index, "invalid_side_effects_type")
             return
         
         for se in side_effects:
             se_lower = str(se).lower().strip()
             if se_lower not in COMMON_SIDE_EFFECTS:
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="unknown_side_effect",
-                    severity="info",
-                    field="side_effects",
-                    message=f"Unknown side effect: {se}",
-                    suggestion="Verify this is a valid medical side effect"
-                ))
+                self.issues.add(index, "unknown_side_effect", se)
     
+    @validation_rule("core")
     def _validate_effect_size_format(self, fact: Dict[str, Any], index: int):
         """Check effect size format."""
         effect_size = fact.get("effect_size")
@@ -532,15 +494,9 @@ class FactValidator:
             has_stats = any(word in effect_str for word in ['cohen', 'nnt', 'odds ratio', 'hazard ratio'])
             
             if not (has_number or has_stats):
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="vague_effect_size",
-                    severity="info",
-                    field="effect_size",
-                    message=f"Effect size lacks quantitative data: {effect_size}",
-                    suggestion="Include specific numbers, percentages, or statistical measures when available"
-                ))
+                self.issues.add(index, "vague_effect_size", effect_size)
     
+    @validation_rule("extended")
     def _validate_drug_in_span_strict(self, fact: Dict[str, Any], index: int) -> bool:
         """
         STRICT check: Drug name MUST appear in span.
@@ -558,18 +514,12 @@ class FactValidator:
         
         # At least ONE significant drug word must appear in span
         if drug_words and not any(word in span for word in drug_words):
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="drug_not_in_span_strict",
-                severity="error",  # Changed from warning to ERROR
-                field="drug_name",
-                message=f"Drug '{drug_name}' not found in span. Span may mention drug class instead.",
-                suggestion="Only extract specific drugs if explicitly mentioned. If span says 'TCAs', extract 'TCAs' not 'imipramine'."
-            ))
+            self.issues.add(index, "drug_not_in_span_strict", drug_name)
             return False
         
         return True
     
+    @validation_rule("extended")
     def _validate_comparison_logic(self, fact: Dict[str, Any], index: int) -> bool:
         """
         Check if comparative relations (SUPERIOR_TO, INFERIOR_TO) match the span text.
@@ -590,14 +540,7 @@ class FactValidator:
             
             for indicator in negative_indicators:
                 if indicator in span:
-                    self.issues.append(ValidationIssue(
-                        fact_index=index,
-                        issue_type="wrong_comparison_direction",
-                        severity="error",
-                        field="relation",
-                        message=f"Span contains '{indicator}' but relation is SUPERIOR_TO (should be INFERIOR_TO or EQUIVALENT_TO)",
-                        suggestion="Reverse comparison direction: change SUPERIOR_TO to INFERIOR_TO"
-                    ))
+                    self.issues.add(index, "wrong_comparison_direction", indicator, "SUPERIOR_TO", "INFERIOR_TO or EQUIVALENT_TO", "INFERIOR_TO")
                     return False
         
         # INFERIOR_TO should have negative language
@@ -609,14 +552,7 @@ class FactValidator:
             
             for indicator in positive_indicators:
                 if indicator in span:
-                    self.issues.append(ValidationIssue(
-                        fact_index=index,
-                        issue_type="wrong_comparison_direction",
-                        severity="error",
-                        field="relation",
-                        message=f"Span contains '{indicator}' but relation is INFERIOR_TO (should be SUPERIOR_TO)",
-                        suggestion="Reverse comparison direction: change INFERIOR_TO to SUPERIOR_TO"
-                    ))
+                    self.issues.add(index, "wrong_comparison_direction", indicator, "INFERIOR_TO", "SUPERIOR_TO", "SUPERIOR_TO")
                     return False
         
         # EQUIVALENT_TO should have equivalence language
@@ -628,17 +564,11 @@ class FactValidator:
             
             # Must have at least one equivalence indicator
             if not any(indicator in span for indicator in equivalence_indicators):
-                self.issues.append(ValidationIssue(
-                    fact_index=index,
-                    issue_type="missing_equivalence_language",
-                    severity="warning",
-                    field="relation",
-                    message="Span doesn't clearly indicate equivalence for EQUIVALENT_TO relation",
-                    suggestion="Verify span supports equivalence claim"
-                ))
+                self.issues.add(index, "missing_equivalence_language")
         
         return True
     
+    @validation_rule("extended")
     def _validate_span_completeness(self, fact: Dict[str, Any], index: int) -> bool:
         """
         Check if span has pronouns at the start without context.
@@ -652,43 +582,138 @@ class FactValidator:
         # Check for pronouns at the start (likely missing context)
         pronoun_pattern = r'^(it|this|that|these|they|those|which)\s'
         if re.match(pronoun_pattern, span, re.IGNORECASE):
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="incomplete_span",
-                severity="error",  # Changed from warning to ERROR
-                field="span",
-                message=f"Span starts with pronoun '{span[:20]}...' without clear referent",
-                suggestion="Include the previous sentence to provide context for the pronoun"
-            ))
+            self.issues.add(index, "incomplete_span", span[:20])
             return False
         
         # Check if span is suspiciously short (likely missing context)
         if len(span) < 25:
-            self.issues.append(ValidationIssue(
-                fact_index=index,
-                issue_type="very_short_span",
-                severity="warning",
-                field="span",
-                message=f"Very short span ({len(span)} chars): '{span}'",
-                suggestion="Consider including more context"
-            ))
+            self.issues.add(index, "very_short_span", len(span), span)
         
         return True
+    
+    @validation_rule("expensive", uses_sources=True)
+    def _validate_span_in_source(self, fact: Dict[str, Any], index: int) -> bool:
+        """
+        Check the span occurs (exactly or near-exactly) in the parsed source document.
+        Uses the document's n-gram SpanIndex, so each lookup costs ~O(span length).
+        """
+        span = str(fact.get('span', '')).strip()
+        source_id = str(fact.get('source_id') or '')
+        if not span:
+            return True  # Already caught by required fields
+        
+        source = self.sources.get(source_id)
+        if source is None:
+            return True  # No parsed document to check against (warned once)
+        
+        match = source.resolve(span)
+        if match.match_type == "exact" or match.score >= SPAN_NEAR_EXACT_SCORE:
+            return True
+        if match.match_type == "fuzzy":
+            self.issues.add(index, "span_partial_in_source", source_id, f"{match.score:.2f}")
+            return True
+        self.issues.add(index, "span_not_in_source", source_id)
+        return False
+
+# -----------------------------
+# Validation cache
+# -----------------------------
+# Per-fact verdicts (valid flag + unrendered issues) are keyed by the fact's content
+# hash and RULES_VERSION. Editing this module, the modules its verdicts depend on
+# (lexicon matching, vocabulary compilation, span-in-source scoring) or the vocabulary
+# configs changes the version, so verdicts from other rule sets are never reused.
+RULES_MODULES = ("validate.py", "lexicon_matcher.py", "vocabulary.py", "span_index.py")
+RULES_VERSION = hashlib.sha256(
+    b"".join((Path(__file__).parent / name).read_bytes() for name in RULES_MODULES)
+    + VOCAB.config_hash.encode("utf-8")
+).hexdigest()[:12]
+
+def fact_hash(fact: Dict[str, Any]) -> str:
+    """Content hash of a fact.
+
+    Hashes the pickled fact rather than canonical JSON (``make_key``), which costs
+    about as much as validating the fact. Pickle bytes follow key order, so the
+    same fact with reordered keys is only a cache miss, never a wrong hit.
+    """
+    return hashlib.blake2b(pickle.dumps(fact, protocol=5), digest_size=16).hexdigest()
+
+def validation_cache(use_cache: Optional[bool] = None, expensive: bool = False) -> Optional[CacheStore]:
+    """Verdict cache from ``validation.cache`` in configs/app.yaml; ``use_cache`` overrides ``enabled``.
+
+    ``enabled: auto`` (the default) only opens the cache for rule sets with
+    ``expensive``-tier rules: hashing a fact costs about as much as the core rules,
+    so caching their verdicts makes cold runs slower and warm runs no faster.
+    """
+    cache_cfg = get_setting("validation.cache", {})
+    enabled = cache_cfg.get("enabled", "auto") if use_cache is None else use_cache
+    if enabled == "auto":
+        enabled = expensive
+    if not enabled:
+        return None
+    return CacheStore(cache_cfg.get("path", "data/cache/validation.sqlite"), namespace="validation")
+
+def _validate_cached(validator: FactValidator, facts: List[Dict[str, Any]], store: CacheStore) -> List[bool]:
+    """Validity flags for ``facts``, replaying cached verdicts into ``validator.issues``."""
+    prefix = f"{RULES_VERSION}:{validator.rule_tier}:"
+    keys = [prefix + fact_hash(fact) + validator.cache_scope(fact) for fact in facts]
+    cached = store.get_many(keys)
+    fresh: Dict[str, Any] = {}
+    flags = []
+    for i, (fact, key) in enumerate(zip(facts, keys)):
+        verdict = cached.get(key) or fresh.get(key)
+        if verdict is not None:
+            validator.issues.add_entries(i, verdict["issues"])
+            flags.append(verdict["valid"])
+            continue
+        start = len(validator.issues)
+        is_valid = validator.validate_fact(fact, i)
+        fresh[key] = {"valid": is_valid, "issues": validator.issues.entries(start)}
+        flags.append(is_valid)
+    store.set_many(fresh)
+    if cached:
+        print(f"♻️  Reused {sum(1 for k in keys if k in cached)}/{len(facts)} cached verdicts "
+              f"(rules {RULES_VERSION}, {validator.rule_tier})")
+    return flags
 
 # -----------------------------
 # Main Validation Pipeline
 # -----------------------------
-def validate_extracted_facts(facts_data: Dict[str, Any]) -> Tuple[List[Dict], ValidationReport]:
+VALIDATION_ENGINES = ("rules", "batch")
+
+def validate_extracted_facts(
+    facts_data: Dict[str, Any],
+    engine: str = "rules",
+    use_cache: Optional[bool] = None,
+    rule_tier: str = DEFAULT_RULE_TIER,
+    extra_rules: Sequence[str] = (),
+    instrument: bool = False,
+    parsed: Optional[str | Path] = None,
+) -> Tuple[List[Dict], ValidationReport]:
     """
     Validate extracted facts and return clean facts + validation report.
     
     Args:
         facts_data: Dict containing extracted_facts list and metadata
+        engine: "rules" (FactValidator, one fact at a time) or "batch" (columnar
+            pandas engine in validate_batch; same issues, faster on large corpora)
+        use_cache: reuse per-fact verdicts of unchanged facts (rules engine only);
+            None follows ``validation.cache.enabled`` in configs/app.yaml
+        rule_tier: run rules up to this cost tier (see RULE_TIERS)
+        extra_rules: rule names to run in addition to ``rule_tier``
+        instrument: record per-rule calls, time and rejections in the report
+            (disables the cache so every rule actually runs)
+        parsed: parsed source document, or a directory of ``{source_id}_parsed.json``,
+            for the span-in-source rule (default: data/interim)
         
     Returns:
         Tuple of (valid_facts_list, validation_report)
     """
-    validator = FactValidator()
+    if engine not in VALIDATION_ENGINES:
+        raise ValueError(f"Unknown validation engine '{engine}' (use one of: {', '.join(VALIDATION_ENGINES)})")
+    validator = FactValidator(rule_tier, extra_rules, instrument, parsed)
+    if engine == "batch" and (validator.rule_tier != DEFAULT_RULE_TIER or instrument):
+        raise ValueError("The batch engine implements the core rules only; use --engine rules "
+                         "for --rule-tier/--rule/--instrument")
     
     # Extract facts list from the data structure
     if "extracted_facts" in facts_data:
@@ -703,24 +728,37 @@ def validate_extracted_facts(facts_data: Dict[str, Any]) -> Tuple[List[Dict], Va
     warning_count = 0
     
     print(f"🔍 Validating {len(facts)} extracted facts...")
+    if engine == "batch":
+        from src.core.validate_batch import validate_facts_batch
+        return validate_facts_batch(facts)
     
-    for i, fact in enumerate(facts):
-        is_valid = validator.validate_fact(fact, i)
-        
+    store = validation_cache(False if instrument else use_cache,
+                             expensive=any(spec.tier == "expensive" for spec in validator.rules))
+    if store is not None:
+        try:
+            flags = _validate_cached(validator, facts, store)
+        finally:
+            store.close()
+    else:
+        flags = [validator.validate_fact(fact, i) for i, fact in enumerate(facts)]
+    
+    for fact, is_valid in zip(facts, flags):
         if is_valid:
             valid_facts.append(fact)
         else:
             invalid_count += 1
     
     # Count warnings
-    warning_count = sum(1 for issue in validator.issues if issue.severity == "warning")
+    warning_count = validator.issues.severity_counts().get("warning", 0)
     
     report = ValidationReport(
         total_facts=len(facts),
         valid_facts=len(valid_facts),
         invalid_facts=invalid_count,
         warnings=warning_count,
-        issues=validator.issues
+        issues=validator.issues,
+        rule_tier=validator.rule_tier,
+        rule_stats=validator.rule_stats_dict(),
     )
     
     return valid_facts, report
@@ -735,16 +773,21 @@ def save_validation_results(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    summary = {
+        "original_count": report.total_facts,
+        "valid_count": report.valid_facts,
+        "invalid_count": report.invalid_facts,
+        "warning_count": report.warnings,
+        "rule_tier": report.rule_tier,
+    }
+    if report.rule_stats:
+        summary["rule_stats"] = report.rule_stats
+
     # Save clean facts
     clean_data = {
         "validated_facts": valid_facts,
         "total_facts": len(valid_facts),
-        "validation_summary": {
-            "original_count": report.total_facts,
-            "valid_count": report.valid_facts,
-            "invalid_count": report.invalid_facts,
-            "warning_count": report.warnings
-        }
+        "validation_summary": summary
     }
     
     with open(output_path, 'w', encoding='utf-8') as f:
@@ -752,25 +795,115 @@ def save_validation_results(
     
     print(f"💾 Saved {len(valid_facts)} validated facts to {output_path}")
     
-    # Save issues report if requested
+    # Save issues report if requested (compact issue log; read it with issue_log.read_issue_log)
     if issues_path:
-        issues_path = Path(issues_path)
-        issues_data = {
-            "validation_report": report.model_dump(),
-            "issues_by_type": {}
-        }
-        
-        # Group issues by type for analysis
-        for issue in report.issues:
-            issue_type = issue.issue_type
-            if issue_type not in issues_data["issues_by_type"]:
-                issues_data["issues_by_type"][issue_type] = []
-            issues_data["issues_by_type"][issue_type].append(issue.model_dump())
-        
-        with open(issues_path, 'w', encoding='utf-8') as f:
-            json.dump(issues_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"📋 Saved validation issues to {issues_path}")
+        write_issue_log(issues_path, report.issues, summary)
+        print(f"📋 Saved {len(report.issues)} validation issues to {issues_path}")
+
+# -----------------------------
+# Streaming validation
+# -----------------------------
+STREAM_SAMPLE_ISSUES = 10
+
+def validate_fact_stream(
+    facts: Iterable[Dict[str, Any]],
+    valid_writer: JsonlWriter,
+    issues_writer: Optional[JsonlWriter] = None,
+    sample_size: int = STREAM_SAMPLE_ISSUES,
+    start_index: int = 0,
+    rule_tier: str = DEFAULT_RULE_TIER,
+    extra_rules: Sequence[str] = (),
+    instrument: bool = False,
+    parsed: Optional[str | Path] = None,
+) -> ValidationReport:
+    """Validate facts one at a time, writing valid facts / issues as they are produced.
+
+    Only running counters and the first ``sample_size`` issues are kept, so memory
+    does not grow with the corpus. ``start_index`` offsets ``fact_index`` (shards).
+    """
+    validator = FactValidator(rule_tier, extra_rules, instrument, parsed)
+    total = valid = warnings = 0
+    counts: Dict[str, int] = {}
+    sample: List[ValidationIssue] = []
+
+    for index, fact in enumerate(facts, start_index):
+        if validator.validate_fact(fact, index):
+            valid_writer.write(fact)
+            valid += 1
+        for issue in validator.issues:
+            counts[issue.issue_type] = counts.get(issue.issue_type, 0) + 1
+            warnings += issue.severity == "warning"
+            if len(sample) < sample_size:
+                sample.append(issue)
+            if issues_writer is not None:
+                issues_writer.write(issue.model_dump())
+        validator.issues.clear()
+        total += 1
+
+    return ValidationReport(
+        total_facts=total,
+        valid_facts=valid,
+        invalid_facts=total - valid,
+        warnings=warnings,
+        issues=sample,
+        issue_counts=counts,
+        rule_tier=validator.rule_tier,
+        rule_stats=validator.rule_stats_dict(),
+    )
+
+def stream_summary_path(output_path: str | Path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.summary.json")
+
+def write_stream_summary(
+    report: ValidationReport,
+    output_path: str | Path,
+    issues_path: Optional[str | Path] = None,
+) -> Path:
+    """Counters of a streamed validation run, next to the JSONL output."""
+    summary = {
+        "validation_summary": {
+            "original_count": report.total_facts,
+            "valid_count": report.valid_facts,
+            "invalid_count": report.invalid_facts,
+            "warning_count": report.warnings,
+            "rule_tier": report.rule_tier,
+        },
+        "issue_counts": report.issue_counts,
+        "validated_facts_path": str(output_path),
+        "issues_path": str(issues_path) if issues_path else None,
+    }
+    if report.rule_stats:
+        summary["rule_stats"] = report.rule_stats
+    summary_path = stream_summary_path(output_path)
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return summary_path
+
+def validate_stream(
+    input_path: str | Path,
+    output_path: str | Path,
+    issues_path: Optional[str | Path] = None,
+    rule_tier: str = DEFAULT_RULE_TIER,
+    extra_rules: Sequence[str] = (),
+    instrument: bool = False,
+    parsed: Optional[str | Path] = None,
+) -> ValidationReport:
+    """Stream ``input_path`` (JSON or JSONL) to JSONL valid facts / issues plus a small summary file."""
+    print(f"🔍 Streaming validation of {input_path}...")
+    rules = {"rule_tier": rule_tier, "extra_rules": extra_rules, "instrument": instrument, "parsed": parsed}
+    with JsonlWriter(output_path) as valid_writer:
+        if issues_path:
+            with JsonlWriter(issues_path) as issues_writer:
+                report = validate_fact_stream(iter_facts(input_path), valid_writer, issues_writer, **rules)
+        else:
+            report = validate_fact_stream(iter_facts(input_path), valid_writer, **rules)
+
+    write_stream_summary(report, output_path, issues_path)
+
+    print(f"💾 Streamed {report.valid_facts} validated facts to {output_path}")
+    if issues_path:
+        print(f"📋 Streamed {sum(report.issue_counts.values())} issues to {issues_path}")
+    return report
 
 # -----------------------------
 # CLI Interface
@@ -783,15 +916,33 @@ def main():
     parser.add_argument("--input", required=True, help="Path to extracted facts JSON file")
     parser.add_argument("--output", required=True, help="Path for validated facts output")
     parser.add_argument("--issues", help="Path to save validation issues report")
+    parser.add_argument("--engine", choices=VALIDATION_ENGINES, default="rules", help="Per-fact rules or columnar batch engine")
+    parser.add_argument("--stream", action="store_true", help="Validate incrementally, writing JSONL outputs (flat memory)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-validate every fact instead of reusing cached verdicts")
+    parser.add_argument("--rule-tier", choices=RULE_TIERS, default=DEFAULT_RULE_TIER, help="Run rules up to this cost tier")
+    parser.add_argument("--rule", action="append", default=[], choices=list(VALIDATION_RULES), help="Also run this rule (repeatable)")
+    parser.add_argument("--instrument", action="store_true", help="Record per-rule call count, time and rejection rate")
+    parser.add_argument("--parsed", help="Parsed source (file or directory of *_parsed.json) for --rule-tier expensive")
     
     args = parser.parse_args()
     
+    if args.stream:
+        report = validate_stream(args.input, args.output, args.issues, args.rule_tier, args.rule, args.instrument,
+                                 args.parsed)
+        report.print_summary()
+        print(f"\n✅ Validation complete!")
+        print(f"📊 Results: {report.valid_facts}/{report.total_facts} facts passed validation")
+        return
+    
     # Load extracted facts
     with open(args.input, 'r', encoding='utf-8') as f:
         facts_data = json.load(f)
     
     # Validate
-    valid_facts, report = validate_extracted_facts(facts_data)
+    valid_facts, report = validate_extracted_facts(facts_data, engine=args.engine,
+                                                   use_cache=False if args.no_cache else None,
+                                                   rule_tier=args.rule_tier, extra_rules=args.rule,
+                                                   instrument=args.instrument, parsed=args.parsed)
     
     # Print report
     report.print_summary()
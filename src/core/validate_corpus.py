@@ -0,0 +1,301 @@
+"""Corpus validation: many extracted files across a process pool.
+
+Each input file is one task; files larger than ``SHARD_BYTES`` are split into
+JSONL shards of ``shard_facts`` facts so a single huge paper does not pin one
+worker while the others idle. FactValidator keeps no state across facts, so
+shards validate independently; the parent stitches shard outputs back together
+in order (``fact_index`` stays file-global via ``start_index``) and writes the
+per-file stream outputs plus a corpus-level summary.
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.core.fact_stream import JsonlWriter, iter_facts
+from src.core.validate import (
+    DEFAULT_RULE_TIER,
+    STREAM_SAMPLE_ISSUES,
+    ValidationIssue,
+    ValidationReport,
+    merge_rule_stats,
+    validate_fact_stream,
+    write_stream_summary,
+)
+
+CORPUS_PATTERNS = ("*_extracted.json", "*_extracted.jsonl")
+CORPUS_SUMMARY_NAME = "corpus_validation_summary.json"
+SHARD_BYTES = 16 * 1024 * 1024
+SHARD_FACTS = 50_000
+
+
+@dataclass
+class ShardTask:
+    source: str
+    shard: int
+    input_path: str
+    valid_path: str
+    issues_path: str
+    start_index: int = 0
+    # validate_fact_stream rule options: rule_tier, extra_rules, instrument, parsed
+    rules: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ShardResult:
+    source: str
+    shard: int
+    total: int
+    valid: int
+    warnings: int
+    issue_counts: Dict[str, int]
+    sample: List[Dict[str, Any]]
+    seconds: float
+    rule_tier: str = DEFAULT_RULE_TIER
+    rule_stats: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+@dataclass
+class FileOutputs:
+    source: Path
+    valid_path: Path
+    issues_path: Path
+    shards: List[ShardTask] = field(default_factory=list)
+
+
+def corpus_paper_id(input_path: Path) -> str:
+    return input_path.stem.removesuffix("_extracted")
+
+
+def check_unique_paper_ids(inputs: Sequence[Path]) -> None:
+    """Outputs and shard files are named by paper id, so two inputs sharing one would overwrite each other."""
+    by_id: Dict[str, List[Path]] = {}
+    for path in inputs:
+        by_id.setdefault(corpus_paper_id(path), []).append(path)
+    clashes = {pid: paths for pid, paths in by_id.items() if len(paths) > 1}
+    if clashes:
+        listed = "; ".join(f"{pid}: {', '.join(map(str, paths))}" for pid, paths in sorted(clashes.items()))
+        raise ValueError(f"Several inputs share a paper id (their outputs would collide): {listed}")
+
+
+def resolve_inputs(spec: str) -> List[Path]:
+    """Extracted files under a directory, or the files matching a glob pattern (paper ids must be unique)."""
+    path = Path(spec)
+    if path.is_dir():
+        found = {p for pattern in CORPUS_PATTERNS for p in path.glob(pattern)}
+    else:
+        found = {Path(p) for p in glob.glob(spec, recursive=True)}
+    inputs = sorted(p for p in found if p.is_file())
+    check_unique_paper_ids(inputs)
+    return inputs
+
+
+def corpus_output_paths(input_path: Path, output_dir: Path) -> tuple[Path, Path]:
+    """``{paper}_validated.jsonl`` / ``{paper}_issues.jsonl`` (same naming as add_paper)."""
+    paper_id = corpus_paper_id(input_path)
+    return output_dir / f"{paper_id}_validated.jsonl", output_dir / f"{paper_id}_issues.jsonl"
+
+
+def validate_shard(task: ShardTask) -> ShardResult:
+    """Worker entry point: stream-validate one file or shard to its own JSONL outputs."""
+    start = time.perf_counter()
+    with JsonlWriter(task.valid_path) as valid_writer, JsonlWriter(task.issues_path) as issues_writer:
+        report = validate_fact_stream(
+            iter_facts(task.input_path), valid_writer, issues_writer, start_index=task.start_index, **task.rules
+        )
+    return ShardResult(
+        source=task.source,
+        shard=task.shard,
+        total=report.total_facts,
+        valid=report.valid_facts,
+        warnings=report.warnings,
+        issue_counts=report.issue_counts,
+        sample=[issue.model_dump() for issue in report.issues],
+        seconds=time.perf_counter() - start,
+        rule_tier=report.rule_tier,
+        rule_stats=report.rule_stats,
+    )
+
+
+# -----------------------------
+# Sharding and merging
+# -----------------------------
+def _submit_shards(
+    pool: ProcessPoolExecutor,
+    outputs: FileOutputs,
+    shard_dir: Path,
+    shard_facts: int,
+    futures: List[Future],
+    rules: Dict[str, Any],
+) -> None:
+    """Split a large file into JSONL shards, submitting each as soon as it is written."""
+    stem = outputs.source.stem
+    facts = iter_facts(outputs.source)
+    index = 0
+    while True:
+        shard = len(outputs.shards)
+        shard_path = shard_dir / f"{stem}.{shard:05d}.jsonl"
+        with JsonlWriter(shard_path) as writer:
+            for fact in facts:
+                writer.write(fact)
+                if writer.count >= shard_facts:
+                    break
+        if not writer.count:
+            shard_path.unlink()
+            if not outputs.shards:
+                # Empty input still gets (empty) outputs
+                outputs.shards.append(ShardTask(str(outputs.source), 0, str(outputs.source),
+                                                str(outputs.valid_path), str(outputs.issues_path), rules=rules))
+                futures.append(pool.submit(validate_shard, outputs.shards[0]))
+            return
+        task = ShardTask(
+            source=str(outputs.source),
+            shard=shard,
+            input_path=str(shard_path),
+            valid_path=str(shard_dir / f"{stem}.{shard:05d}.valid.jsonl"),
+            issues_path=str(shard_dir / f"{stem}.{shard:05d}.issues.jsonl"),
+            start_index=index,
+            rules=rules,
+        )
+        outputs.shards.append(task)
+        futures.append(pool.submit(validate_shard, task))
+        index += writer.count
+
+
+def _concat(parts: List[str], target: Path) -> None:
+    with target.open("wb") as out:
+        for part in parts:
+            with open(part, "rb") as fh:
+                shutil.copyfileobj(fh, out)
+
+
+def _merge_file(outputs: FileOutputs, results: List[ShardResult]) -> ValidationReport:
+    """Concatenate shard outputs in order and fold their counters into one report."""
+    results = sorted(results, key=lambda r: r.shard)
+    if outputs.shards[0].valid_path != str(outputs.valid_path):
+        _concat([t.valid_path for t in outputs.shards], outputs.valid_path)
+        _concat([t.issues_path for t in outputs.shards], outputs.issues_path)
+
+    counts: Dict[str, int] = {}
+    sample: List[Dict[str, Any]] = []
+    for result in results:
+        for issue_type, count in result.issue_counts.items():
+            counts[issue_type] = counts.get(issue_type, 0) + count
+        sample.extend(result.sample)
+    total = sum(r.total for r in results)
+    valid = sum(r.valid for r in results)
+    report = ValidationReport(
+        total_facts=total,
+        valid_facts=valid,
+        invalid_facts=total - valid,
+        warnings=sum(r.warnings for r in results),
+        issues=[ValidationIssue(**issue) for issue in sample[:STREAM_SAMPLE_ISSUES]],
+        issue_counts=counts,
+        rule_tier=results[0].rule_tier,
+        rule_stats=merge_rule_stats(r.rule_stats for r in results),
+    )
+    write_stream_summary(report, outputs.valid_path, outputs.issues_path)
+    return report
+
+
+# -----------------------------
+# Corpus entry point
+# -----------------------------
+def validate_corpus(
+    inputs: List[Path],
+    output_dir: Path | str,
+    workers: Optional[int] = None,
+    shard_facts: int = SHARD_FACTS,
+    shard_bytes: int = SHARD_BYTES,
+    rule_tier: str = DEFAULT_RULE_TIER,
+    extra_rules: Sequence[str] = (),
+    instrument: bool = False,
+    parsed: Optional[str | Path] = None,
+) -> Dict[str, Any]:
+    """Validate ``inputs`` across ``workers`` processes; returns the corpus summary."""
+    check_unique_paper_ids(inputs)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    shard_dir = Path(tempfile.mkdtemp(prefix=".shards_", dir=output_dir))
+    started = time.perf_counter()
+    rules = {"rule_tier": rule_tier, "extra_rules": tuple(extra_rules), "instrument": instrument,
+             "parsed": str(parsed) if parsed else None}
+
+    files: List[FileOutputs] = []
+    futures: List[Future] = []
+    print(f"🔍 Validating {len(inputs)} files with {workers} workers...")
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path in inputs:
+                valid_path, issues_path = corpus_output_paths(path, output_dir)
+                outputs = FileOutputs(path, valid_path, issues_path)
+                files.append(outputs)
+                if path.stat().st_size > shard_bytes:
+                    _submit_shards(pool, outputs, shard_dir, shard_facts, futures, rules)
+                else:
+                    outputs.shards.append(ShardTask(str(path), 0, str(path), str(valid_path), str(issues_path),
+                                                    rules=rules))
+                    futures.append(pool.submit(validate_shard, outputs.shards[0]))
+
+            by_source: Dict[str, List[ShardResult]] = {}
+            for future in futures:
+                result = future.result()
+                by_source.setdefault(result.source, []).append(result)
+
+        per_file = []
+        file_reports: List[ValidationReport] = []
+        counts: Dict[str, int] = {}
+        totals = {"original_count": 0, "valid_count": 0, "invalid_count": 0, "warning_count": 0}
+        for outputs in files:
+            report = _merge_file(outputs, by_source[str(outputs.source)])
+            file_reports.append(report)
+            for issue_type, count in report.issue_counts.items():
+                counts[issue_type] = counts.get(issue_type, 0) + count
+            stats = {
+                "original_count": report.total_facts,
+                "valid_count": report.valid_facts,
+                "invalid_count": report.invalid_facts,
+                "warning_count": report.warnings,
+            }
+            for key, value in stats.items():
+                totals[key] += value
+            per_file.append({
+                "input_path": str(outputs.source),
+                "validated_facts_path": str(outputs.valid_path),
+                "issues_path": str(outputs.issues_path),
+                "shards": len(outputs.shards),
+                **stats,
+            })
+            print(f"   ✅ {outputs.source.name}: {report.valid_facts}/{report.total_facts} valid"
+                  f"{f' ({len(outputs.shards)} shards)' if len(outputs.shards) > 1 else ''}")
+    finally:
+        # Shard files are scratch; remove them even when a worker fails
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "validation_summary": totals,
+        "issue_counts": counts,
+        "rule_tier": file_reports[0].rule_tier if file_reports else DEFAULT_RULE_TIER,
+        "files": per_file,
+        "workers": workers,
+        "shards": len(futures),
+        "elapsed_seconds": round(elapsed, 3),
+        "facts_per_second": round(totals["original_count"] / elapsed, 1) if elapsed else None,
+    }
+    rule_stats = merge_rule_stats(report.rule_stats for report in file_reports)
+    if rule_stats:
+        summary["rule_stats"] = rule_stats
+    summary_path = output_dir / CORPUS_SUMMARY_NAME
+    summary_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 Corpus summary → {summary_path}")
+    return summary
@@ -0,0 +1,174 @@
+"""Shared clinical vocabulary compiled from ``configs/relations.yaml`` and ``configs/vocabulary.yaml``.
+
+Every stage (extraction, validation, quality checks, the Neo4j loader) reads its
+relation types and lexicons from :func:`get_vocabulary` instead of keeping its own
+copy. The YAML lists are compiled once into frozen sets (membership), ordered
+tuples (messages and "first match" semantics), lookup tables and
+:class:`~src.core.lexicon_matcher.LexiconMatcher` automata. The compiled form is
+pickled under ``data/cache/vocabulary/`` keyed by a hash of both config files, so
+later processes (e.g. corpus validation workers) load it instead of rebuilding.
+Override locations with ``RELATIONS_CONFIG_PATH`` / ``VOCABULARY_CONFIG_PATH`` /
+``VOCABULARY_CACHE_DIR``.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Mapping, Tuple
+
+import yaml
+
+from src.core.lexicon_matcher import LexiconMatcher, SubstringIndex
+
+RELATIONS_CONFIG_PATH = Path(os.getenv("RELATIONS_CONFIG_PATH", "configs/relations.yaml"))
+VOCABULARY_CONFIG_PATH = Path(os.getenv("VOCABULARY_CONFIG_PATH", "configs/vocabulary.yaml"))
+VOCABULARY_CACHE_DIR = Path(os.getenv("VOCABULARY_CACHE_DIR", "data/cache/vocabulary"))
+# Bump when the compiled structure changes so stale pickles are ignored
+COMPILED_FORMAT = 1
+
+LEXICON_KEYS = (
+    "conditions", "condition_exclusion_words", "outcome_indicators", "isolated_symptoms",
+    "drug_names", "placeholder_drug_names", "generic_drug_terms", "side_effects", "invalid_side_effects",
+)
+
+
+@dataclass(frozen=True)
+class Vocabulary:
+    config_hash: str
+    # Relations (config order = extraction schema enum order)
+    relations: Tuple[str, ...]
+    relation_set: FrozenSet[str]
+    relation_labels: Dict[str, str]
+    relation_keywords: Dict[str, Tuple[str, ...]]
+    treatment_lines: Tuple[str, ...]
+    # Lexicons (ordered tuples; *_set for membership)
+    condition_normalization: Dict[str, str]
+    conditions: Tuple[str, ...]
+    condition_set: FrozenSet[str]
+    condition_exclusion_words: Tuple[str, ...]
+    outcome_indicators: Tuple[str, ...]
+    isolated_symptoms: FrozenSet[str]
+    drug_names: Tuple[str, ...]
+    placeholder_drug_names: FrozenSet[str]
+    generic_drug_terms: FrozenSet[str]
+    side_effects: FrozenSet[str]
+    invalid_side_effects: FrozenSet[str]
+    # Compiled matchers
+    drug_matcher: LexiconMatcher
+    outcome_matcher: LexiconMatcher
+    exclusion_matcher: LexiconMatcher
+    condition_in_name: LexiconMatcher
+    name_in_condition: SubstringIndex
+
+    def normalize_condition(self, condition: str) -> str:
+        """Canonical condition name for known abbreviations/variants (else unchanged)."""
+        if not condition:
+            return condition
+        return self.condition_normalization.get(condition.lower().strip(), condition)
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        raise FileNotFoundError(f"Vocabulary config not found: {path}")
+    raw = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    if not isinstance(raw, Mapping):
+        raise ValueError(f"{path} must contain a mapping at the top level")
+    return dict(raw)
+
+
+def _terms(raw: Dict[str, Any], key: str, path: Path) -> Tuple[str, ...]:
+    values = raw.get(key) or []
+    if not isinstance(values, list):
+        raise ValueError(f"{path}: '{key}' must be a list")
+    # Lower-case and drop duplicates, keeping the first occurrence's position
+    return tuple(dict.fromkeys(str(v).lower().strip() for v in values))
+
+
+def compile_vocabulary(relations_raw: Dict[str, Any], vocab_raw: Dict[str, Any],
+                       config_hash: str = "", vocab_path: Path = VOCABULARY_CONFIG_PATH) -> Vocabulary:
+    """Build the frozen sets, tables and automata from parsed config mappings."""
+    relations_cfg = relations_raw.get("relations") or {}
+    if not isinstance(relations_cfg, Mapping) or not relations_cfg:
+        raise ValueError("relations.yaml must define a non-empty 'relations' mapping")
+    relations = tuple(str(name).upper() for name in relations_cfg)
+    specs = {str(name).upper(): spec or {} for name, spec in relations_cfg.items()}
+
+    lex = {key: _terms(vocab_raw, key, vocab_path) for key in LEXICON_KEYS}
+    normalization = {str(k).lower().strip(): str(v) for k, v in (vocab_raw.get("condition_normalization") or {}).items()}
+
+    return Vocabulary(
+        config_hash=config_hash,
+        relations=relations,
+        relation_set=frozenset(relations),
+        relation_labels={name: str(specs[name].get("label", name.lower())) for name in relations},
+        relation_keywords={name: tuple(specs[name]["quality_keywords"])
+                           for name in relations if specs[name].get("quality_keywords")},
+        treatment_lines=tuple(str(v) for v in relations_raw.get("treatment_lines") or []),
+        condition_normalization=normalization,
+        conditions=lex["conditions"],
+        condition_set=frozenset(lex["conditions"]),
+        condition_exclusion_words=lex["condition_exclusion_words"],
+        outcome_indicators=lex["outcome_indicators"],
+        isolated_symptoms=frozenset(lex["isolated_symptoms"]),
+        drug_names=lex["drug_names"],
+        placeholder_drug_names=frozenset(lex["placeholder_drug_names"]),
+        generic_drug_terms=frozenset(lex["generic_drug_terms"]),
+        side_effects=frozenset(lex["side_effects"]),
+        invalid_side_effects=frozenset(lex["invalid_side_effects"]),
+        drug_matcher=LexiconMatcher(lex["drug_names"]),
+        outcome_matcher=LexiconMatcher(lex["outcome_indicators"]),
+        exclusion_matcher=LexiconMatcher(lex["condition_exclusion_words"]),
+        condition_in_name=LexiconMatcher(lex["conditions"]),
+        name_in_condition=SubstringIndex(lex["conditions"]),
+    )
+
+
+def config_hash(relations_path: Path, vocab_path: Path) -> str:
+    digest = hashlib.sha256(f"format={COMPILED_FORMAT}".encode("utf-8"))
+    for path in (relations_path, vocab_path):
+        digest.update(b"\0")
+        digest.update(path.read_bytes() if path.exists() else b"")
+    return digest.hexdigest()
+
+
+def load_vocabulary(
+    relations_path: Path | str | None = None,
+    vocab_path: Path | str | None = None,
+    cache_dir: Path | str | None = VOCABULARY_CACHE_DIR,
+) -> Vocabulary:
+    """Compiled vocabulary, from the on-disk cache when the configs are unchanged."""
+    relations_path = Path(relations_path or RELATIONS_CONFIG_PATH)
+    vocab_path = Path(vocab_path or VOCABULARY_CONFIG_PATH)
+    key = config_hash(relations_path, vocab_path)
+
+    cache_path = Path(cache_dir) / f"{key[:32]}.pkl" if cache_dir else None
+    if cache_path and cache_path.exists():
+        try:
+            with cache_path.open("rb") as fh:
+                cached = pickle.load(fh)
+            if isinstance(cached, Vocabulary) and cached.config_hash == key:
+                return cached
+        except Exception:
+            pass  # unreadable or stale pickle: rebuild below
+
+    vocab = compile_vocabulary(_read_yaml(relations_path), _read_yaml(vocab_path), key, vocab_path)
+    if cache_path:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open("wb") as fh:
+                pickle.dump(vocab, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(cache_path)
+        except OSError:
+            pass  # read-only checkout: the in-process copy still works
+    return vocab
+
+
+@lru_cache(maxsize=1)
+def get_vocabulary() -> Vocabulary:
+    """The process-wide vocabulary (loaded once)."""
+    return load_vocabulary()